@@ -0,0 +1,63 @@
+"""
+Benchmark de concurrencia: handlers asíncronos que llaman a `service.select` (bloquea el event loop)
+contra handlers que usan `async_service.select`
+
+Uso:
+    python benchmarks/bench_async_concurrency.py --key <llave PostgreSQL> [--requests 2000] [--concurrency 200] [--latency 0.005]
+
+`--latency` simula la latencia de la consulta con `pg_sleep`.
+"""
+import argparse
+import asyncio
+import os
+import time
+from contextlib import redirect_stdout
+
+from fracturex_module_database.model.database_crud_info import PostgreSQL
+from fracturex_module_database.service import (
+    async_service,
+    service
+)
+
+QUERY = "SELECT %s AS request, pg_sleep(%s)"
+
+async def sync_handler(key : str, request : int, latency : float) -> None:
+    with service.database_connection(key) as conn:
+        service.select(PostgreSQL.Select(conn=conn, query=QUERY, vars=(request, latency)))
+
+async def async_handler(key : str, request : int, latency : float) -> None:
+    async with async_service.database_connection(key) as conn:
+        await async_service.select(PostgreSQL.Select(conn=conn, query=QUERY, vars=(request, latency)))
+
+async def run(handler, key : str, requests : int, concurrency : int, latency : float) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited(request : int) -> None:
+        async with semaphore:
+            await handler(key, request, latency)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(limited(request) for request in range(requests)))
+    return requests / (time.perf_counter() - started)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--key", required=True, help="Llave PostgreSQL de FRACTUREX_MODULE_DATABASE_CONFIG")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.005)
+    parser.add_argument("--workers", type=int, default=32, help="Hilos del ejecutor del servicio asíncrono")
+    args = parser.parse_args()
+
+    async_service.configure_executor(args.workers)
+    results: list[tuple[str, float]] = []
+    # Las trazas por operación se descartan para no inundar la salida del benchmark
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        for label, handler in (("service (sync)", sync_handler), ("async_service", async_handler)):
+            results.append((label, asyncio.run(run(handler, args.key, args.requests, args.concurrency, args.latency))))
+
+    for label, throughput in results:
+        print(f"{label:<16} {throughput:10.0f} req/s  x{throughput / results[0][1]:6.1f}")
+
+if __name__ == "__main__":
+    main()
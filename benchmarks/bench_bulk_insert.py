@@ -0,0 +1,91 @@
+"""
+Benchmark de inserción masiva: ciclo de `service.insert` contra `service.bulk_insert`
+
+Uso:
+    python benchmarks/bench_bulk_insert.py --key <llave PostgreSQL o MongoDB> [--rows 100000]
+
+La llave debe existir en FRACTUREX_MODULE_DATABASE_CONFIG. Se crea (y elimina) la tabla o
+colección `fracturex_bench_bulk_insert`.
+"""
+import argparse
+import os
+import time
+from contextlib import redirect_stdout
+from pymongo import MongoClient
+
+from fracturex_module_database.model.database_crud_info import (
+    PostgreSQL,
+    MongoDB
+)
+from fracturex_module_database.service import service
+
+TABLE_NAME = "fracturex_bench_bulk_insert"
+
+# El ciclo de inserts individuales se mide sobre una muestra para no eternizar el benchmark
+LOOP_SAMPLE = 5000
+
+def bench_postgresql(conn, rows : int) -> list[tuple[str, int, float]]:
+    results: list[tuple[str, int, float]] = []
+    mycursor = conn.cursor()
+    mycursor.execute(f"DROP TABLE IF EXISTS {TABLE_NAME}; CREATE TABLE {TABLE_NAME} (id serial PRIMARY KEY, name text, amount integer)")
+    conn.commit()
+    data = [(f"row-{i}", i) for i in range(rows)]
+
+    sample = data[:LOOP_SAMPLE]
+    started = time.perf_counter()
+    for row in sample:
+        service.insert(PostgreSQL.Insert(conn=conn, query=f"INSERT INTO {TABLE_NAME} (name, amount) VALUES (%s, %s) RETURNING id", vars=row))
+    conn.commit()
+    results.append(("service.insert (ciclo)", len(sample), time.perf_counter() - started))
+
+    for label, copy_threshold, returning in (("bulk_insert execute_values", rows + 1, ["id"]), ("bulk_insert COPY", 0, None)):
+        started = time.perf_counter()
+        service.bulk_insert(PostgreSQL.BulkInsert(conn=conn, table_name=TABLE_NAME, columns=["name", "amount"], rows=data, returning=returning, copy_threshold=copy_threshold))
+        conn.commit()
+        results.append((label, rows, time.perf_counter() - started))
+
+    mycursor.execute(f"DROP TABLE {TABLE_NAME}")
+    conn.commit()
+    mycursor.close()
+    return results
+
+def bench_mongodb(conn : MongoClient, rows : int) -> list[tuple[str, int, float]]:
+    results: list[tuple[str, int, float]] = []
+    collection = conn.get_database()[TABLE_NAME]
+    collection.drop()
+
+    sample = min(rows, LOOP_SAMPLE)
+    started = time.perf_counter()
+    for i in range(sample):
+        service.insert(MongoDB.Insert(conn=conn, collection_name=TABLE_NAME, document={"name": f"row-{i}", "amount": i}))
+    results.append(("service.insert (ciclo)", sample, time.perf_counter() - started))
+
+    documents = [{"name": f"row-{i}", "amount": i} for i in range(rows)]
+    started = time.perf_counter()
+    service.bulk_insert(MongoDB.BulkInsert(conn=conn, collection_name=TABLE_NAME, documents=documents))
+    results.append(("bulk_insert insert_many", rows, time.perf_counter() - started))
+
+    collection.drop()
+    return results
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--key", required=True, help="Llave de FRACTUREX_MODULE_DATABASE_CONFIG")
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+
+    with service.database_connection(args.key) as conn:
+        # Las trazas por operación se descartan para no inundar la salida del benchmark
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            if isinstance(conn, MongoClient):
+                results = bench_mongodb(conn, args.rows)
+            else:
+                results = bench_postgresql(conn, args.rows)
+
+    baseline = results[0][1] / results[0][2]
+    for label, rows, elapsed in results:
+        throughput = rows / elapsed
+        print(f"{label:<28} {rows:>8} filas  {elapsed:8.3f} s  {throughput:12.0f} filas/s  x{throughput / baseline:6.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark del costo por llamada de la información del CRUD: modelos pydantic (validan cada campo)
+comparados con los descriptores de `crud_descriptor` (`Modelo.descriptor(...)` y `_replace(...)`)
+
+"antes" es el modelo pydantic y "después" el descriptor (en `postgresql_tags`, la extracción de las
+tablas escritas sin y con caché). Se mide la construcción sola y, con `--key`, la llamada completa a
+`service.select`/`service.insert` de consultas mínimas (el resto del tiempo es la ida y vuelta a la
+base de datos).
+
+Uso:
+    python benchmarks/bench_crud_descriptor.py [--key <llave PostgreSQL>] [--calls 200000] [--service-calls 5000]
+"""
+import argparse
+import time
+from typing import Any, Callable
+
+from pymongo import MongoClient
+
+from fracturex_module_database.infrastructure.cache.result_cache import postgresql_tags
+from fracturex_module_database.model.database_crud_info import MongoDB, PostgreSQL
+from fracturex_module_database.model.dto.http_response import is_error_response
+from fracturex_module_database.service import service
+
+def per_call(function : Callable[[], Any], calls : int) -> float:
+    # Microsegundos por llamada (mejor de 3)
+    best = float("inf")
+    for _ in range(3):
+        started = time.perf_counter()
+        for _ in range(calls):
+            function()
+        best = min(best, time.perf_counter() - started)
+    return best / calls * 1e6
+
+def report(label : str, before : float, after : float) -> None:
+    print(f"{label:<40} antes {before:8.2f} µs  después {after:8.2f} µs  x{before / after:6.2f}")
+
+def bench_construction(conn : Any, calls : int) -> None:
+    mongo = MongoClient("mongodb://localhost/fx_bench", connect=False)
+    document = {"name": "name", "amount": 1.5, "tags": ["a", "b"], "nested": {"level": 1}}
+    mongo_select = MongoDB.Select.descriptor(conn=mongo, collection_name="fx_bench", query={"_id": 0})
+    report("MongoDB.Select", per_call(lambda: MongoDB.Select(conn=mongo, collection_name="fx_bench", query={"_id": 1}), calls), per_call(lambda: MongoDB.Select.descriptor(conn=mongo, collection_name="fx_bench", query={"_id": 1}), calls))
+    report("MongoDB.Select (_replace)", per_call(lambda: MongoDB.Select(conn=mongo, collection_name="fx_bench", query={"_id": 1}), calls), per_call(lambda: mongo_select._replace(query={"_id": 1}), calls))
+    report("MongoDB.Insert", per_call(lambda: MongoDB.Insert(conn=mongo, collection_name="fx_bench", document=document), calls), per_call(lambda: MongoDB.Insert.descriptor(conn=mongo, collection_name="fx_bench", document=document), calls))
+    if conn is None:
+        return
+    query = "SELECT id, name FROM fx_bench WHERE id = %s"
+    select = PostgreSQL.Select.descriptor(conn=conn, query=query)
+    report("PostgreSQL.Select", per_call(lambda: PostgreSQL.Select(conn=conn, query=query, vars=(1,)), calls), per_call(lambda: PostgreSQL.Select.descriptor(conn=conn, query=query, vars=(1,)), calls))
+    report("PostgreSQL.Select (_replace)", per_call(lambda: PostgreSQL.Select(conn=conn, query=query, vars=(1,)), calls), per_call(lambda: select._replace(vars=(1,)), calls))
+    report("PostgreSQL.Insert", per_call(lambda: PostgreSQL.Insert(conn=conn, query="INSERT INTO fx_bench VALUES (%s, %s)", vars=(1, "name")), calls), per_call(lambda: PostgreSQL.Insert.descriptor(conn=conn, query="INSERT INTO fx_bench VALUES (%s, %s)", vars=(1, "name")), calls))
+    # Tablas que invalida cada escritura: antes se extraían con la expresión regular en cada llamada
+    report("postgresql_tags (sin caché / con caché)", per_call(lambda: postgresql_tags.__wrapped__("UPDATE fx_bench SET name = %s WHERE id = %s", True), calls), per_call(lambda: postgresql_tags("UPDATE fx_bench SET name = %s WHERE id = %s", True), calls))
+
+def bench_service(conn : Any, calls : int) -> None:
+    with conn.cursor() as mycursor:
+        mycursor.execute("CREATE TEMPORARY TABLE fx_bench_descriptor (id integer PRIMARY KEY, name text)")
+    insert = PostgreSQL.Insert.descriptor(conn=conn, query="INSERT INTO fx_bench_descriptor VALUES (%s, %s) RETURNING id", vars=None)
+    select = PostgreSQL.Select.descriptor(conn=conn, query="SELECT %s AS id")
+    keys = iter(range(2 * 3 * calls + 1))
+
+    def check(result : Any) -> None:
+        if is_error_response(result):
+            raise RuntimeError(result.body.decode())
+
+    report("service.select (SELECT %s)", per_call(lambda: check(service.select(PostgreSQL.Select(conn=conn, query="SELECT %s AS id", vars=(1,)))), calls), per_call(lambda: check(service.select(select._replace(vars=(1,)))), calls))
+    report("service.insert", per_call(lambda: check(service.insert(PostgreSQL.Insert(conn=conn, query="INSERT INTO fx_bench_descriptor VALUES (%s, %s) RETURNING id", vars=(next(keys), "name")))), calls), per_call(lambda: check(service.insert(insert._replace(vars=(next(keys), "name")))), calls))
+    conn.rollback()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--key", help="Llave PostgreSQL de FRACTUREX_MODULE_DATABASE_CONFIG (opcional)")
+    parser.add_argument("--calls", type=int, default=200000)
+    parser.add_argument("--service-calls", type=int, default=5000)
+    args = parser.parse_args()
+
+    if args.key is None:
+        bench_construction(None, args.calls)
+        return
+    with service.database_connection(args.key) as conn:
+        if is_error_response(conn):
+            raise RuntimeError(conn.body.decode())
+        bench_construction(conn, args.calls)
+        bench_service(conn, args.service_calls)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark de exportación: `service.export` (COPY TO STDOUT en PostgreSQL, lotes BSON sin decodificar en
+MongoDB) comparado con la exportación anterior: `service.select` -> lista de diccionarios -> JSON
+
+Cada variante escribe en un archivo temporal; se reporta el mejor tiempo, registros/s y MB/s escritos.
+
+Uso:
+    python benchmarks/bench_export.py --key <llave PostgreSQL> [--mongo-key <llave MongoDB>] [--rows 500000] [--repeat 3]
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+from typing import Any, BinaryIO, Callable
+
+from fracturex_module_database.model.database_crud_info import MongoDB, PostgreSQL
+from fracturex_module_database.model.dto.http_response import is_error_response
+from fracturex_module_database.model.export_result import Export_Format
+from fracturex_module_database.service import service
+
+COLLECTION = "fx_bench_export"
+
+def measure(function : Callable[[BinaryIO], Any], repeat : int) -> tuple[float, int]:
+    # Retorna (mejor tiempo en segundos, bytes escritos)
+    best = float("inf")
+    size = 0
+    for _ in range(repeat):
+        with tempfile.TemporaryFile() as file:
+            started = time.perf_counter()
+            result = function(file)
+            file.flush()
+            best = min(best, time.perf_counter() - started)
+            if is_error_response(result):
+                raise RuntimeError(result.body.decode())
+            size = os.fstat(file.fileno()).st_size
+    return best, size
+
+def select_json(select : Callable[[], Any], file : BinaryIO) -> Any:
+    rows = select()
+    if is_error_response(rows):
+        return rows
+    file.write(json.dumps(rows, default=str).encode())
+    return None
+
+def report(rows : int, results : list[tuple[str, float, int]]) -> None:
+    for label, seconds, size in results:
+        print(f"{label:<22} {seconds * 1000:9.1f} ms  {rows / seconds:12.0f} registros/s  {size / seconds / (1024 * 1024):8.1f} MB/s  x{results[0][1] / seconds:5.2f}")
+
+def bench_postgresql(key : str, rows : int, repeat : int) -> None:
+    query = f"SELECT g AS id, 'name ' || g AS name, g * 1.5 AS amount, now() AS created FROM generate_series(1, {rows}) AS g"
+    results: list[tuple[str, float, int]] = []
+    with service.database_connection(key) as conn:
+        results.append(("select + json", *measure(lambda file: select_json(lambda: service.select(PostgreSQL.Select(conn=conn, query=query)), file), repeat)))
+        for export_format in (Export_Format.CSV, Export_Format.TEXT, Export_Format.BINARY):
+            results.append((f"export {export_format.value}", *measure(lambda file: service.export(PostgreSQL.Export(conn=conn, query=query, file=file, format=export_format)), repeat)))
+    print(f"PostgreSQL, {rows} registros")
+    report(rows, results)
+
+def bench_mongodb(key : str, rows : int, repeat : int) -> None:
+    from bson import json_util
+
+    conn = service.get_database_connection(key)
+    if is_error_response(conn):
+        raise RuntimeError(conn.body.decode())
+    collection = conn.get_database()[COLLECTION]
+    collection.drop()
+    try:
+        for start in range(0, rows, 10000):
+            collection.insert_many([{"_id": i, "name": f"name {i}", "amount": i * 1.5, "tags": ["a", "b"]} for i in range(start, min(start + 10000, rows))], ordered=False)
+
+        def select_json_util(file : BinaryIO) -> Any:
+            documents = service.select(MongoDB.Select(conn=conn, collection_name=COLLECTION))
+            if is_error_response(documents):
+                return documents
+            file.write(json_util.dumps(documents).encode())
+            return None
+
+        results = [
+            ("select + json_util", *measure(select_json_util, repeat)),
+            ("export bson", *measure(lambda file: service.export(MongoDB.Export(conn=conn, collection_name=COLLECTION, file=file)), repeat))
+        ]
+        print(f"MongoDB, {rows} documentos")
+        report(rows, results)
+    finally:
+        collection.drop()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--key", required=True, help="Llave PostgreSQL de FRACTUREX_MODULE_DATABASE_CONFIG")
+    parser.add_argument("--mongo-key", help="Llave MongoDB de FRACTUREX_MODULE_DATABASE_CONFIG (opcional)")
+    parser.add_argument("--rows", type=int, default=500000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    bench_postgresql(args.key, args.rows, args.repeat)
+    if args.mongo_key:
+        bench_mongodb(args.mongo_key, args.rows, args.repeat)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark del tiempo de importación del módulo (equivalente a `python -X importtime`)
+
+Cada escenario se ejecuta en un intérprete nuevo. Se reporta la mediana del tiempo acumulado de los
+módulos importados por el escenario (sin contar los que Python carga al iniciar) y cuáles de los
+módulos pesados (drivers, FastAPI) quedaron cargados.
+
+Uso:
+    python benchmarks/bench_import_time.py [--repeat 7] [--max-ms 400]
+
+Con `--max-ms` el script termina con código 1 si algún escenario supera ese tiempo.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+SCENARIOS: dict[str, str] = {
+    "service": "import fracturex_module_database.service.service",
+    "async_service": "import fracturex_module_database.service.async_service",
+    "crud_info PostgreSQL": "from fracturex_module_database.model.database_crud_info import PostgreSQL",
+    "crud_info MongoDB": "from fracturex_module_database.model.database_crud_info import MongoDB"
+}
+HEAVY_MODULES = ("psycopg2", "pymongo", "bson", "fastapi", "starlette")
+
+def run(statement : str) -> tuple[list[tuple[str, int]], list[str]] | str:
+    # Retorna los módulos de primer nivel importados (nombre, microsegundos acumulados) y los módulos pesados cargados, o el error de la importación
+    code = f"{statement}\nimport sys\nprint(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    # Sin configuración: el módulo no debe necesitarla para importarse
+    env = {key: value for key, value in os.environ.items() if key != "FRACTUREX_MODULE_DATABASE_CONFIG"}
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, env=env)
+    if process.returncode != 0:
+        return process.stderr.strip().splitlines()[-1]
+    modules: list[tuple[str, int]] = []
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not name.startswith("  "):
+            modules.append((name.strip(), int(cumulative)))
+    loaded = process.stdout.strip()
+    return modules, loaded.split(",") if loaded else []
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--max-ms", type=float, default=None, help="Tiempo máximo permitido por escenario, en milisegundos")
+    args = parser.parse_args()
+
+    startup = {name for name, _ in run("pass")[0]}
+    failed = False
+    for label, statement in SCENARIOS.items():
+        timings: list[float] = []
+        loaded: list[str] = []
+        for _ in range(args.repeat):
+            result = run(statement)
+            if isinstance(result, str):
+                break
+            modules, loaded = result
+            timings.append(sum(cumulative for name, cumulative in modules if name not in startup) / 1000)
+        if not timings:
+            failed = True
+            print(f"{label:<22} error: {result}")
+            continue
+        median = statistics.median(timings)
+        failed = failed or (args.max_ms is not None and median > args.max_ms)
+        print(f"{label:<22} {median:8.1f} ms  (min {min(timings):7.1f})  cargados: {', '.join(loaded) or '-'}")
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark de paginación: latencia de una página a distintas profundidades con OFFSET/skip comparada
+con la paginación por llave de `service.select` ("keyset" + "page_size" + "page_token")
+
+Crea la tabla/colección "fx_bench_pages" con --rows registros y la elimina al terminar.
+
+Uso:
+    python benchmarks/bench_keyset_pagination.py --key <llave PostgreSQL> [--mongo-key <llave MongoDB>] [--rows 1000000] [--page-size 50] [--repeat 5]
+"""
+import argparse
+import time
+from typing import Any, Callable
+
+from fracturex_module_database.infrastructure import pagination
+from fracturex_module_database.model.database_crud_info import MongoDB, PostgreSQL
+from fracturex_module_database.model.dto.http_response import is_error_response
+from fracturex_module_database.service import service
+
+TABLE = "fx_bench_pages"
+
+def best_of(function : Callable[[], Any], repeat : int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - started)
+        if is_error_response(result):
+            raise RuntimeError(result.body.decode())
+    return best
+
+def depths(rows : int, page_size : int) -> list[int]:
+    values = []
+    depth = 0
+    while depth < rows - page_size:
+        values.append(depth)
+        depth = depth * 10 if depth else 1000
+    return values + [rows - page_size]
+
+def report(label : str, depth : int, offset_seconds : float, keyset_seconds : float) -> None:
+    print(f"{label:<10} registro {depth:>9}  offset {offset_seconds * 1000:8.2f} ms  keyset {keyset_seconds * 1000:8.2f} ms  x{offset_seconds / keyset_seconds:7.1f}")
+
+def bench_postgresql(key : str, rows : int, page_size : int, repeat : int) -> None:
+    with service.database_connection(key) as conn:
+        with conn.cursor() as mycursor:
+            mycursor.execute(f"DROP TABLE IF EXISTS {TABLE}; CREATE TABLE {TABLE} (id bigint PRIMARY KEY, name text, amount float8)")
+            mycursor.execute(f"INSERT INTO {TABLE} SELECT g, 'name ' || g, g * 1.5 FROM generate_series(1, %s) AS g", (rows,))
+            mycursor.execute(f"ANALYZE {TABLE}")
+        conn.commit()
+        try:
+            query = f"SELECT id, name, amount FROM {TABLE}"
+            page_fingerprint = pagination.fingerprint(query, None, ["id"], False)
+            for depth in depths(rows, page_size):
+                offset = PostgreSQL.Select(conn=conn, query=f"{query} ORDER BY id LIMIT %s OFFSET %s", vars=(page_size, depth))
+                # El token de la página que empieza en "depth" es el que retornaría la página anterior
+                keyset = PostgreSQL.Select(conn=conn, query=query, keyset=["id"], page_size=page_size, page_token=pagination.encode_token(page_fingerprint, (depth,)) if depth else None)
+                report("PostgreSQL", depth, best_of(lambda: service.select(offset), repeat), best_of(lambda: service.select(keyset), repeat))
+        finally:
+            with conn.cursor() as mycursor:
+                mycursor.execute(f"DROP TABLE IF EXISTS {TABLE}")
+            conn.commit()
+
+def bench_mongodb(key : str, rows : int, page_size : int, repeat : int) -> None:
+    conn = service.get_database_connection(key)
+    if is_error_response(conn):
+        raise RuntimeError(conn.body.decode())
+    collection = conn.get_database()[TABLE]
+    collection.drop()
+    try:
+        for start in range(0, rows, 10000):
+            collection.insert_many([{"_id": i, "name": f"name {i}", "amount": i * 1.5} for i in range(start, min(start + 10000, rows))], ordered=False)
+        page_fingerprint = pagination.fingerprint(TABLE, None, None, ["_id"], False)
+        for depth in depths(rows, page_size):
+            skip = MongoDB.Select(conn=conn, collection_name=TABLE, aggregate_pipeline=[{"$sort": {"_id": 1}}], skip=depth, limit=page_size)
+            keyset = MongoDB.Select(conn=conn, collection_name=TABLE, keyset=["_id"], page_size=page_size, page_token=pagination.encode_token(page_fingerprint, (depth - 1,)) if depth else None)
+            report("MongoDB", depth, best_of(lambda: service.select(skip), repeat), best_of(lambda: service.select(keyset), repeat))
+    finally:
+        collection.drop()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--key", required=True, help="Llave PostgreSQL de FRACTUREX_MODULE_DATABASE_CONFIG")
+    parser.add_argument("--mongo-key", help="Llave MongoDB de FRACTUREX_MODULE_DATABASE_CONFIG (opcional)")
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{args.rows} registros, páginas de {args.page_size}")
+    bench_postgresql(args.key, args.rows, args.page_size, args.repeat)
+    if args.mongo_key:
+        bench_mongodb(args.mongo_key, args.rows, args.page_size, args.repeat)
+
+if __name__ == "__main__":
+    main()
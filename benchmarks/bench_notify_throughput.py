@@ -0,0 +1,71 @@
+"""
+Benchmark de LISTEN/NOTIFY en PostgreSQL: notificaciones por segundo con un "notify" + commit por
+llamada comparado con `service.notify(..., coalesce=True)`, medidas de extremo a extremo con un
+`async_service.listen` que recibe cada notificación
+
+Uso:
+    python benchmarks/bench_notify_throughput.py --key <llave PostgreSQL> [--notifications 20000] [--channel fx_bench]
+"""
+import argparse
+import asyncio
+import time
+from typing import Any, Callable
+
+from fracturex_module_database.model.database_crud_info import PostgreSQL
+from fracturex_module_database.model.notification import Notification
+from fracturex_module_database.service import async_service, service
+
+def per_call(key : str, channel : str, notifications : int) -> None:
+    with service.database_connection(key) as conn:
+        for i in range(notifications):
+            service.notify(PostgreSQL.Notify(conn=conn, channel=channel, payload={"i": i}))
+            conn.commit()
+
+def coalesced(key : str, channel : str, notifications : int) -> None:
+    with service.database_connection(key) as conn:
+        for i in range(notifications):
+            service.notify(PostgreSQL.Notify(conn=conn, channel=channel, payload={"i": i}), coalesce=True)
+    service.flush_notifications()
+
+async def measure(key : str, channel : str, notifications : int, publish : Callable[[str, str, int], None]) -> tuple[float, float]:
+    # Retorna (segundos publicando, segundos hasta recibir la última notificación)
+    received = 0
+    done = asyncio.Event()
+
+    def callback(notification : Notification) -> None:
+        nonlocal received
+        received += 1
+        if received >= notifications:
+            loop.call_soon_threadsafe(done.set)
+
+    loop = asyncio.get_running_loop()
+    listener: Any = await async_service.listen([channel], callback, database_config_key=key, max_queue=notifications)
+    if not hasattr(listener, "close"):
+        raise RuntimeError(listener.body.decode())
+    try:
+        started = time.perf_counter()
+        await loop.run_in_executor(None, publish, key, channel, notifications)
+        published = time.perf_counter() - started
+        await asyncio.wait_for(done.wait(), timeout=120)
+        return published, time.perf_counter() - started
+    finally:
+        await listener.close()
+
+async def run(args : argparse.Namespace) -> None:
+    print(f"{args.notifications} notificaciones en el canal {args.channel}")
+    baseline: float | None = None
+    for label, publish in (("notify + commit", per_call), ("coalesce", coalesced)):
+        published, received = await measure(args.key, args.channel, args.notifications, publish)
+        baseline = baseline or received
+        print(f"{label:<16} publicación {args.notifications / published:10.0f}/s  recepción {args.notifications / received:10.0f}/s  x{baseline / received:5.2f}")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--key", required=True, help="Llave PostgreSQL de FRACTUREX_MODULE_DATABASE_CONFIG")
+    parser.add_argument("--notifications", type=int, default=20000)
+    parser.add_argument("--channel", default="fx_bench")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+if __name__ == "__main__":
+    main()
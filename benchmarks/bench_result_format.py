@@ -0,0 +1,84 @@
+"""
+Benchmark de los formatos de resultado de `service.select` en PostgreSQL: tiempo, memoria pico y
+bloques de memoria que retiene el resultado, comparados con el NamedTupleCursor + `_asdict()` anterior
+
+Uso:
+    python benchmarks/bench_result_format.py --key <llave PostgreSQL> [--rows 200000] [--columns 10] [--repeat 3]
+"""
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable
+
+from psycopg2.extras import NamedTupleCursor
+
+from fracturex_module_database.model.database_crud_info import PostgreSQL
+from fracturex_module_database.model.result_format import Result_Format
+from fracturex_module_database.service import service
+
+def build_query(rows : int, columns : int) -> str:
+    # Mezcla de columnas enteras, decimales y de texto
+    expressions = []
+    for column in range(columns):
+        if column % 3 == 0:
+            expressions.append(f"g + {column} AS c{column}")
+        elif column % 3 == 1:
+            expressions.append(f"(g * {column}.5)::float8 AS c{column}")
+        else:
+            expressions.append(f"'v' || g AS c{column}")
+    return f"SELECT {', '.join(expressions)} FROM generate_series(1, {rows}) AS g"
+
+def named_tuple_select(conn : Any, query : str) -> list[dict]:
+    with conn.cursor(cursor_factory=NamedTupleCursor) as mycursor:
+        mycursor.execute(query)
+        return [row._asdict() for row in mycursor.fetchall()]
+
+def measure(function : Callable[[], Any], repeat : int) -> tuple[float, float, int]:
+    # Retorna (mejor tiempo en segundos, memoria pico en MiB, bloques retenidos por el resultado)
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - started)
+        del result
+    gc.collect()
+    blocks = sys.getallocatedblocks()
+    tracemalloc.start()
+    result = function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    gc.collect()
+    retained = sys.getallocatedblocks() - blocks
+    del result
+    return best, peak / (1024 * 1024), retained
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--key", required=True, help="Llave PostgreSQL de FRACTUREX_MODULE_DATABASE_CONFIG")
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--columns", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    query = build_query(args.rows, args.columns)
+    results: list[tuple[str, float, float, int]] = []
+    with service.database_connection(args.key) as conn:
+        results.append(("NamedTupleCursor", *measure(lambda: named_tuple_select(conn, query), args.repeat)))
+        for result_format in Result_Format:
+            crud_info = PostgreSQL.Select(conn=conn, query=query, result_format=result_format)
+            if result_format is Result_Format.NUMPY:
+                try:
+                    import numpy  # noqa: F401
+                except ImportError:
+                    continue
+            results.append((result_format.value, *measure(lambda: service.select(crud_info), args.repeat)))
+
+    print(f"{args.rows} filas x {args.columns} columnas")
+    for label, seconds, peak, retained in results:
+        print(f"{label:<18} {seconds * 1000:9.1f} ms  x{results[0][1] / seconds:5.2f}  pico {peak:8.1f} MiB  bloques retenidos {retained:>10}")
+
+if __name__ == "__main__":
+    main()
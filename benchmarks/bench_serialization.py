@@ -0,0 +1,107 @@
+"""
+Benchmark de serialización de resultados a JSON: `success_response`/`streaming_response` (tabla de
+despacho por tipo, orjson si está instalado) comparados con la ruta anterior: recorrer los registros
+para convertir ObjectId/datetime/Decimal/UUID -> `HTTP_Response(...).model_dump()` -> `JSONResponse`,
+y con `fastapi.encoders.jsonable_encoder` -> `JSONResponse`
+
+Los registros son sintéticos, con los tipos que retornan MongoDB.select (ObjectId, datetime) y
+PostgreSQL.select (Decimal, date, UUID). Se reporta el mejor tiempo y los registros/s.
+
+Uso:
+    python benchmarks/bench_serialization.py [--rows 100000] [--repeat 5] [--chunk-size 1000]
+"""
+import argparse
+import json
+import time
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Any, Callable
+from uuid import uuid4
+
+from bson import ObjectId
+from starlette.responses import JSONResponse
+
+from fracturex_module_database.infrastructure import serialization
+from fracturex_module_database.model.dto.http_response import (
+    HTTP_Response,
+    success_response
+)
+
+def build_rows(rows : int) -> list[dict]:
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "_id": ObjectId(),
+            "uuid": uuid4(),
+            "name": f"name {i}",
+            "amount": Decimal(i) / 100,
+            "quantity": i,
+            "created": now,
+            "day": date(2024, 1, 1 + i % 28),
+            "tags": ["a", "b"],
+            "active": i % 2 == 0
+        }
+        for i in range(rows)
+    ]
+
+def convert(value : Any) -> Any:
+    # Conversión manual de cada valor, como se hacía en los handlers antes de HTTP_Response
+    if isinstance(value, (ObjectId, Decimal)):
+        return str(value) if isinstance(value, ObjectId) else float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, type(uuid4())):
+        return str(value)
+    if isinstance(value, list):
+        return [convert(item) for item in value]
+    return value
+
+def walk_model_dump(rows : list[dict]) -> bytes:
+    data = [{key: convert(value) for key, value in row.items()} for row in rows]
+    return JSONResponse(content=HTTP_Response(success=True, message="", data=data).model_dump()).body
+
+def jsonable(rows : list[dict]) -> bytes:
+    from fastapi.encoders import jsonable_encoder
+    return JSONResponse(content=jsonable_encoder({"success": True, "message": "", "data": rows}, custom_encoder={ObjectId: str})).body
+
+def stdlib_dispatch(rows : list[dict]) -> bytes:
+    # Tabla de despacho con el módulo json (ruta usada si orjson no está instalado)
+    encoder = json.JSONEncoder(default=serialization.default, ensure_ascii=False, separators=(",", ":"))
+    return b'{"success":true,"message":"","data":' + encoder.encode(rows).encode() + b"}"
+
+def streamed(rows : list[dict], chunk_size : int) -> bytes:
+    # Partes que "streaming_response" envía (starlette las itera desde un hilo)
+    return b"".join(serialization.iter_response(iter(rows), chunk_size=chunk_size))
+
+def measure(function : Callable[[], bytes], repeat : int) -> tuple[float, int]:
+    best = float("inf")
+    size = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = function()
+        best = min(best, time.perf_counter() - started)
+        size = len(body)
+    return best, size
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    rows = build_rows(args.rows)
+    assert len(json.loads(success_response(rows).body)["data"]) == args.rows
+    results = [
+        ("walk + model_dump", *measure(lambda: walk_model_dump(rows), args.repeat)),
+        ("jsonable_encoder", *measure(lambda: jsonable(rows), args.repeat)),
+        ("dispatch json", *measure(lambda: stdlib_dispatch(rows), args.repeat)),
+        (f"success_response ({serialization.backend()})", *measure(lambda: success_response(rows).body, args.repeat)),
+        (f"iter_response ({serialization.backend()})", *measure(lambda: streamed(rows, args.chunk_size), args.repeat))
+    ]
+    print(f"{args.rows} registros")
+    for label, seconds, size in results:
+        print(f"{label:<30} {seconds * 1000:9.1f} ms  {args.rows / seconds:12.0f} registros/s  {size / (1024 * 1024):7.1f} MiB  x{results[0][1] / seconds:6.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,13 @@
+"""
+Suite de benchmarks reproducible de las operaciones CRUD de `service` (select, insert, update, delete)
+
+Levanta un PostgreSQL desechable (initdb en un directorio temporal) y un MongoDB local (`mongod` si
+está en el PATH; si no, mongomock en el mismo proceso), crea conjuntos de datos parametrizados
+(registros x columnas x profundidad de los documentos) y mide, por operación y tamaño de resultado,
+los percentiles de latencia, el throughput y el pico de memoria. Los resultados se escriben en JSON
+para compararlos entre commits.
+
+Uso:
+    python -m benchmarks.crud run [--rows 10000] [--columns 8] [--depth 0 3] [--output resultados.json]
+    python -m benchmarks.crud compare <base.json> <nuevo.json> [--threshold 0.1] [--metric p50]
+"""
@@ -0,0 +1,120 @@
+import argparse
+import itertools
+import json
+import os
+import sys
+from contextlib import ExitStack
+from typing import Any
+
+from benchmarks.crud import __doc__ as DOC, report, servers
+from benchmarks.crud.harness import measure
+from benchmarks.crud.targets import Dataset, MongoDB_Target, PostgreSQL_Target
+from fracturex_module_database.model.dto.http_response import is_error_response
+from fracturex_module_database.service import service
+
+POSTGRESQL_KEY = "fx_bench_postgresql"
+MONGODB_KEY = "fx_bench_mongodb"
+
+def run_target(target : Any, sizes : list[int], iterations : int, warmup : int) -> list[dict[str, Any]]:
+    returnValue = []
+    target.seed()
+    try:
+        for operation in target.operations(sizes):
+            measurement = measure(operation.call, iterations, warmup)
+            if operation.finish is not None:
+                operation.finish()
+            returnValue.append({
+                "backend": target.backend,
+                "operation": operation.name,
+                **target.dataset._asdict(),
+                "result_size": operation.result_size,
+                "iterations": iterations,
+                **measurement,
+                "rows_per_second": measurement["ops_per_second"] * operation.result_size
+            })
+            print(f"{target.backend} {operation.name} {target.dataset} result_size={operation.result_size} p50={measurement['p50']:.3f} ms", file=sys.stderr)
+    finally:
+        target.drop()
+    return returnValue
+
+def run(args : argparse.Namespace) -> int:
+    results: list[dict[str, Any]] = []
+    with ExitStack() as stack:
+        database_config: dict[str, dict] = {}
+        mongodb_url = None
+        if "postgresql" in args.backends:
+            database_config[POSTGRESQL_KEY] = {"url": args.postgresql_url or stack.enter_context(servers.local_postgresql(args.pg_bin))}
+        if "mongodb" in args.backends:
+            mongodb_url = args.mongodb_url or stack.enter_context(servers.local_mongodb())
+            if mongodb_url is not None:
+                database_config[MONGODB_KEY] = {"url": mongodb_url}
+        os.environ["FRACTUREX_MODULE_DATABASE_CONFIG"] = json.dumps(database_config)
+        service.reload_database_config()
+
+        for rows, columns, depth in itertools.product(args.rows, args.columns, args.depth):
+            dataset = Dataset(rows, columns, depth)
+            if "postgresql" in args.backends:
+                with service.database_connection(POSTGRESQL_KEY) as conn:
+                    if is_error_response(conn):
+                        raise RuntimeError(conn.body.decode())
+                    results.extend(run_target(PostgreSQL_Target(conn, dataset, args.seed), args.result_sizes, args.iterations, args.warmup))
+            if "mongodb" in args.backends:
+                if mongodb_url is not None:
+                    conn = service.get_database_connection(MONGODB_KEY)
+                    if is_error_response(conn):
+                        raise RuntimeError(conn.body.decode())
+                    target = MongoDB_Target(conn, dataset, args.seed)
+                else:
+                    import mongomock
+                    target = MongoDB_Target(mongomock.MongoClient("mongodb://localhost/fx_bench"), dataset, args.seed, stand_in=True)
+                results.extend(run_target(target, args.result_sizes, args.iterations, args.warmup))
+
+    parameters = {key: value for key, value in vars(args).items() if key not in ("command", "postgresql_url", "mongodb_url", "pg_bin", "output", "baseline")}
+    parameters["mongodb"] = None if "mongodb" not in args.backends else "mongomock" if mongodb_url is None else "url" if args.mongodb_url else "mongod"
+    report.print_results(results)
+    if args.output:
+        report.write(args.output, report.metadata(parameters), results)
+    if args.baseline:
+        return check(report.read(args.baseline), {"results": results}, args.metric, args.threshold)
+    return 0
+
+def check(baseline : dict[str, Any], current : dict[str, Any], metric : str, threshold : float) -> int:
+    comparison = report.compare(baseline, current, metric, threshold)
+    report.print_comparison(comparison, metric, threshold)
+    # Código de salida 1 si hay regresiones (para usarlo en CI)
+    return 1 if any(regression for *_, regression in comparison) else 0
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.crud", description=DOC, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Ejecutar la suite")
+    run_parser.add_argument("--backends", nargs="+", choices=["postgresql", "mongodb"], default=["postgresql", "mongodb"])
+    run_parser.add_argument("--rows", nargs="+", type=int, default=[10000])
+    run_parser.add_argument("--columns", nargs="+", type=int, default=[8])
+    run_parser.add_argument("--depth", nargs="+", type=int, default=[0, 3], help="Profundidad del documento anidado (0 = sin documento)")
+    run_parser.add_argument("--result-sizes", nargs="+", type=int, default=[1, 100, 1000], help="Registros retornados por select (1 = búsqueda por llave)")
+    run_parser.add_argument("--iterations", type=int, default=200)
+    run_parser.add_argument("--warmup", type=int, default=20)
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--postgresql-url", help="Usar un servidor existente en lugar de initdb (se crea y elimina la tabla fx_bench_crud)")
+    run_parser.add_argument("--pg-bin", help="Directorio de initdb y pg_ctl")
+    run_parser.add_argument("--mongodb-url", help="Usar un servidor existente en lugar de mongod/mongomock")
+    run_parser.add_argument("--output", help="Archivo JSON de resultados")
+    run_parser.add_argument("--baseline", help="Archivo JSON de una ejecución anterior con el que comparar")
+    run_parser.add_argument("--metric", default="p50")
+    run_parser.add_argument("--threshold", type=float, default=0.1)
+
+    compare_parser = commands.add_parser("compare", help="Comparar dos archivos de resultados")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--metric", default="p50")
+    compare_parser.add_argument("--threshold", type=float, default=0.1)
+
+    args = parser.parse_args()
+    if args.command == "run":
+        sys.exit(run(args))
+    sys.exit(check(report.read(args.baseline), report.read(args.current), args.metric, args.threshold))
+
+if __name__ == "__main__":
+    main()
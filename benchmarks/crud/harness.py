@@ -0,0 +1,69 @@
+"""
+Medición de una operación: percentiles de latencia, throughput y pico de memoria
+"""
+import gc
+import time
+import tracemalloc
+from typing import Any, Callable
+
+from fracturex_module_database.model.dto.http_response import is_error_response
+
+def percentile(values : list[float], fraction : float) -> float:
+    # Interpolación lineal entre los valores ordenados (igual que numpy.percentile)
+    position = (len(values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+def _check(result : Any) -> Any:
+    if is_error_response(result):
+        raise RuntimeError(result.body.decode())
+    return result
+
+def measure(call : Callable[[], Any], iterations : int, warmup : int) -> dict[str, float]:
+    """
+    Función para medir una operación
+
+    Se ejecuta "warmup" veces sin medir, "iterations" veces midiendo cada llamada (con el recolector de
+    basura desactivado) y una vez más con tracemalloc para el pico de memoria de Python (los búferes
+    del driver escritos en C no se cuentan).
+
+    Returns
+    -------
+    dict[str, float]
+        Latencias en milisegundos (min, p50, p90, p95, p99, max, mean), operaciones por segundo y pico de memoria en bytes
+    """
+    for _ in range(warmup):
+        _check(call())
+    latencies: list[float] = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(iterations):
+            started = time.perf_counter()
+            result = call()
+            latencies.append(time.perf_counter() - started)
+            _check(result)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        _check(call())
+        peak_memory = tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+    latencies.sort()
+    return {
+        "min": latencies[0] * 1000,
+        "p50": percentile(latencies, 0.50) * 1000,
+        "p90": percentile(latencies, 0.90) * 1000,
+        "p95": percentile(latencies, 0.95) * 1000,
+        "p99": percentile(latencies, 0.99) * 1000,
+        "max": latencies[-1] * 1000,
+        "mean": sum(latencies) / len(latencies) * 1000,
+        "ops_per_second": len(latencies) / sum(latencies),
+        "peak_memory": peak_memory
+    }
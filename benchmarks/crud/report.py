@@ -0,0 +1,74 @@
+"""
+Resultados en JSON y comparación entre dos ejecuciones
+"""
+import json
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from typing import Any
+
+# Métricas en las que un valor mayor es mejor
+_HIGHER_IS_BETTER = {"ops_per_second", "rows_per_second"}
+
+def metadata(parameters : dict[str, Any]) -> dict[str, Any]:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], check=True, capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "created": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "parameters": parameters
+    }
+
+def result_key(result : dict[str, Any]) -> tuple:
+    return (result["backend"], result["operation"], result["rows"], result["columns"], result["depth"], result["result_size"])
+
+def write(path : str, meta : dict[str, Any], results : list[dict[str, Any]]) -> None:
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump({"meta": meta, "results": results}, file, indent=2)
+
+def read(path : str) -> dict[str, Any]:
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+def compare(baseline : dict[str, Any], current : dict[str, Any], metric : str = "p50", threshold : float = 0.1) -> list[tuple[tuple, float, float, float, bool]]:
+    """
+    Función para comparar dos ejecuciones
+
+    Parameters
+    ----------
+    metric : str = "p50"
+        Métrica a comparar (cualquier latencia, "ops_per_second", "rows_per_second" o "peak_memory")
+    threshold : float = 0.1
+        Empeoramiento relativo a partir del cual una medición se considera una regresión
+
+    Returns
+    -------
+    list[tuple[tuple, float, float, float, bool]]
+        (llave de la medición, valor base, valor nuevo, cambio relativo, es regresión), solo de las mediciones presentes en ambas ejecuciones
+    """
+    previous = {result_key(result): result for result in baseline["results"]}
+    returnValue = []
+    for result in current["results"]:
+        before = previous.get(result_key(result))
+        if before is None or not before[metric]:
+            continue
+        change = (result[metric] - before[metric]) / before[metric]
+        worse = -change if metric in _HIGHER_IS_BETTER else change
+        returnValue.append((result_key(result), before[metric], result[metric], change, worse > threshold))
+    return returnValue
+
+def print_results(results : list[dict[str, Any]]) -> None:
+    print(f"{'motor':<10} {'operación':<8} {'registros':>9} {'cols':>4} {'prof':>4} {'tamaño':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'ops/s':>9} {'registros/s':>12} {'memoria':>10}")
+    for result in results:
+        print(f"{result['backend']:<10} {result['operation']:<8} {result['rows']:>9} {result['columns']:>4} {result['depth']:>4} {result['result_size']:>7} {result['p50']:>9.3f} {result['p95']:>9.3f} {result['p99']:>9.3f} {result['ops_per_second']:>9.0f} {result['rows_per_second']:>12.0f} {result['peak_memory'] / 1024:>8.0f} KiB")
+
+def print_comparison(comparison : list[tuple[tuple, float, float, float, bool]], metric : str, threshold : float) -> None:
+    print(f"{metric} (regresión si empeora más de {threshold:.0%})")
+    for key, before, after, change, regression in comparison:
+        label = " ".join(str(value) for value in key)
+        print(f"{label:<45} {before:>12.3f} -> {after:>12.3f}  {change:+7.1%}{'  REGRESIÓN' if regression else ''}")
@@ -0,0 +1,86 @@
+"""
+Servidores locales desechables para la suite de benchmarks
+"""
+import os
+import shutil
+import socket
+import subprocess
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+def _pg_bin_dir(bin_dir : str | None) -> str:
+    if bin_dir is not None:
+        return bin_dir
+    initdb = shutil.which("initdb")
+    if initdb is not None:
+        return os.path.dirname(initdb)
+    pg_config = shutil.which("pg_config")
+    if pg_config is not None:
+        return subprocess.run([pg_config, "--bindir"], check=True, capture_output=True, text=True).stdout.strip()
+    raise RuntimeError("No se encontró initdb: agregue los binarios de PostgreSQL al PATH, use --pg-bin o --postgresql-url")
+
+@contextmanager
+def local_postgresql(bin_dir : str | None = None) -> Iterator[str]:
+    """
+    Context manager que crea un clúster PostgreSQL en un directorio temporal y retorna su URL
+
+    El servidor escucha solo en un socket Unix del directorio temporal y corre sin fsync: los tiempos
+    sirven para comparar commits, no para estimar los de un servidor real. Al salir se detiene y se
+    elimina el directorio.
+    """
+    bin_dir = _pg_bin_dir(bin_dir)
+    directory = tempfile.mkdtemp(prefix="fx_bench_pg_")
+    data = os.path.join(directory, "data")
+    try:
+        subprocess.run([os.path.join(bin_dir, "initdb"), "-D", data, "-U", "postgres", "-A", "trust", "-E", "UTF8", "--no-sync"], check=True, capture_output=True)
+        subprocess.run([os.path.join(bin_dir, "pg_ctl"), "-D", data, "-l", os.path.join(directory, "postgresql.log"), "-w", "-o", f"-k {directory} -h '' -F", "start"], check=True, capture_output=True)
+        try:
+            yield f"postgresql://postgres@/postgres?host={directory}"
+        finally:
+            subprocess.run([os.path.join(bin_dir, "pg_ctl"), "-D", data, "-m", "immediate", "stop"], capture_output=True)
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"No se pudo iniciar PostgreSQL: {e.stderr.decode(errors='replace').strip()}") from e
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+@contextmanager
+def local_mongodb(timeout : float = 30.0) -> Iterator[str | None]:
+    """
+    Context manager que inicia `mongod` en un directorio temporal y retorna su URL
+
+    Retorna None si `mongod` no está en el PATH (la suite usa entonces mongomock en el mismo proceso).
+    """
+    mongod = shutil.which("mongod")
+    if mongod is None:
+        yield None
+        return
+    from pymongo import MongoClient
+
+    directory = tempfile.mkdtemp(prefix="fx_bench_mongo_")
+    port = _free_port()
+    process = subprocess.Popen([mongod, "--dbpath", directory, "--port", str(port), "--bind_ip", "127.0.0.1", "--quiet"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        url = f"mongodb://127.0.0.1:{port}/fx_bench"
+        deadline = time.monotonic() + timeout
+        while True:
+            client = MongoClient(url, serverSelectionTimeoutMS=500)
+            try:
+                client.admin.command("ping")
+                break
+            except Exception:
+                if process.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError("No se pudo iniciar mongod")
+            finally:
+                client.close()
+        yield url
+    finally:
+        process.terminate()
+        process.wait(timeout)
+        shutil.rmtree(directory, ignore_errors=True)
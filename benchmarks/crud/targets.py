@@ -0,0 +1,157 @@
+"""
+Conjuntos de datos y operaciones medidas por motor
+"""
+import json
+import random
+from collections import deque
+from typing import Any, Callable, NamedTuple
+
+from bson import ObjectId
+
+from fracturex_module_database.model.database_crud_info import MongoDB, PostgreSQL
+from fracturex_module_database.service import service
+
+NAME = "fx_bench_crud"
+
+class Dataset(NamedTuple):
+    rows: int
+    columns: int
+    depth: int
+
+class Operation(NamedTuple):
+    name: str
+    result_size: int
+    call: Callable[[], Any]
+    # Se ejecuta al terminar la medición (fuera del tiempo medido), por ejemplo para confirmar
+    finish: Callable[[], None] | None = None
+
+def document(depth : int) -> dict | None:
+    # Documento anidado "depth" niveles
+    returnValue = None
+    for level in range(depth, 0, -1):
+        returnValue = {"level": level, "name": f"level {level}", "values": [level, level * 2, level * 3], "child": returnValue}
+    return returnValue
+
+def result_sizes(dataset : Dataset, sizes : list[int]) -> list[int]:
+    return sorted({min(size, dataset.rows) for size in sizes})
+
+class PostgreSQL_Target:
+    """
+    Tabla `fx_bench_crud` (id, c0..cN text, doc jsonb si depth > 0) en una conexión del pool de `service`
+    """
+
+    backend = "postgresql"
+
+    def __init__(self, conn : Any, dataset : Dataset, seed : int) -> None:
+        self.conn = conn
+        self.dataset = dataset
+        self.random = random.Random(seed)
+        self.columns = [f"c{i}" for i in range(dataset.columns)] + (["doc"] if dataset.depth else [])
+
+    def seed(self) -> None:
+        definitions = ", ".join([f"c{i} text" for i in range(self.dataset.columns)] + (["doc jsonb"] if self.dataset.depth else []))
+        values = ", ".join([f"'value {i} ' || g" for i in range(self.dataset.columns)] + (["%s::jsonb"] if self.dataset.depth else []))
+        with self.conn.cursor() as mycursor:
+            mycursor.execute(f"DROP TABLE IF EXISTS {NAME}; CREATE TABLE {NAME} (id bigint PRIMARY KEY, {definitions})")
+            mycursor.execute(f"INSERT INTO {NAME} SELECT g, {values} FROM generate_series(1, %s) AS g", ((json.dumps(document(self.dataset.depth)),) if self.dataset.depth else ()) + (self.dataset.rows,))
+            mycursor.execute(f"ANALYZE {NAME}")
+        self.conn.commit()
+
+    def drop(self) -> None:
+        self.conn.rollback()
+        with self.conn.cursor() as mycursor:
+            mycursor.execute(f"DROP TABLE IF EXISTS {NAME}")
+        self.conn.commit()
+
+    def _row(self, key : int) -> tuple:
+        return (key, *[f"value {i} {key}" for i in range(self.dataset.columns)]) + ((json.dumps(document(self.dataset.depth)),) if self.dataset.depth else ())
+
+    def operations(self, sizes : list[int]) -> list[Operation]:
+        conn = self.conn
+        rows = self.dataset.rows
+        inserted: deque[int] = deque()
+        next_key = iter(range(rows + 1, 2 ** 62))
+        columns = ", ".join(["id", *self.columns])
+        placeholders = ", ".join(["%s"] * (len(self.columns) + 1))
+
+        def insert() -> Any:
+            key = next(next_key)
+            inserted.append(key)
+            return service.insert(PostgreSQL.Insert(conn=conn, query=f"INSERT INTO {NAME} ({columns}) VALUES ({placeholders}) RETURNING id", vars=self._row(key)))
+
+        def update() -> Any:
+            return service.update(PostgreSQL.Update(conn=conn, query=f"UPDATE {NAME} SET c0 = %s WHERE id = %s RETURNING id", vars=(f"updated {self.random.random()}", self.random.randint(1, rows))))
+
+        def delete() -> Any:
+            return service.delete(PostgreSQL.Delete(conn=conn, query=f"DELETE FROM {NAME} WHERE id = %s RETURNING id", vars=(inserted.popleft(),)))
+
+        def select(size : int) -> Callable[[], Any]:
+            if size == 1:
+                return lambda: service.select(PostgreSQL.Select(conn=conn, query=f"SELECT * FROM {NAME} WHERE id = %s", vars=(self.random.randint(1, rows),)))
+            return lambda: service.select(PostgreSQL.Select(conn=conn, query=f"SELECT * FROM {NAME} ORDER BY id LIMIT %s", vars=(size,)))
+
+        return [Operation("select", size, select(size), conn.rollback) for size in result_sizes(self.dataset, sizes)] + [
+            Operation("update", 1, update, conn.commit),
+            Operation("insert", 1, insert, conn.commit),
+            # Elimina los registros que agregó "insert" (el conjunto de datos no cambia entre operaciones)
+            Operation("delete", 1, delete)
+        ]
+
+class MongoDB_Target:
+    """
+    Colección `fx_bench_crud` (_id, c0..cN, doc anidado si depth > 0) en un MongoClient o en mongomock
+    """
+
+    backend = "mongodb"
+
+    def __init__(self, conn : Any, dataset : Dataset, seed : int, stand_in : bool = False) -> None:
+        self.conn = conn
+        self.dataset = dataset
+        self.random = random.Random(seed)
+        self.stand_in = stand_in
+        self.collection = conn.get_database()[NAME]
+
+    def _crud_info(self, model : type, **fields : Any) -> Any:
+        # mongomock no es un MongoClient: los modelos se crean sin validar "conn"
+        return model.model_construct(**fields) if self.stand_in else model(**fields)
+
+    def _document(self, key : Any) -> dict:
+        returnValue = {"_id": key, **{f"c{i}": f"value {i} {key}" for i in range(self.dataset.columns)}}
+        if self.dataset.depth:
+            returnValue["doc"] = document(self.dataset.depth)
+        return returnValue
+
+    def seed(self) -> None:
+        self.collection.drop()
+        for start in range(1, self.dataset.rows + 1, 10000):
+            self.collection.insert_many([self._document(key) for key in range(start, min(start + 10000, self.dataset.rows + 1))], ordered=False)
+
+    def drop(self) -> None:
+        self.collection.drop()
+
+    def operations(self, sizes : list[int]) -> list[Operation]:
+        conn = self.conn
+        rows = self.dataset.rows
+        inserted: deque[ObjectId] = deque()
+
+        def insert() -> Any:
+            key = ObjectId()
+            inserted.append(key)
+            return service.insert(self._crud_info(MongoDB.Insert, conn=conn, collection_name=NAME, document=self._document(key)))
+
+        def update() -> Any:
+            return service.update(self._crud_info(MongoDB.Update, conn=conn, collection_name=NAME, query={"_id": self.random.randint(1, rows)}, update_values={"c0": f"updated {self.random.random()}"}))
+
+        def delete() -> Any:
+            return service.delete(self._crud_info(MongoDB.Delete, conn=conn, collection_name=NAME, query={"_id": inserted.popleft()}))
+
+        def select(size : int) -> Callable[[], Any]:
+            if size == 1:
+                return lambda: service.select(self._crud_info(MongoDB.Select, conn=conn, collection_name=NAME, query={"_id": self.random.randint(1, rows)}))
+            return lambda: service.select(self._crud_info(MongoDB.Select, conn=conn, collection_name=NAME, aggregate_pipeline=[{"$sort": {"_id": 1}}], limit=size))
+
+        return [Operation("select", size, select(size)) for size in result_sizes(self.dataset, sizes)] + [
+            Operation("update", 1, update),
+            Operation("insert", 1, insert),
+            Operation("delete", 1, delete)
+        ]
@@ -1,14 +1,76 @@
 import os
 import json
-from dotenv import load_dotenv
+import threading
 
 from fracturex_module_database.model.database_config import Database_Config
-
-# Cargar variables de entorno
-load_dotenv()
+from fracturex_module_database.model.database_type import Database_Type
 
 class Environment:
-    FRACTUREX_MODULE_DATABASE_CONFIG: dict[str, Database_Config] = json.loads(os.getenv("FRACTUREX_MODULE_DATABASE_CONFIG"))
+    """
+    Valores extraídos del .env
+
+    La configuración se lee y valida la primera vez que se usa (no al importar el módulo) y queda en
+    memoria; `reload()` la vuelve a leer.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._database_config: dict[str, Database_Config] | None = None
+
+    @property
+    def FRACTUREX_MODULE_DATABASE_CONFIG(self) -> dict[str, Database_Config]:
+        database_config = self._database_config
+        if database_config is None:
+            with self._lock:
+                if self._database_config is None:
+                    self._database_config = self._load()
+                database_config = self._database_config
+        return database_config
+
+    @property
+    def FRACTUREX_MODULE_DATABASE_DEBUG(self) -> bool:
+        from dotenv import load_dotenv
+
+        # Modo de depuración: valida los descriptores de "crud_descriptor"
+        load_dotenv()
+        return os.getenv("FRACTUREX_MODULE_DATABASE_DEBUG", "").lower() in ("1", "true", "yes")
+
+    def reload(self) -> dict[str, Database_Config]:
+        """
+        Función para volver a leer la configuración de las bases de datos
+
+        Los pools ya creados conservan la configuración con la que se crearon.
+
+        Returns
+        -------
+        dict[str, Database_Config]
+            Configuración de cada base de datos, por llave
+        """
+        database_config = self._load()
+        with self._lock:
+            self._database_config = database_config
+        return database_config
+
+    @staticmethod
+    def _load() -> dict[str, Database_Config]:
+        from dotenv import load_dotenv
+
+        # Cargar variables de entorno
+        load_dotenv()
+        value = os.getenv("FRACTUREX_MODULE_DATABASE_CONFIG")
+        if not value:
+            return {}
+        returnValue: dict[str, Database_Config] = {}
+        for database_config_key, config in json.loads(value).items():
+            database_config = Database_Config(**config)
+            # Asignar el type según la URL si no se indicó
+            if database_config.type is None:
+                if "postgresql" in database_config.url.lower():
+                    database_config.type = Database_Type.POSTGRESQL
+                elif "mongodb" in database_config.url.lower():
+                    database_config.type = Database_Type.MONGODB
+            returnValue[database_config_key] = database_config
+        return returnValue
 
 # Valores extraídos del .env
 environment: Environment = Environment()
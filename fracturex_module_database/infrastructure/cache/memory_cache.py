@@ -0,0 +1,74 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable
+
+from fracturex_module_database.model.icache_backend import ICache_Backend
+
+class Memory_Cache_Backend(ICache_Backend):
+    """
+    Backend de caché en memoria del proceso, LRU y acotado por cantidad de entradas y por bytes
+    """
+
+    def __init__(self, max_entries : int = 1024, max_bytes : int = 64 * 1024 * 1024) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # llave -> (valor, expiración, tags)
+        self._entries: OrderedDict[str, tuple[bytes, float | None, frozenset[str]]] = OrderedDict()
+        self._tags: dict[str, set[str]] = {}
+        self._bytes = 0
+
+    def _remove_locked(self, key : str) -> None:
+        value, _, tags = self._entries.pop(key)
+        self._bytes -= len(value)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def get(self, key : str) -> bytes | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] is not None and entry[1] <= time.monotonic():
+                self._remove_locked(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def set(self, key : str, value : bytes, ttl : float | None, tags : Iterable[str]) -> None:
+        if len(value) > self.max_bytes:
+            return
+        tags = frozenset(tags)
+        with self._lock:
+            if key in self._entries:
+                self._remove_locked(key)
+            self._entries[key] = (value, time.monotonic() + ttl if ttl is not None else None, tags)
+            self._bytes += len(value)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove_locked(next(iter(self._entries)))
+
+    def invalidate_tags(self, tags : Iterable[str]) -> int:
+        returnValue = 0
+        with self._lock:
+            for tag in tags:
+                for key in list(self._tags.get(tag, ())):
+                    self._remove_locked(key)
+                    returnValue += 1
+        return returnValue
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+            self._bytes = 0
+
+    def size(self) -> tuple[int, int]:
+        with self._lock:
+            return (len(self._entries), self._bytes)
@@ -0,0 +1,210 @@
+import hashlib
+import pickle
+import re
+import threading
+from functools import lru_cache
+from typing import Any, Iterable
+
+from fracturex_module_database.infrastructure.cache.memory_cache import Memory_Cache_Backend
+from fracturex_module_database.model.cache_stats import Cache_Stats
+from fracturex_module_database.model.icache_backend import ICache_Backend
+
+_IDENTIFIER = r'((?:"[^"]+"|[A-Za-z_][\w$]*)(?:\.(?:"[^"]+"|[A-Za-z_][\w$]*))?)'
+_READ_TABLES = re.compile(r"\b(?:FROM|JOIN)\s+", re.IGNORECASE)
+# Palabras que pueden seguir a un elemento del FROM y que no son su alias
+_NOT_ALIAS = r"(?:WHERE|JOIN|INNER|LEFT|RIGHT|FULL|CROSS|NATURAL|ON|USING|GROUP|ORDER|HAVING|LIMIT|OFFSET|UNION|INTERSECT|EXCEPT|WINDOW|FOR|FETCH|RETURNING|TABLESAMPLE|WITH)\b"
+# Alias opcional de un elemento del FROM: "AS x", "x" o "x (a, b)"
+_ALIAS = r'(?:\s+(?:AS\s+)?(?!' + _NOT_ALIAS + r')(?:"[^"]+"|[A-Za-z_][\w$]*)(?:\s*\([^)]*\))?)?'
+# Tabla de la lista del FROM (no una función) con su alias
+_FROM_TABLE = re.compile(r"(?:ONLY\s+)?" + _IDENTIFIER + r"(?![\w$.\"]|\s*\()" + _ALIAS, re.IGNORECASE)
+# Inicio de una función o subconsulta de la lista del FROM, hasta su paréntesis
+_FROM_CALL = re.compile(r"(?:LATERAL\s+)?(?:" + _IDENTIFIER + r"\s*)?(?=\()", re.IGNORECASE)
+_FROM_ALIAS = re.compile(_ALIAS, re.IGNORECASE)
+_FROM_SEPARATOR = re.compile(r"\s*,\s*")
+_WRITE_TABLES = re.compile(r"\b(?:INSERT\s+INTO|UPDATE|DELETE\s+FROM|TRUNCATE(?:\s+TABLE)?)\s+(?:ONLY\s+)?" + _IDENTIFIER, re.IGNORECASE)
+# Etapas de un pipeline de agregación que leen de otras colecciones
+_PIPELINE_SOURCES = ("$lookup", "$graphLookup", "$unionWith")
+
+def _normalize_table(identifier : str) -> str:
+    # Se usa el nombre sin esquema para que "public.x" y "x" invaliden lo mismo
+    name = identifier.rsplit(".", 1)[-1]
+    return name[1:-1] if name.startswith('"') else name.lower()
+
+@lru_cache(maxsize=1024)
+def postgresql_tags(query : str, write : bool = False) -> frozenset[str]:
+    """
+    Función para extraer las tablas leídas (o escritas) por una consulta, usadas como tags de invalidación
+
+    El resultado se guarda por consulta: las mismas sentencias se repiten con distintos parámetros.
+    """
+    if write:
+        return frozenset({_normalize_table(match) for match in _WRITE_TABLES.findall(query)})
+    return frozenset(_normalize_table(table) for table in _read_tables(query))
+
+def _read_tables(query : str) -> Iterable[str]:
+    # Tablas de cada FROM/JOIN, incluidas las listas separadas por comas ("FROM a x, b AS y"). Las funciones
+    # y subconsultas de la lista se saltan (las subconsultas tienen su propio FROM)
+    for keyword in _READ_TABLES.finditer(query):
+        position = keyword.end()
+        while True:
+            item = _FROM_TABLE.match(query, position)
+            if item is not None:
+                yield item.group(1)
+                position = item.end()
+            else:
+                call = _FROM_CALL.match(query, position)
+                position = _skip_parentheses(query, call.end()) if call is not None else -1
+                if position < 0:
+                    break
+                position = _FROM_ALIAS.match(query, position).end()
+            separator = _FROM_SEPARATOR.match(query, position)
+            if separator is None:
+                break
+            position = separator.end()
+
+def _skip_parentheses(query : str, position : int) -> int:
+    # Posición siguiente al paréntesis que cierra el que está en "position" (-1 si no cierra)
+    depth = 0
+    quote: str | None = None
+    for index in range(position, len(query)):
+        character = query[index]
+        if quote is not None:
+            if character == quote:
+                quote = None
+        elif character in "'\"":
+            quote = character
+        elif character == "(":
+            depth += 1
+        elif character == ")":
+            depth -= 1
+            if depth == 0:
+                return index + 1
+    return -1
+
+def mongodb_tags(collection_name : str, aggregate_pipeline : list[dict] | None = None) -> set[str]:
+    """
+    Función para extraer las colecciones leídas por una consulta, usadas como tags de invalidación
+    """
+    returnValue = {collection_name}
+    for stage in aggregate_pipeline or ():
+        if not isinstance(stage, dict):
+            continue
+        for operator in _PIPELINE_SOURCES:
+            source = stage.get(operator)
+            if isinstance(source, str):
+                returnValue.add(source)
+            elif isinstance(source, dict):
+                name = source.get("from", source.get("coll"))
+                if isinstance(name, str):
+                    returnValue.add(name)
+                returnValue |= mongodb_tags(name if isinstance(name, str) else collection_name, source.get("pipeline"))
+    return returnValue
+
+class Result_Cache:
+    """
+    Caché de resultados de `select` (read-through) con TTL por llamada e invalidación por tags
+
+    Los resultados se guardan serializados con pickle, por lo que cada acierto retorna una copia
+    independiente que el llamador puede modificar.
+
+    Cada tag tiene un número de generación que aumenta al invalidarlo: `set` recibe las generaciones
+    leídas antes de la consulta (`generations`) y no guarda el resultado si alguna cambió mientras tanto,
+    ya que la consulta pudo leer datos anteriores a la escritura. Las generaciones son del proceso.
+    """
+
+    def __init__(self, backend : ICache_Backend | None = None) -> None:
+        self.backend = backend if backend is not None else Memory_Cache_Backend()
+        self._lock = threading.Lock()
+        self._generations: dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.sets = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(database_config_key : str, *parts : Any) -> str:
+        return hashlib.blake2b(repr((database_config_key, parts)).encode(), digest_size=20).hexdigest()
+
+    def get(self, key : str) -> tuple[bool, Any]:
+        value = self.backend.get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return (False, None)
+            self.hits += 1
+        return (True, pickle.loads(value))
+
+    def generations(self, tags : Iterable[str]) -> dict[str, int]:
+        """
+        Función para obtener la generación actual de cada tag, a leer antes de ejecutar la consulta
+        """
+        with self._lock:
+            return {tag: self._generations.get(tag, 0) for tag in tags}
+
+    def set(self, key : str, value : Any, ttl : float | None, tags : Iterable[str], generations : dict[str, int] | None = None) -> None:
+        if generations is not None and self._changed(generations):
+            return
+        try:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return
+        self.backend.set(key, data, ttl, tags)
+        if generations is not None:
+            # Una invalidación entre la verificación anterior y "backend.set" pudo no alcanzar esta entrada
+            changed = self._changed(generations)
+            if changed:
+                self.backend.invalidate_tags(changed)
+                return
+        with self._lock:
+            self.sets += 1
+
+    def _changed(self, generations : dict[str, int]) -> list[str]:
+        with self._lock:
+            return [tag for tag, generation in generations.items() if self._generations.get(tag, 0) != generation]
+
+    def invalidate(self, tags : Iterable[str]) -> int:
+        tags = list(tags)
+        # La generación aumenta antes de descartar las entradas (ver "set")
+        with self._lock:
+            for tag in tags:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+        returnValue = self.backend.invalidate_tags(tags)
+        with self._lock:
+            self.invalidations += returnValue
+        return returnValue
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def stats(self) -> Cache_Stats:
+        entries, size = self.backend.size()
+        with self._lock:
+            lookups = self.hits + self.misses
+            return Cache_Stats(
+                entries=entries,
+                bytes=size,
+                hits=self.hits,
+                misses=self.misses,
+                sets=self.sets,
+                invalidations=self.invalidations,
+                hit_rate=self.hits / lookups if lookups else 0.0
+            )
+
+# Caché de resultados compartida por todo el proceso
+result_cache: Result_Cache = Result_Cache()
+
+def configure_result_cache(backend : ICache_Backend | None = None, max_entries : int = 1024, max_bytes : int = 64 * 1024 * 1024) -> Result_Cache:
+    """
+    Función para reemplazar el backend de la caché de resultados (por defecto en memoria)
+
+    Parameters
+    ----------
+    backend : ICache_Backend | None = None
+        Backend a usar. Si no se indica se crea un Memory_Cache_Backend con los límites indicados
+    max_entries : int = 1024
+        Cantidad máxima de entradas del backend en memoria
+    max_bytes : int = 64 MiB
+        Cantidad máxima de bytes del backend en memoria
+    """
+    result_cache.backend = backend if backend is not None else Memory_Cache_Backend(max_entries=max_entries, max_bytes=max_bytes)
+    return result_cache
@@ -0,0 +1,128 @@
+import asyncio
+import copy
+import pickle
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Callable
+
+from fracturex_module_database.model.single_flight_stats import Single_Flight_Stats
+
+class _Shared:
+    """
+    Resultado entregado a las llamadas que esperaban: serializado una sola vez con pickle, o copiado
+    con deepcopy por cada una si no se puede serializar
+    """
+
+    __slots__ = ("data", "value")
+
+    def __init__(self, value : Any) -> None:
+        try:
+            self.data: bytes | None = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            self.value = None
+        except (pickle.PicklingError, TypeError, AttributeError):
+            self.data = None
+            self.value = value
+
+    def copy(self) -> Any:
+        return pickle.loads(self.data) if self.data is not None else copy.deepcopy(self.value)
+
+class _Call:
+
+    __slots__ = ("future", "waiters")
+
+    def __init__(self) -> None:
+        self.future: Future = Future()
+        self.waiters = 0
+
+class Single_Flight:
+    """
+    Agrupa las llamadas concurrentes con la misma llave en una sola ejecución
+
+    La primera llamada ejecuta la función; las que llegan mientras está en curso (desde hilos o desde
+    asyncio) esperan hasta `wait_timeout` segundos y reciben una copia independiente del mismo
+    resultado. Si la espera se excede, ejecutan la función por su cuenta. No guarda resultados: al
+    terminar la ejecución la llave queda libre (para eso está la caché de resultados).
+    """
+
+    def __init__(self, wait_timeout : float = 10.0) -> None:
+        self.wait_timeout = wait_timeout
+        self._lock = threading.Lock()
+        self._calls: dict[str, _Call] = {}
+        self.executions = 0
+        self.shared = 0
+        self.timeouts = 0
+
+    def do(self, key : str, function : Callable[[], Any]) -> Any:
+        """
+        Función para ejecutar "function", o esperar el resultado de la ejecución en curso con la misma llave
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+                leader = True
+            else:
+                call.waiters += 1
+                leader = False
+        if leader:
+            return self._lead(key, call, function)
+        try:
+            shared: _Shared = call.future.result(self.wait_timeout)
+        except FutureTimeoutError:
+            self._timed_out()
+            return function()
+        return self._share(shared)
+
+    async def wait_async(self, key : str) -> tuple[bool, Any]:
+        """
+        Función para esperar sin bloquear el event loop la ejecución en curso con la misma llave
+
+        Retorna (True, copia del resultado), o (False, None) si no hay una ejecución en curso; en ese caso
+        el llamador ejecuta la consulta con "do", para que otros puedan unirse. Lanza TimeoutError si la
+        espera se excede
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                return (False, None)
+            call.waiters += 1
+        try:
+            # shield: al excederse la espera no se cancela el Future compartido
+            shared: _Shared = await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(call.future)), self.wait_timeout)
+        except asyncio.TimeoutError:
+            self._timed_out()
+            raise TimeoutError(f"La consulta en curso no terminó en {self.wait_timeout} s")
+        return (True, self._share(shared))
+
+    def _lead(self, key : str, call : _Call, function : Callable[[], Any]) -> Any:
+        try:
+            returnValue = function()
+        except BaseException as e:
+            with self._lock:
+                del self._calls[key]
+            call.future.set_exception(e)
+            raise
+        # Desde aquí no se unen más llamadas; solo se serializa si alguien espera
+        with self._lock:
+            del self._calls[key]
+            waiters = call.waiters
+        if waiters:
+            call.future.set_result(_Shared(returnValue))
+        return returnValue
+
+    def _share(self, shared : _Shared) -> Any:
+        with self._lock:
+            self.shared += 1
+        return shared.copy()
+
+    def _timed_out(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def stats(self) -> Single_Flight_Stats:
+        with self._lock:
+            return Single_Flight_Stats(executions=self.executions, shared=self.shared, timeouts=self.timeouts, in_flight=len(self._calls))
+
+# Agrupador de "select" compartido por todo el proceso
+select_flight: Single_Flight = Single_Flight()
@@ -1,96 +1,405 @@
-from fastapi import status
-from fastapi.responses import JSONResponse
-from pymongo import MongoClient, errors
+from __future__ import annotations
+
+import struct
+from pymongo import IndexModel, MongoClient, ReplaceOne, UpdateOne, errors
+from pymongo.read_preferences import make_read_preference, read_pref_mode_from_name
 from bson import ObjectId
+from itertools import islice
+from typing import TYPE_CHECKING, Any, Iterator
 
+from fracturex_module_database.infrastructure import instrumentation
+from fracturex_module_database.infrastructure.database import transaction
+from fracturex_module_database.infrastructure.instrumentation import logger
+from fracturex_module_database.infrastructure.pagination import (
+    document_key,
+    encode_token,
+    include_fields,
+    mongodb_keys,
+    mongodb_keyset_filter
+)
+from fracturex_module_database.infrastructure.result_shape import (
+    projection_columns,
+    shape_documents
+)
+from fracturex_module_database.model.bulk_result import (
+    Bulk_Chunk_Result,
+    Bulk_Insert_Result,
+    Bulk_Write_Result
+)
+from fracturex_module_database.model.database_type import Database_Type
 from fracturex_module_database.model.idatabase import IDatabase
-from fracturex_module_database.model.dto.http_response import HTTP_Response
+from fracturex_module_database.model.index_report import (
+    Ensure_Indexes_Result,
+    Index_Spec
+)
+from fracturex_module_database.model.dto.http_response import error_response
+from fracturex_module_database.model.export_result import (
+    Export_Format,
+    Export_Result
+)
+from fracturex_module_database.model.page import Page
+from fracturex_module_database.model.result_format import (
+    Result_Format,
+    Tabular_Result
+)
+
+if TYPE_CHECKING:
+    from fastapi.responses import JSONResponse
+
+_BSON_LENGTH = struct.Struct("<i")
+
+def _count_documents(batch : bytes) -> int:
+    # Cada documento BSON empieza con su largo total (int32 little-endian)
+    count = 0
+    offset = 0
+    size = len(batch)
+    while offset < size:
+        offset += _BSON_LENGTH.unpack_from(batch, offset)[0]
+        count += 1
+    return count
+
+# Opciones de Index_Spec y su nombre en createIndexes/list_indexes
+_INDEX_OPTIONS: dict[str, str] = {
+    "unique": "unique",
+    "sparse": "sparse",
+    "expire_after_seconds": "expireAfterSeconds",
+    "partial_filter_expression": "partialFilterExpression"
+}
+
+def _index_options(index : Index_Spec) -> dict[str, Any]:
+    # Solo las opciones definidas (False/None equivale a no indicarlas)
+    returnValue = {option: getattr(index, field) for field, option in _INDEX_OPTIONS.items() if getattr(index, field) not in (None, False)}
+    if index.name is not None:
+        returnValue["name"] = index.name
+    return returnValue
 
 class MongoDB(IDatabase):
     
     @staticmethod
-    def select(conn : MongoClient, collection_name : str, query : dict = None, aggregate_pipeline : list[dict] = None, sort : list[dict[str, int]] = None, print_data : bool = False) -> list[dict] | JSONResponse:
-        print(f"---------- MongoDB.Select({conn.get_database().name}) ----------")
+    def select(conn : MongoClient, collection_name : str, query : dict = None, aggregate_pipeline : list[dict] = None, sort : list[dict[str, int]] = None, print_data : bool = False, projection : dict | None = None, result_format : Result_Format = Result_Format.RECORDS, limit : int | None = None, skip : int | None = None, batch_size : int | None = None, keyset : list[str] | None = None, descending : bool = False, page_size : int | None = None, after : tuple | None = None, page_fingerprint : str | None = None, read_preference : str | None = None) -> list[dict] | Tabular_Result | dict[str, Any] | Page | JSONResponse:
         if print_data:
-            print(f"collection_name: {collection_name}")
-            print(f"query: {query}")
-            print(f"aggregate_pipeline: {aggregate_pipeline}")
+            logger.debug("MongoDB.Select(%s) collection_name: %s query: %s aggregate_pipeline: %s projection: %s result_format: %s limit: %s skip: %s keyset: %s page_size: %s after: %s", conn.get_database().name, collection_name, query, aggregate_pipeline, projection, result_format.value, limit, skip, keyset, page_size, after)
         
-        returnValue: list[dict] = []
+        started = instrumentation.start()
+        returnValue: list[dict] | Tabular_Result | dict[str, Any] | Page = []
+        documents: list[dict] | None = None
+        error: Exception | None = None
+        try:
+            # La read preference (por ejemplo "nearest") deja que el driver elija el miembro del replica set de menor latencia
+            database = conn.get_database(read_preference=make_read_preference(read_pref_mode_from_name(read_preference), None)) if read_preference else conn.get_database()
+            collection = database[collection_name]
+            keys: list[str] | None = None
+            if page_size:
+                # Se ordena por la llave (más "_id" para desempatar) y se pide un documento de más para saber si hay una página siguiente
+                keys = mongodb_keys(keyset)
+                sort = [(key, -1 if descending else 1) for key in keys]
+                limit = page_size + 1
+                projection = include_fields(projection, keys)
+                if after:
+                    keyset_filter = mongodb_keyset_filter(keys, descending, after)
+                    if aggregate_pipeline:
+                        aggregate_pipeline = aggregate_pipeline + [{"$match": keyset_filter}]
+                    else:
+                        query = {"$and": [query, keyset_filter]} if query else keyset_filter
+            if aggregate_pipeline:
+                # Ejecutar pipeline de agregación si está definido
+                stages = list(aggregate_pipeline)
+                if page_size:
+                    stages.append({"$sort": dict(sort)})
+                if skip:
+                    stages.append({"$skip": skip})
+                if limit:
+                    stages.append({"$limit": limit})
+                if projection:
+                    stages.append({"$project": projection})
+                options = {"batchSize": batch_size} if batch_size else {}
+                result = collection.aggregate(stages, session=transaction.mongodb_session(conn), **options)
+            else:
+                # Ejecutar búsqueda normal
+                result = collection.find(query if query is not None else {}, projection, session=transaction.mongodb_session(conn))
+                if sort:
+                    result = result.sort(sort)
+                if skip:
+                    result = result.skip(skip)
+                if limit:
+                    result = result.limit(limit)
+                if batch_size:
+                    result = result.batch_size(batch_size)
+            documents = list(result)
+            if page_size:
+                next_page_token = None
+                if len(documents) > page_size:
+                    documents = documents[:page_size]
+                    next_page_token = encode_token(page_fingerprint, document_key(documents[-1], keys))
+                returnValue = Page(rows=shape_documents(documents, result_format, projection_columns(projection)), next_page_token=next_page_token)
+            else:
+                returnValue = shape_documents(documents, result_format, projection_columns(projection))
+        except (errors.PyMongoError, ImportError, ValueError) as e:
+            error = e
+            returnValue = MongoDB.__error("Select", e)
+        finally:
+            if started is not None:
+                instrumentation.emit(Database_Type.MONGODB.value, "select", started, rows=None if error else len(documents), error=error, statement={"collection": collection_name, "filter": query, "pipeline": aggregate_pipeline, "sort": sort if page_size or not aggregate_pipeline else None, "skip": skip, "limit": limit, "projection": projection}, conn=conn)
+            return returnValue
+
+    @staticmethod
+    def select_stream(conn : MongoClient, collection_name : str, query : dict = None, aggregate_pipeline : list[dict] = None, sort : list[dict[str, int]] = None, batch_size : int = 2000, print_data : bool = False) -> Iterator[dict] | JSONResponse:
+        if print_data:
+            logger.debug("MongoDB.SelectStream(%s) collection_name: %s query: %s aggregate_pipeline: %s batch_size: %s", conn.get_database().name, collection_name, query, aggregate_pipeline, batch_size)
+        
+        started = instrumentation.start()
         try:
             collection = conn.get_database()[collection_name]
             if aggregate_pipeline:
                 # Ejecutar pipeline de agregación si está definido
-                result = collection.aggregate(aggregate_pipeline)
+                result = collection.aggregate(aggregate_pipeline, batchSize=batch_size, session=transaction.mongodb_session(conn))
             else:
                 # Ejecutar búsqueda normal
-                if query is not None:
-                    result = collection.find(query).sort(sort) if sort else collection.find(query)
-                else:
-                    result = collection.find().sort(sort) if sort else collection.find()
-            returnValue = list(result)
+                result = collection.find(query if query is not None else {}, batch_size=batch_size, session=transaction.mongodb_session(conn))
+                if sort:
+                    result = result.sort(sort)
         except errors.PyMongoError as e:
-            print("Exception")
-            print(str(e))
-            print("--------------------------------------------")
-            returnValue = JSONResponse(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content=HTTP_Response(success=False, message=f"There was an error: {str(e)}", data={}))
+            if started is not None:
+                instrumentation.emit(Database_Type.MONGODB.value, "select_stream", started, error=e)
+            return MongoDB.__error("SelectStream", e)
+        return MongoDB.__stream_documents(result, started)
+
+    @staticmethod
+    def __stream_documents(result, started : float | None) -> Iterator[dict]:
+        # El cursor se cierra al agotarse, al fallar o cuando el consumidor cierra el generador
+        rows = 0
+        error: Exception | None = None
+        try:
+            for document in result:
+                rows += 1
+                yield document
+        except Exception as e:
+            error = e
+            raise
         finally:
+            if started is not None:
+                instrumentation.emit(Database_Type.MONGODB.value, "select_stream", started, rows=rows, error=error)
+            result.close()
+
+    @staticmethod
+    def export(conn : MongoClient, collection_name : str, file : Any, query : dict = None, aggregate_pipeline : list[dict] = None, sort : list[dict[str, int]] = None, projection : dict | None = None, batch_size : int = 1000, print_data : bool = False) -> Export_Result | JSONResponse:
+        if print_data:
+            logger.debug("MongoDB.Export(%s) collection_name: %s query: %s aggregate_pipeline: %s projection: %s", conn.get_database().name, collection_name, query, aggregate_pipeline, projection)
+        
+        started = instrumentation.start()
+        returnValue: Any
+        rows = 0
+        written = 0
+        error: Exception | None = None
+        try:
+            collection = conn.get_database()[collection_name]
+            # Los lotes llegan como bytes BSON sin decodificar (ni siquiera a RawBSONDocument) y se escriben tal cual
+            if aggregate_pipeline:
+                batches = collection.aggregate_raw_batches(aggregate_pipeline + [{"$project": projection}] if projection else aggregate_pipeline, batchSize=batch_size, session=transaction.mongodb_session(conn))
+            else:
+                batches = collection.find_raw_batches(query if query is not None else {}, projection, batch_size=batch_size, sort=sort, session=transaction.mongodb_session(conn))
+            with batches:
+                for batch in batches:
+                    file.write(batch)
+                    written += len(batch)
+                    rows += _count_documents(batch)
+            returnValue = Export_Result(format=Export_Format.BSON, rows=rows, bytes=written)
+        except (errors.PyMongoError, OSError, TypeError, ValueError) as e:
+            error = e
+            returnValue = MongoDB.__error("Export", e)
+        finally:
+            if started is not None:
+                instrumentation.emit(Database_Type.MONGODB.value, "export", started, rows=rows, bytes=written, error=error)
             return returnValue
 
     @staticmethod
     def insert(conn : MongoClient, collection_name : str, document : dict, print_data : bool = False) -> ObjectId | JSONResponse:
-        print(f"---------- MongoDB.Insert({conn.get_database().name}) ----------")
         if print_data:
-            print(f"collection_name: {collection_name}")
-            print(f"document: {str(document)}")
+            logger.debug("MongoDB.Insert(%s) collection_name: %s document: %s", conn.get_database().name, collection_name, document)
         
+        started = instrumentation.start()
+        returnValue: ObjectId | JSONResponse = None
+        error: Exception | None = None
         try:
             collection = conn.get_database()[collection_name]
-            result = collection.insert_one(document)
+            result = collection.insert_one(document, session=transaction.mongodb_session(conn))
             returnValue = ObjectId(result.inserted_id)
         except errors.PyMongoError as e:
-            print("Exception")
-            print(str(e))
-            print("--------------------------------------------")
-            returnValue = JSONResponse(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content=HTTP_Response(success=False, message=f"There was an error: {str(e)}", data={}))
+            error = e
+            returnValue = MongoDB.__error("Insert", e)
+        finally:
+            if started is not None:
+                instrumentation.emit(Database_Type.MONGODB.value, "insert", started, rows=None if error else 1, error=error)
+            return returnValue
+
+    @staticmethod
+    def bulk_insert(conn : MongoClient, collection_name : str, documents : list[dict], chunk_size : int = 1000, print_data : bool = False) -> Bulk_Insert_Result | JSONResponse:
+        if print_data:
+            logger.debug("MongoDB.BulkInsert(%s) collection_name: %s documents: %s", conn.get_database().name, collection_name, len(documents))
+        
+        started = instrumentation.start()
+        returnValue = Bulk_Insert_Result(method="insert_many")
+        error: Exception | None = None
+        try:
+            collection = conn.get_database()[collection_name]
+            session = transaction.mongodb_session(conn)
+            documents_iterator = iter(documents)
+            index = 0
+            while chunk := list(islice(documents_iterator, chunk_size)):
+                chunk_result = Bulk_Chunk_Result(index=index, size=len(chunk))
+                try:
+                    result = collection.insert_many(chunk, ordered=False, session=session)
+                    inserted_ids = result.inserted_ids
+                except errors.BulkWriteError as e:
+                    # Con ordered=False se insertan los demás documentos del lote; insert_many asigna el _id antes de enviar
+                    failed = {write_error["index"] for write_error in e.details.get("writeErrors", [])}
+                    chunk_result.errors = [write_error.get("errmsg", "") for write_error in e.details.get("writeErrors", [])]
+                    inserted_ids = [document["_id"] for position, document in enumerate(chunk) if position not in failed]
+                chunk_result.inserted_count = len(inserted_ids)
+                returnValue.inserted_ids.extend(inserted_ids)
+                returnValue.inserted_count += len(inserted_ids)
+                returnValue.chunks.append(chunk_result)
+                index += 1
+        except errors.PyMongoError as e:
+            error = e
+            returnValue = MongoDB.__error("BulkInsert", e)
+        finally:
+            if started is not None:
+                instrumentation.emit(Database_Type.MONGODB.value, "bulk_insert", started, rows=None if error else returnValue.inserted_count, error=error)
+            return returnValue
+
+    @staticmethod
+    def bulk_update(conn : MongoClient, collection_name : str, documents : list[dict], key_fields : list[str] | None = None, replace : bool = False, upsert : bool = False, chunk_size : int = 1000, print_data : bool = False) -> Bulk_Write_Result | JSONResponse:
+        if print_data:
+            logger.debug("MongoDB.%s(%s) collection_name: %s documents: %s key_fields: %s replace: %s", "BulkUpsert" if upsert else "BulkUpdate", conn.get_database().name, collection_name, len(documents), key_fields, replace)
+        
+        started = instrumentation.start()
+        returnValue = Bulk_Write_Result(method="bulk_write")
+        error: Exception | None = None
+        key_fields = key_fields or ["_id"]
+        try:
+            collection = conn.get_database()[collection_name]
+            session = transaction.mongodb_session(conn)
+            documents_iterator = iter(documents)
+            index = 0
+            while chunk := list(islice(documents_iterator, chunk_size)):
+                requests = []
+                for document in chunk:
+                    query = {field: document[field] for field in key_fields}
+                    if replace:
+                        requests.append(ReplaceOne(query, document, upsert=upsert))
+                    else:
+                        # Los campos llave quedan en el documento creado por el upsert a partir del filtro
+                        requests.append(UpdateOne(query, {"$set": {field: value for field, value in document.items() if field not in query}}, upsert=upsert))
+                chunk_result = Bulk_Chunk_Result(index=index, size=len(chunk))
+                try:
+                    result = collection.bulk_write(requests, ordered=False, session=session).bulk_api_result
+                except errors.BulkWriteError as e:
+                    # Con ordered=False se aplican las demás operaciones del lote
+                    result = e.details
+                    chunk_result.errors = [write_error.get("errmsg", "") for write_error in result.get("writeErrors", [])]
+                chunk_result.matched_count = result.get("nMatched", 0)
+                chunk_result.modified_count = result.get("nModified", 0)
+                chunk_result.upserted_count = result.get("nUpserted", 0)
+                returnValue.matched_count += chunk_result.matched_count
+                returnValue.modified_count += chunk_result.modified_count
+                returnValue.upserted_count += chunk_result.upserted_count
+                returnValue.upserted_ids.extend(upserted["_id"] for upserted in sorted(result.get("upserted", []), key=lambda upserted: upserted["index"]))
+                returnValue.chunks.append(chunk_result)
+                index += 1
+        except (errors.PyMongoError, KeyError) as e:
+            error = e
+            returnValue = MongoDB.__error("BulkUpsert" if upsert else "BulkUpdate", e)
         finally:
+            if started is not None:
+                instrumentation.emit(Database_Type.MONGODB.value, "bulk_upsert" if upsert else "bulk_update", started, rows=None if error else returnValue.modified_count + returnValue.upserted_count, error=error)
             return returnValue
 
     @staticmethod
     def update(conn : MongoClient, collection_name : str, query : dict, update_values : dict, print_data : bool = False) -> bool | JSONResponse:
-        print(f"---------- MongoDB.Update({conn.get_database().name}) ----------")
         if print_data:
-            print(f"collection_name: {collection_name}")
-            print(f"query: {str(query)}")
-            print(f"update_values: {str(update_values)}")
+            logger.debug("MongoDB.Update(%s) collection_name: %s query: %s update_values: %s", conn.get_database().name, collection_name, query, update_values)
         
+        started = instrumentation.start()
+        returnValue: bool | JSONResponse = False
+        rows: int | None = None
+        error: Exception | None = None
         try:
             collection = conn.get_database()[collection_name]
-            result = collection.update_many(query, {'$set': update_values})
+            result = collection.update_many(query, {'$set': update_values}, session=transaction.mongodb_session(conn))
             returnValue = result.acknowledged
+            rows = result.modified_count if result.acknowledged else None
         except errors.PyMongoError as e:
-            print("Exception")
-            print(str(e))
-            print("--------------------------------------------")
-            returnValue = JSONResponse(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content=HTTP_Response(success=False, message=f"There was an error: {str(e)}", data={}))
+            error = e
+            returnValue = MongoDB.__error("Update", e)
         finally:
+            if started is not None:
+                instrumentation.emit(Database_Type.MONGODB.value, "update", started, rows=rows, error=error, statement={"collection": collection_name, "filter": query}, conn=conn)
             return returnValue
 
     @staticmethod
-    def delete(conn : MongoClient, collection_name : str, query : dict, print_data : bool = False) -> bool | Exception:
-        print(f"---------- MongoDB.Delete({conn.get_database().name}) ----------")
+    def delete(conn : MongoClient, collection_name : str, query : dict, print_data : bool = False) -> bool | JSONResponse:
         if print_data:
-            print(f"collection_name: {collection_name}")
-            print(f"query: {str(query)}")
+            logger.debug("MongoDB.Delete(%s) collection_name: %s query: %s", conn.get_database().name, collection_name, query)
         
+        started = instrumentation.start()
+        returnValue: bool | JSONResponse = False
+        rows: int | None = None
+        error: Exception | None = None
         try:
             collection = conn.get_database()[collection_name]
-            result = collection.delete_many(query)
-            returnValue = result.deleted_count > 0
+            result = collection.delete_many(query, session=transaction.mongodb_session(conn))
+            rows = result.deleted_count
+            returnValue = rows > 0
+        except errors.PyMongoError as e:
+            error = e
+            returnValue = MongoDB.__error("Delete", e)
+        finally:
+            if started is not None:
+                instrumentation.emit(Database_Type.MONGODB.value, "delete", started, rows=rows, error=error, statement={"collection": collection_name, "filter": query}, conn=conn)
+            return returnValue
+
+    @staticmethod
+    def ensure_indexes(conn : MongoClient, indexes : list[Index_Spec], print_data : bool = False) -> Ensure_Indexes_Result | JSONResponse:
+        if print_data:
+            logger.debug("MongoDB.EnsureIndexes(%s) indexes: %s", conn.get_database().name, [(index.collection_name, index.keys) for index in indexes])
+        
+        started = instrumentation.start()
+        returnValue = Ensure_Indexes_Result()
+        error: Exception | None = None
+        try:
+            database = conn.get_database()
+            collection_names = list(dict.fromkeys(index.collection_name for index in indexes))
+            for collection_name in collection_names:
+                collection = database[collection_name]
+                existing = {index["name"]: index for index in collection.list_indexes()}
+                by_keys = {tuple(index["key"].items()): index for index in existing.values()}
+                models: list[IndexModel] = []
+                for index in indexes:
+                    if index.collection_name != collection_name:
+                        continue
+                    options = _index_options(index)
+                    current = by_keys.get(tuple(index.keys))
+                    if current is None and index.name is not None and index.name in existing:
+                        returnValue.conflicts.append(f"{collection_name}.{index.name}: ya existe con las llaves {list(existing[index.name]['key'].items())}")
+                    elif current is None:
+                        models.append(IndexModel(index.keys, **options))
+                    elif any(current.get(option) != value for option, value in options.items() if option != "name") or any(option in current for option in _INDEX_OPTIONS.values() if option not in options):
+                        returnValue.conflicts.append(f"{collection_name}.{current['name']}: ya existe con otras opciones")
+                    else:
+                        returnValue.existing.append(f"{collection_name}.{current['name']}")
+                if models:
+                    # Una sola orden createIndexes por colección: el servidor construye los índices en una pasada
+                    returnValue.created.extend(f"{collection_name}.{name}" for name in collection.create_indexes(models, session=transaction.mongodb_session(conn)))
         except errors.PyMongoError as e:
-            print("Exception")
-            print(str(e))
-            print("--------------------------------------------")
-            returnValue = JSONResponse(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content=HTTP_Response(success=False, message=f"There was an error: {str(e)}", data={}))
+            error = e
+            returnValue = MongoDB.__error("EnsureIndexes", e)
         finally:
+            if started is not None:
+                instrumentation.emit(Database_Type.MONGODB.value, "ensure_indexes", started, rows=None if error else len(returnValue.created), error=error)
             return returnValue
+
+    @staticmethod
+    def __error(operation : str, e : Exception) -> JSONResponse:
+        logger.error("MongoDB.%s: %s", operation, str(e))
+        return error_response(f"There was an error: {str(e)}")
@@ -0,0 +1,69 @@
+import threading
+
+from pymongo import monitoring
+
+class _MongoDB_Pool_Listener(monitoring.ConnectionPoolListener):
+    """
+    Listener de pymongo para llevar las estadísticas del pool de un MongoClient
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.size = 0
+        self.in_use = 0
+        self.waiting = 0
+        self.checkouts = 0
+        self.timeouts = 0
+        self.created = 0
+        self.discarded = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    def pool_created(self, event) -> None:
+        pass
+
+    def pool_ready(self, event) -> None:
+        pass
+
+    def pool_cleared(self, event) -> None:
+        pass
+
+    def pool_closed(self, event) -> None:
+        pass
+
+    def connection_created(self, event) -> None:
+        with self._lock:
+            self.size += 1
+            self.created += 1
+
+    def connection_ready(self, event) -> None:
+        pass
+
+    def connection_closed(self, event) -> None:
+        with self._lock:
+            self.size -= 1
+            self.discarded += 1
+
+    def connection_check_out_started(self, event) -> None:
+        with self._lock:
+            self.waiting += 1
+
+    def connection_check_out_failed(self, event) -> None:
+        with self._lock:
+            self.waiting -= 1
+            if event.reason == monitoring.ConnectionCheckOutFailedReason.TIMEOUT:
+                self.timeouts += 1
+
+    def connection_checked_out(self, event) -> None:
+        # `duration` está disponible a partir de pymongo 4.7
+        waited = getattr(event, "duration", None) or 0.0
+        with self._lock:
+            self.waiting -= 1
+            self.in_use += 1
+            self.checkouts += 1
+            self.wait_time_total += waited
+            self.wait_time_max = max(self.wait_time_max, waited)
+
+    def connection_checked_in(self, event) -> None:
+        with self._lock:
+            self.in_use -= 1
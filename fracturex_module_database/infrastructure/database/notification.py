@@ -0,0 +1,319 @@
+import asyncio
+import inspect
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor
+from functools import partial
+from typing import Any, Awaitable, Callable, Iterable
+
+import psycopg2
+from psycopg2 import sql
+from psycopg2.extensions import connection
+from psycopg2.extras import execute_values
+
+from fracturex_module_database.infrastructure.database.notification_payload import (
+    BATCH_OVERHEAD,
+    MAX_PAYLOAD_BYTES,
+    channel_name,
+    decode_payload,
+    pack_payloads,
+    serialize_payload
+)
+from fracturex_module_database.infrastructure.instrumentation import logger
+from fracturex_module_database.model.notification import Notification
+
+class Notification_Publisher:
+    """
+    Agrupa las notificaciones enviadas en una ventana corta y las envía desde una conexión propia
+
+    Las notificaciones de un mismo canal conservan su orden. Si hay más de `max_pending` notificaciones
+    pendientes, `publish` espera a que se envíen (contrapresión).
+    """
+
+    def __init__(self, get_connection : Callable[[], connection], release_connection : Callable[[connection, bool], None], window : float = 0.005, max_batch : int = 100, max_pending : int = 10000) -> None:
+        self.window = window
+        self.max_batch = max_batch
+        self.max_pending = max_pending
+        self._get_connection = get_connection
+        self._release_connection = release_connection
+        self._cond = threading.Condition()
+        # Los envíos se serializan para conservar el orden de cada canal
+        self._send_lock = threading.Lock()
+        self._pending: deque[tuple[str, str]] = deque()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+        # Estadísticas
+        self.published = 0
+        self.sent = 0
+        self.errors = 0
+
+    def publish(self, channel : str, payload : Any) -> None:
+        # Se serializa de inmediato para enviar el estado del payload al momento de publicar. Siempre se
+        # envía dentro de un sobre ("pack_payloads"), por lo que no necesita el escape de "encode_payload"
+        encoded = serialize_payload(payload)
+        if len(encoded.encode()) + BATCH_OVERHEAD > MAX_PAYLOAD_BYTES:
+            raise ValueError(f"El payload de la notificación supera los {MAX_PAYLOAD_BYTES} bytes que admite PostgreSQL")
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("El publicador de notificaciones está cerrado")
+            while len(self._pending) >= self.max_pending:
+                self._cond.wait()
+            self._pending.append((channel_name(channel), encoded))
+            self.published += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="fracturex_notification_publisher", daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def _take(self) -> list[tuple[str, str]]:
+        with self._cond:
+            pending = list(self._pending)
+            self._pending.clear()
+            self._cond.notify_all()
+        return pending
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if self._closed and not self._pending:
+                    return
+            # Esperar la ventana para agrupar las notificaciones que lleguen mientras tanto
+            time.sleep(self.window)
+            self.flush()
+
+    def _send(self, pending : list[tuple[str, str]]) -> int:
+        if not pending:
+            return 0
+        channels: dict[str, list[str]] = {}
+        for channel, payload in pending:
+            channels.setdefault(channel, []).append(payload)
+        values = [(channel, envelope) for channel, payloads in channels.items() for envelope in pack_payloads(payloads, max_batch=self.max_batch)]
+        # Un reintento con otra conexión si la primera falla (por ejemplo, si el servidor se reinició)
+        for attempt in range(2):
+            try:
+                conn = self._get_connection()
+            except Exception as e:
+                logger.error("Notification_Publisher: %s", str(e))
+                break
+            discard = False
+            try:
+                with conn.cursor() as mycursor:
+                    execute_values(mycursor, "SELECT pg_notify(channel, payload) FROM (VALUES %s) AS notification (channel, payload)", values, page_size=len(values))
+                conn.commit()
+                with self._cond:
+                    self.sent += len(pending)
+                return len(pending)
+            except psycopg2.Error as e:
+                logger.error("Notification_Publisher: %s", getattr(e, "pgerror", None) or str(e))
+                discard = bool(conn.closed) or isinstance(e, psycopg2.OperationalError)
+                if not discard:
+                    conn.rollback()
+                    break
+            finally:
+                self._release_connection(conn, discard)
+        with self._cond:
+            self.errors += len(pending)
+        return 0
+
+    def flush(self) -> int:
+        """
+        Función para enviar de inmediato las notificaciones pendientes; retorna cuántas se enviaron
+        """
+        with self._send_lock:
+            return self._send(self._take())
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        self.flush()
+
+class Notification_Listener:
+    """
+    Escucha (LISTEN) canales de PostgreSQL con una conexión dedicada y entrega cada notificación decodificada a `callback`
+
+    `callback` puede ser una función asíncrona (se espera en el event loop) o síncrona (se ejecuta en
+    `executor`). Si se acumulan `max_queue` notificaciones sin procesar se deja de leer la conexión hasta
+    que la cola baje a la mitad, y PostgreSQL las retiene en su cola. Si la conexión se pierde se reconecta
+    con espera exponencial; las notificaciones enviadas mientras tanto se pierden.
+    """
+
+    def __init__(self, dsn : str, channels : Iterable[str], callback : Callable[[Notification], Awaitable[Any] | Any], max_queue : int = 1000, concurrency : int = 1, executor : Executor | None = None, reconnect_delay : float = 0.5, max_reconnect_delay : float = 30.0) -> None:
+        self.dsn = dsn
+        # Los canales se guardan como los interpreta PostgreSQL (ver "channel_name")
+        self.channels: set[str] = {channel_name(channel) for channel in channels}
+        self.callback = callback
+        self.max_queue = max_queue
+        self.concurrency = concurrency
+        self.executor = executor
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self._is_async = inspect.iscoroutinefunction(callback)
+        self._conn: connection | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._queue: asyncio.Queue[Notification] | None = None
+        self._workers: list[asyncio.Task] = []
+        self._reconnect_task: asyncio.Task | None = None
+        self._reading = False
+        self._closed = False
+        # Estadísticas
+        self.received = 0
+        self.dispatched = 0
+        self.errors = 0
+        self.reconnects = 0
+        self.paused = 0
+
+    async def start(self) -> "Notification_Listener":
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        await self._connect()
+        self._workers = [asyncio.create_task(self._dispatch()) for _ in range(self.concurrency)]
+        return self
+
+    async def __aenter__(self) -> "Notification_Listener":
+        return await self.start()
+
+    async def __aexit__(self, *exc_info : Any) -> None:
+        await self.close()
+
+    def _open(self) -> connection:
+        # Keepalives TCP para detectar conexiones caídas aunque no lleguen notificaciones
+        conn = psycopg2.connect(dsn=self.dsn, keepalives=1, keepalives_idle=30, keepalives_interval=10, keepalives_count=3)
+        conn.autocommit = True
+        conn.notifies = deque()
+        with conn.cursor() as mycursor:
+            for channel in self.channels:
+                mycursor.execute(sql.SQL("LISTEN {}").format(sql.Identifier(channel)))
+        return conn
+
+    async def _connect(self) -> None:
+        self._conn = await self._loop.run_in_executor(None, self._open)
+        self._resume()
+
+    def _resume(self) -> None:
+        if not self._reading and self._conn is not None and not self._closed:
+            self._loop.add_reader(self._conn.fileno(), self._on_readable)
+            self._reading = True
+            # Pueden quedar notificaciones ya leídas del socket
+            self._drain()
+
+    def _pause(self) -> None:
+        if self._reading:
+            self._loop.remove_reader(self._conn.fileno())
+            self._reading = False
+            self.paused += 1
+
+    def _on_readable(self) -> None:
+        try:
+            self._conn.poll()
+        except psycopg2.Error as e:
+            logger.error("Notification_Listener: %s", str(e))
+            self._lost()
+            return
+        self._drain()
+
+    def _drain(self) -> None:
+        if self._conn is None:
+            return
+        notifies = self._conn.notifies
+        while notifies:
+            notify = notifies.popleft()
+            for payload in decode_payload(notify.payload):
+                self._queue.put_nowait(Notification(channel=notify.channel, payload=payload, pid=notify.pid))
+                self.received += 1
+        if self._queue.qsize() >= self.max_queue:
+            self._pause()
+
+    def _lost(self) -> None:
+        if self._reading:
+            try:
+                self._loop.remove_reader(self._conn.fileno())
+            except (ValueError, OSError, psycopg2.Error):
+                pass
+            self._reading = False
+        try:
+            self._conn.close()
+        except psycopg2.Error:
+            pass
+        self._conn = None
+        if self._reconnect_task is None and not self._closed:
+            self._reconnect_task = asyncio.ensure_future(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        delay = self.reconnect_delay
+        try:
+            while not self._closed:
+                await asyncio.sleep(delay)
+                try:
+                    await self._connect()
+                    self.reconnects += 1
+                    return
+                except Exception as e:
+                    # Cualquier error (no solo de psycopg2, por ejemplo OSError) debe reintentar: si la tarea
+                    # terminara el listener quedaría desconectado para siempre
+                    logger.error("Notification_Listener: no se pudo reconectar: %s", str(e))
+                    delay = min(delay * 2, self.max_reconnect_delay)
+        finally:
+            self._reconnect_task = None
+
+    async def _dispatch(self) -> None:
+        while True:
+            notification = await self._queue.get()
+            try:
+                if self._is_async:
+                    await self.callback(notification)
+                else:
+                    await self._loop.run_in_executor(self.executor, partial(self.callback, notification))
+                self.dispatched += 1
+            except Exception:
+                self.errors += 1
+                logger.exception("Error en el callback de Notification_Listener")
+            finally:
+                self._queue.task_done()
+            if not self._reading and self._conn is not None and self._queue.qsize() <= self.max_queue // 2:
+                self._resume()
+
+    async def listen(self, channel : str) -> None:
+        channel = channel_name(channel)
+        self.channels.add(channel)
+        if self._conn is not None:
+            await self._loop.run_in_executor(None, self._execute, sql.SQL("LISTEN {}").format(sql.Identifier(channel)))
+
+    async def unlisten(self, channel : str) -> None:
+        channel = channel_name(channel)
+        self.channels.discard(channel)
+        if self._conn is not None:
+            await self._loop.run_in_executor(None, self._execute, sql.SQL("UNLISTEN {}").format(sql.Identifier(channel)))
+
+    def _execute(self, query : sql.Composable) -> None:
+        with self._conn.cursor() as mycursor:
+            mycursor.execute(query)
+        # La consulta pudo leer notificaciones del socket
+        self._loop.call_soon_threadsafe(self._drain)
+
+    async def join(self) -> None:
+        """
+        Función para esperar a que se procesen las notificaciones recibidas hasta el momento
+        """
+        await self._queue.join()
+
+    async def close(self) -> None:
+        self._closed = True
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+        if self._conn is not None:
+            if self._reading:
+                self._loop.remove_reader(self._conn.fileno())
+                self._reading = False
+            self._conn.close()
+            self._conn = None
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
@@ -0,0 +1,83 @@
+"""
+Formato de los payloads de las notificaciones de PostgreSQL (NOTIFY/LISTEN)
+
+Sin dependencias de asyncio ni de psycopg2, para que "PostgreSQL.notify" lo use sin cargar el listener.
+"""
+import json
+from typing import Any
+
+# Llave del sobre con el que se envían varias notificaciones agrupadas en una sola
+BATCH_KEY = "fx_batch"
+# PostgreSQL rechaza payloads de 8000 bytes o más
+MAX_PAYLOAD_BYTES = 7999
+# Tamaño del sobre vacío: '{"fx_batch":[' más "]}"
+BATCH_OVERHEAD = len(BATCH_KEY) + 7
+# PostgreSQL solo pasa a minúsculas las letras ASCII de los identificadores sin comillas
+_ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+def channel_name(channel : str) -> str:
+    """
+    Función para obtener el nombre de un canal como lo interpreta PostgreSQL en "NOTIFY canal"/"LISTEN canal"
+
+    Los nombres sin comillas se pasan a minúsculas; los nombres entre comillas dobles conservan
+    mayúsculas y minúsculas (sin las comillas). Así "MyChannel" y "mychannel" son el mismo canal.
+    """
+    if len(channel) >= 2 and channel.startswith('"') and channel.endswith('"'):
+        return channel[1:-1].replace('""', '"')
+    return channel.translate(_ASCII_LOWER)
+
+def encode_payload(payload : Any) -> str:
+    """
+    Función para serializar un payload como JSON compacto
+
+    Un payload con la forma de un sobre ({"fx_batch": [...]}) se envía dentro de un sobre de un elemento,
+    para que "decode_payload" no lo confunda con varias notificaciones agrupadas.
+    """
+    if isinstance(payload, dict) and len(payload) == 1 and BATCH_KEY in payload:
+        payload = {BATCH_KEY: [payload]}
+    return serialize_payload(payload)
+
+def serialize_payload(payload : Any) -> str:
+    """
+    Función para serializar un payload como JSON compacto, sin el escape de "encode_payload" (para los
+    payloads que siempre se envían dentro de un sobre)
+    """
+    return json.dumps(payload, default=str, ensure_ascii=False, separators=(",", ":"))
+
+def decode_payload(payload : str) -> list[Any]:
+    """
+    Función para decodificar el payload de una notificación, desarmando los sobres de notificaciones agrupadas
+
+    Los payloads que no son JSON se retornan como texto. Todo {"fx_batch": [...]} recibido es un sobre:
+    "encode_payload" envía los payloads con esa forma dentro de otro sobre y "pack_payloads" arma siempre
+    un sobre, aunque tenga una sola notificación.
+    """
+    try:
+        value = json.loads(payload)
+    except ValueError:
+        return [payload]
+    if isinstance(value, dict) and len(value) == 1 and isinstance(value.get(BATCH_KEY), list):
+        return value[BATCH_KEY]
+    return [value]
+
+def pack_payloads(payloads : list[str], max_batch : int = 100, max_bytes : int = MAX_PAYLOAD_BYTES) -> list[str]:
+    """
+    Función para agrupar payloads ya serializados (sin el escape de "encode_payload") en sobres
+    {"fx_batch": [...]} que respeten el límite de PostgreSQL
+    """
+    returnValue: list[str] = []
+    prefix = '{"' + BATCH_KEY + '":['
+    overhead = BATCH_OVERHEAD
+    current: list[str] = []
+    size = overhead
+    for payload in payloads:
+        payload_size = len(payload.encode())
+        # Cada elemento adicional agrega una coma
+        if current and (len(current) >= max_batch or size + payload_size + 1 > max_bytes):
+            returnValue.append(prefix + ",".join(current) + "]}")
+            current, size = [], overhead
+        current.append(payload)
+        size += payload_size + (1 if len(current) > 1 else 0)
+    if current:
+        returnValue.append(prefix + ",".join(current) + "]}")
+    return returnValue
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import sys
+import threading
+from typing import TYPE_CHECKING
+
+from fracturex_module_database.model.database_config import Database_Config
+from fracturex_module_database.model.database_type import Database_Type
+from fracturex_module_database.model.pool_stats import Pool_Stats
+
+if TYPE_CHECKING:
+    from psycopg2.extensions import connection
+    from pymongo import MongoClient
+    from fracturex_module_database.infrastructure.database.mongodb_pool import _MongoDB_Pool_Listener
+    from fracturex_module_database.infrastructure.database.postgresql_pool import PostgreSQL_Pool
+
+class Pool_Timeout_Error(Exception):
+    """
+    Error lanzado cuando no se logra obtener una conexión del pool dentro del tiempo de espera
+    """
+
+def _is_mongodb_client(conn : object) -> bool:
+    # Si pymongo no se ha importado, la conexión no puede ser un MongoClient
+    pymongo = sys.modules.get("pymongo")
+    return pymongo is not None and isinstance(conn, pymongo.MongoClient)
+
+def __getattr__(name : str) -> type:
+    # Compatibilidad con "from ...pool import PostgreSQL_Pool" sin importar psycopg2 al cargar este módulo
+    if name == "PostgreSQL_Pool":
+        from fracturex_module_database.infrastructure.database.postgresql_pool import PostgreSQL_Pool
+        return PostgreSQL_Pool
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+class Connection_Registry:
+    """
+    Registro de conexiones del proceso, indexado por la llave de configuración de la base de datos
+
+    Mantiene un `PostgreSQL_Pool` por llave PostgreSQL y un único `MongoClient` compartido
+    (que ya maneja su propio pool interno) por llave MongoDB.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._postgresql: dict[str, PostgreSQL_Pool] = {}
+        self._mongodb: dict[str, tuple[Database_Config, MongoClient, _MongoDB_Pool_Listener]] = {}
+
+    def get_postgresql_pool(self, database_config_key : str, database_config : Database_Config) -> PostgreSQL_Pool:
+        pool = self._postgresql.get(database_config_key)
+        if pool is not None:
+            return pool
+        with self._lock:
+            pool = self._postgresql.get(database_config_key)
+            if pool is None:
+                # psycopg2 se importa solo cuando se usa la primera llave PostgreSQL
+                from fracturex_module_database.infrastructure.database.postgresql_pool import PostgreSQL_Pool
+                pool = PostgreSQL_Pool(
+                    database_config_key=database_config_key,
+                    dsn=database_config.url,
+                    min_size=database_config.pool_min_size,
+                    max_size=database_config.pool_max_size,
+                    max_idle=database_config.pool_max_idle,
+                    timeout=database_config.pool_timeout,
+                    health_check_interval=database_config.pool_health_check_interval,
+                    statement_cache_size=database_config.statement_cache_size,
+                    statement_cache_prepare_threshold=database_config.statement_cache_prepare_threshold
+                )
+                self._postgresql[database_config_key] = pool
+            return pool
+
+    def get_mongodb_client(self, database_config_key : str, database_config : Database_Config) -> MongoClient:
+        entry = self._mongodb.get(database_config_key)
+        if entry is not None:
+            return entry[1]
+        with self._lock:
+            entry = self._mongodb.get(database_config_key)
+            if entry is None:
+                # pymongo se importa solo cuando se usa la primera llave MongoDB
+                from pymongo import MongoClient
+                from fracturex_module_database.infrastructure.database.mongodb_pool import _MongoDB_Pool_Listener
+                listener = _MongoDB_Pool_Listener()
+                client = MongoClient(
+                    host=database_config.url,
+                    minPoolSize=database_config.pool_min_size,
+                    maxPoolSize=database_config.pool_max_size,
+                    maxIdleTimeMS=int(database_config.pool_max_idle * 1000),
+                    waitQueueTimeoutMS=int(database_config.pool_timeout * 1000),
+                    event_listeners=[listener]
+                )
+                entry = (database_config, client, listener)
+                self._mongodb[database_config_key] = entry
+            return entry[1]
+
+    def acquire(self, database_config_key : str, database_config : Database_Config) -> connection | MongoClient:
+        """
+        Función para obtener una conexión del pool correspondiente al tipo de base de datos
+        """
+        if database_config.type == Database_Type.POSTGRESQL:
+            return self.get_postgresql_pool(database_config_key, database_config).getconn()
+        return self.get_mongodb_client(database_config_key, database_config)
+
+    def release(self, conn : connection | MongoClient, discard : bool = False) -> None:
+        """
+        Función para devolver una conexión a su pool. Los MongoClient compartidos no requieren devolución
+        """
+        if _is_mongodb_client(conn):
+            return
+        for pool in list(self._postgresql.values()):
+            if pool.owns(conn):
+                pool.putconn(conn, discard=discard)
+                return
+        # La conexión no proviene del registro, se cierra
+        conn.close()
+
+    def get_database_config_key(self, conn : connection | MongoClient) -> str | None:
+        """
+        Función para retornar la llave de configuración de la que proviene una conexión del registro
+        """
+        if _is_mongodb_client(conn):
+            for key, (_, client, _) in list(self._mongodb.items()):
+                if client is conn:
+                    return key
+            return None
+        for key, pool in list(self._postgresql.items()):
+            if pool.owns(conn):
+                return key
+        return None
+
+    def stats(self) -> dict[str, Pool_Stats]:
+        returnValue: dict[str, Pool_Stats] = {}
+        for key, pool in list(self._postgresql.items()):
+            returnValue[key] = pool.stats()
+        for key, (database_config, _, listener) in list(self._mongodb.items()):
+            with listener._lock:
+                returnValue[key] = Pool_Stats(
+                    database_config_key=key,
+                    type=Database_Type.MONGODB,
+                    min_size=database_config.pool_min_size,
+                    max_size=database_config.pool_max_size,
+                    size=listener.size,
+                    in_use=listener.in_use,
+                    idle=max(listener.size - listener.in_use, 0),
+                    waiting=listener.waiting,
+                    checkouts=listener.checkouts,
+                    timeouts=listener.timeouts,
+                    created=listener.created,
+                    discarded=listener.discarded,
+                    wait_time_total=listener.wait_time_total,
+                    wait_time_max=listener.wait_time_max
+                )
+        return returnValue
+
+    def close(self) -> None:
+        with self._lock:
+            pools = list(self._postgresql.values())
+            clients = [client for _, client, _ in self._mongodb.values()]
+            self._postgresql.clear()
+            self._mongodb.clear()
+        for pool in pools:
+            pool.close()
+        for client in clients:
+            client.close()
+
+# Registro de conexiones compartido por todo el proceso
+registry: Connection_Registry = Connection_Registry()
@@ -1,132 +1,527 @@
+from __future__ import annotations
+
 import re
-from fastapi.responses import JSONResponse
+import json
+from itertools import islice
 from psycopg2.extensions import (
     connection,
-    cursor
+    cursor,
+    encodings
 )
-from psycopg2.extras import NamedTupleCursor
-from psycopg2 import errors
-from typing import Any
-from fastapi import status
+from psycopg2.extras import NamedTupleCursor, execute_values
+from psycopg2 import errors, sql
+from typing import TYPE_CHECKING, Any, Iterator
+from uuid import uuid4
 
-from fracturex_module_database.model.dto.http_response import HTTP_Response
+from fracturex_module_database.infrastructure import instrumentation
+from fracturex_module_database.infrastructure.database import (
+    statement_cache,
+    transaction
+)
+from fracturex_module_database.infrastructure.database.notification_payload import (
+    channel_name,
+    encode_payload
+)
+from fracturex_module_database.infrastructure.instrumentation import logger
+from fracturex_module_database.infrastructure.pagination import encode_token
+from fracturex_module_database.infrastructure.result_shape import (
+    column_keys,
+    shape_rows
+)
+from fracturex_module_database.model.bulk_result import (
+    Bulk_Chunk_Result,
+    Bulk_Insert_Result,
+    Bulk_Write_Result
+)
+from fracturex_module_database.model.database_type import Database_Type
+from fracturex_module_database.model.dto.http_response import error_response
+from fracturex_module_database.model.export_result import (
+    Export_Format,
+    Export_Result
+)
 from fracturex_module_database.model.idatabase import IDatabase
+from fracturex_module_database.model.page import Page
+from fracturex_module_database.model.result_format import (
+    Result_Format,
+    Tabular_Result
+)
+
+if TYPE_CHECKING:
+    from fastapi.responses import JSONResponse
+
+# Caracteres que deben escaparse en el formato de texto de COPY
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+class _Copy_Reader:
+    """
+    Objeto tipo archivo que genera el formato de texto de COPY a medida que psycopg2 lo lee,
+    para no materializar todas las filas en memoria
+    """
+
+    def __init__(self, rows : list[tuple], rows_per_read : int = 1000) -> None:
+        self._rows = iter(rows)
+        self._rows_per_read = rows_per_read
+        self._buffer = ""
+
+    @staticmethod
+    def _format_value(value : Any) -> str:
+        if value is None:
+            return "\\N"
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return "\\\\x" + bytes(value).hex()
+        if isinstance(value, dict):
+            value = json.dumps(value)
+        elif isinstance(value, (list, tuple)):
+            value = _Copy_Reader._array_literal(value)
+        return (value if isinstance(value, str) else str(value)).translate(_COPY_ESCAPES)
+
+    @staticmethod
+    def _array_literal(value : list | tuple) -> str:
+        # Literal de arreglo "{...}" (las listas anidadas son arreglos multidimensionales); cada elemento va
+        # entre comillas para que las comas, llaves, comillas y espacios no se interpreten
+        elements: list[str] = []
+        for element in value:
+            if element is None:
+                elements.append("NULL")
+            elif isinstance(element, (list, tuple)):
+                elements.append(_Copy_Reader._array_literal(element))
+            else:
+                if isinstance(element, (bytes, bytearray, memoryview)):
+                    element = "\\x" + bytes(element).hex()
+                elif isinstance(element, dict):
+                    element = json.dumps(element)
+                elif not isinstance(element, str):
+                    element = str(element)
+                elements.append('"' + element.replace("\\", "\\\\").replace('"', '\\"') + '"')
+        return "{" + ",".join(elements) + "}"
+
+    def read(self, size : int = -1) -> str:
+        while size < 0 or len(self._buffer) < size:
+            rows = list(islice(self._rows, self._rows_per_read))
+            if not rows:
+                break
+            self._buffer += "".join("\t".join(map(self._format_value, row)) + "\n" for row in rows)
+        if size < 0 or size >= len(self._buffer):
+            returnValue, self._buffer = self._buffer, ""
+        else:
+            returnValue, self._buffer = self._buffer[:size], self._buffer[size:]
+        return returnValue
+
+    readline = read
+
+def _tell(file : Any) -> int | None:
+    # Posición actual del archivo, o None si no la informa (sockets, pipes, ...)
+    try:
+        return file.tell()
+    except (AttributeError, OSError, ValueError):
+        return None
 
 class PostgreSQL(IDatabase):
 
     @staticmethod
-    def select(conn : connection, query : str, vars : tuple | None = None, print_data : bool = False) -> list[dict] | JSONResponse:
-        print(f"---------- PostgreSQL.Select({conn.info.dbname}) ----------")
+    def select(conn : connection, query : str, vars : tuple | None = None, print_data : bool = False, result_format : Result_Format = Result_Format.RECORDS, columns : list[str] | None = None, keyset : list[str] | None = None, descending : bool = False, page_size : int | None = None, after : tuple | None = None, page_fingerprint : str | None = None) -> list[dict] | Tabular_Result | dict[str, Any] | Page | JSONResponse:
         if print_data:
-            print(f"query: {query}")
-            print(f"vars: {str(vars)}")
+            logger.debug("PostgreSQL.Select(%s) query: %s vars: %s result_format: %s columns: %s keyset: %s page_size: %s after: %s", conn.info.dbname, query, vars, result_format.value, columns, keyset, page_size, after)
         
-        returnValue: list[dict] = []
+        started = instrumentation.start()
+        returnValue: list[dict] | Tabular_Result | dict[str, Any] | Page = []
+        mycursor: cursor = None
+        rows: list[tuple] | None = None
+        error: Exception | None = None
         try:
-            mycursor: cursor = conn.cursor(cursor_factory=NamedTupleCursor)
+            if columns or page_size:
+                query, vars = PostgreSQL.__page_query(conn, query, vars, columns, keyset, descending, page_size, after)
+            # Cursor simple: las filas llegan como tuplas y se les da forma una sola vez según "result_format"
+            mycursor = conn.cursor()
+            statement_cache.execute(conn, mycursor, query, vars or None)
+            rows = mycursor.fetchall()
+            names = tuple(column.name for column in mycursor.description)
+            if page_size:
+                # Se pide un registro de más para saber si hay una página siguiente
+                next_page_token = None
+                if len(rows) > page_size:
+                    rows = rows[:page_size]
+                    positions = [names.index(key) for key in keyset]
+                    next_page_token = encode_token(page_fingerprint, tuple(rows[-1][position] for position in positions))
+                returnValue = Page(rows=shape_rows(column_keys(names), rows, result_format), next_page_token=next_page_token)
+            else:
+                returnValue = shape_rows(column_keys(names), rows, result_format)
+        except Exception as e:
+            error = e
+            returnValue = PostgreSQL.__error("Select", e)
+        finally:
+            if started is not None:
+                PostgreSQL.__emit("select", started, mycursor, None if error else len(rows), error, query, vars, conn)
+            if mycursor: mycursor.close()
+            return returnValue
+
+    @staticmethod
+    def __page_query(conn : connection, query : str, vars : tuple | None, columns : list[str] | None, keyset : list[str] | None, descending : bool, page_size : int | None, after : tuple | None) -> tuple[str, tuple | None]:
+        # La consulta original se usa como subconsulta; PostgreSQL la aplana, por lo que el filtro y el orden por la llave pueden usar sus índices
+        query = query.strip().rstrip(";")
+        selected = list(columns) if columns else None
+        if page_size and selected is not None:
+            # Las columnas de la llave se necesitan para construir el token de la página siguiente
+            selected += [key for key in keyset if key not in selected]
+        statement = sql.SQL("SELECT {} FROM ({}) AS fracturex_select").format(
+            sql.SQL(", ").join(map(sql.Identifier, selected)) if selected else sql.SQL("*"),
+            sql.SQL(query if vars or not after else query.replace("%", "%%"))
+        )
+        if page_size:
+            keys = sql.SQL(", ").join(map(sql.Identifier, keyset))
+            direction = sql.SQL(" DESC" if descending else "")
+            if after:
+                statement += sql.SQL(" WHERE ({}) {} ({})").format(keys, sql.SQL("<" if descending else ">"), sql.SQL(", ").join(sql.Placeholder() * len(keyset)))
+                vars = tuple(vars or ()) + tuple(after)
+            statement += sql.SQL(" ORDER BY {} LIMIT {}").format(
+                sql.SQL(", ").join(sql.Composed([sql.Identifier(key), direction]) for key in keyset),
+                sql.Literal(page_size + 1)
+            )
+        return statement.as_string(conn), vars
+    
+    @staticmethod
+    def select_stream(conn : connection, query : str, vars : tuple | None = None, itersize : int = 2000, print_data : bool = False) -> Iterator[dict] | JSONResponse:
+        if print_data:
+            logger.debug("PostgreSQL.SelectStream(%s) query: %s vars: %s itersize: %s", conn.info.dbname, query, vars, itersize)
+        
+        started = instrumentation.start()
+        mycursor: cursor = None
+        try:
+            # Cursor con nombre (del lado del servidor): las filas se traen de a "itersize" por viaje
+            mycursor = conn.cursor(name=f"fracturex_stream_{uuid4().hex}", cursor_factory=NamedTupleCursor, withhold=conn.autocommit)
+            mycursor.itersize = itersize
             if vars:
                 mycursor.execute(query=query, vars=vars)
             else:
                 mycursor.execute(query=query)
-            for row in mycursor.fetchall():
-                returnValue.append(row._asdict())
         except Exception as e:
-            print("Exception")
-            print(str(e.pgerror))
-            print("--------------------------------------------")
-            returnValue = JSONResponse(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content=HTTP_Response(success=False, message=f"There was an error: {str(e)}", data={}))
-        finally:
+            if started is not None:
+                PostgreSQL.__emit("select_stream", started, mycursor, None, e)
             if mycursor: mycursor.close()
-            return returnValue
+            return PostgreSQL.__error("SelectStream", e)
+        return PostgreSQL.__stream_rows(mycursor, started)
+
+    @staticmethod
+    def __stream_rows(mycursor : cursor, started : float | None) -> Iterator[dict]:
+        # El cursor se cierra al agotarse, al fallar o cuando el consumidor cierra el generador
+        rows = 0
+        error: Exception | None = None
+        try:
+            for row in mycursor:
+                rows += 1
+                yield row._asdict()
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            if started is not None:
+                PostgreSQL.__emit("select_stream", started, mycursor, rows, error)
+            mycursor.close()
     
     @staticmethod
     def insert(conn : connection, query : str, vars : tuple, print_data : bool = False) -> list[dict] | JSONResponse:
-        print(f"---------- PostgreSQL.Insert({conn.info.dbname}) ----------")
-        returnValue: list[dict] = []
         if print_data:
-            print(f"query: {query}")
-            print(f"vars: {str(vars)}")
+            logger.debug("PostgreSQL.Insert(%s) query: %s vars: %s", conn.info.dbname, query, vars)
         
+        started = instrumentation.start()
+        returnValue: list[dict] = []
+        mycursor: cursor = None
+        error: Exception | None = None
         try:
-            mycursor: cursor = conn.cursor(cursor_factory=NamedTupleCursor)
-            mycursor.execute(query=query, vars=vars)
+            mycursor = conn.cursor(cursor_factory=NamedTupleCursor)
+            statement_cache.execute(conn, mycursor, query, vars)
             for row in mycursor.fetchall():
                 returnValue.append(row._asdict())
         except Exception as e:
-            print("Exception")
-            print(str(e.pgerror))
-            print("--------------------------------------------")
-            returnValue = JSONResponse(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content=HTTP_Response(success=False, message=f"There was an error: {str(e)}", data={}))
+            error = e
+            returnValue = PostgreSQL.__error("Insert", e)
         finally:
+            if started is not None:
+                PostgreSQL.__emit("insert", started, mycursor, None if error else mycursor.rowcount, error)
             if mycursor: mycursor.close()
             return returnValue
 
     @staticmethod
-    def update(conn : connection, query : str, vars : tuple | None = None, print_data : bool = False) -> bool | JSONResponse:
-        print(f"---------- PostgreSQL.Update({conn.info.dbname}) ----------")
+    def bulk_insert(conn : connection, table_name : str, columns : list[str], rows : list[tuple], returning : list[str] | None = None, page_size : int = 1000, copy_threshold : int = 10000, print_data : bool = False) -> Bulk_Insert_Result | JSONResponse:
         if print_data:
-            print(f"query: {query}")
-            print(f"vars: {str(vars)}")
+            logger.debug("PostgreSQL.BulkInsert(%s) table_name: %s columns: %s rows: %s", conn.info.dbname, table_name, columns, len(rows))
         
+        started = instrumentation.start()
         returnValue: Any
+        mycursor: cursor = None
+        error: Exception | None = None
+        table = sql.Identifier(*table_name.split("."))
+        column_list = sql.SQL(", ").join(map(sql.Identifier, columns))
         try:
-            mycursor: cursor = conn.cursor(cursor_factory=NamedTupleCursor)
-            if (vars is not None):
-                mycursor.execute(query=query, vars=vars)
+            mycursor = conn.cursor()
+            if not returning and len(rows) >= copy_threshold:
+                # COPY FROM STDIN: un solo viaje para todo el lote, sin posibilidad de RETURNING
+                mycursor.copy_expert(sql.SQL("COPY {} ({}) FROM STDIN").format(table, column_list), _Copy_Reader(rows))
+                returnValue = Bulk_Insert_Result(
+                    method="copy",
+                    inserted_count=mycursor.rowcount,
+                    chunks=[Bulk_Chunk_Result(index=0, size=len(rows), inserted_count=mycursor.rowcount)]
+                )
             else:
-                mycursor.execute(query=query)
+                # INSERT multi-fila con execute_values, un viaje por cada página
+                query = sql.SQL("INSERT INTO {} ({}) VALUES %s").format(table, column_list)
+                if returning:
+                    query = query + sql.SQL(" RETURNING {}").format(sql.SQL(", ").join(map(sql.Identifier, returning)))
+                returnValue = Bulk_Insert_Result(method="execute_values")
+                for index, start in enumerate(range(0, len(rows), page_size)):
+                    page = rows[start:start + page_size]
+                    result = execute_values(mycursor, query, page, page_size=len(page), fetch=bool(returning))
+                    if returning:
+                        returnValue.inserted_ids.extend(dict(zip(returning, row)) for row in result)
+                    returnValue.inserted_count += mycursor.rowcount
+                    returnValue.chunks.append(Bulk_Chunk_Result(index=index, size=len(page), inserted_count=mycursor.rowcount))
+        except Exception as e:
+            error = e
+            returnValue = PostgreSQL.__error("BulkInsert", e)
+        finally:
+            if started is not None:
+                PostgreSQL.__emit("bulk_insert", started, None, None if error else returnValue.inserted_count, error)
+            if mycursor: mycursor.close()
+            return returnValue
+
+    @staticmethod
+    def bulk_update(conn : connection, table_name : str, columns : list[str], key_columns : list[str], rows : list[tuple], page_size : int = 1000, print_data : bool = False) -> Bulk_Write_Result | JSONResponse:
+        if print_data:
+            logger.debug("PostgreSQL.BulkUpdate(%s) table_name: %s columns: %s key_columns: %s rows: %s", conn.info.dbname, table_name, columns, key_columns, len(rows))
+        
+        started = instrumentation.start()
+        returnValue: Any
+        mycursor: cursor = None
+        error: Exception | None = None
+        table = sql.Identifier(*table_name.split("."))
+        set_columns = [column for column in columns if column not in key_columns]
+        try:
+            if not set_columns or not set(key_columns) <= set(columns):
+                raise ValueError("Las llaves deben estar en \"columns\" y debe haber al menos una columna que actualizar")
+            mycursor = conn.cursor()
+            # Los valores de VALUES no tienen el tipo de la columna destino: se convierten explícitamente
+            template = PostgreSQL.__values_template(mycursor, table, columns)
+            keys = sql.SQL(" AND ").join(sql.SQL("t.{0} = v.{0}").format(sql.Identifier(column)) for column in key_columns)
+            # Un UPDATE ... FROM por página; las filas sin cambios no se reescriben (no generan versiones muertas)
+            query = sql.SQL(
+                "WITH v ({columns}) AS (VALUES %s), "
+                "u AS (UPDATE {table} AS t SET {assignments} FROM v WHERE {keys} AND ({target}) IS DISTINCT FROM ({source}) RETURNING 1) "
+                "SELECT (SELECT count(*) FROM v WHERE EXISTS (SELECT 1 FROM {table} AS t WHERE {keys})), (SELECT count(*) FROM u)"
+            ).format(
+                columns=sql.SQL(", ").join(map(sql.Identifier, columns)),
+                table=table,
+                assignments=sql.SQL(", ").join(sql.SQL("{0} = v.{0}").format(sql.Identifier(column)) for column in set_columns),
+                keys=keys,
+                target=sql.SQL(", ").join(sql.SQL("t.{}").format(sql.Identifier(column)) for column in set_columns),
+                source=sql.SQL(", ").join(sql.SQL("v.{}").format(sql.Identifier(column)) for column in set_columns)
+            )
+            returnValue = Bulk_Write_Result(method="update_from_values")
+            for index, start in enumerate(range(0, len(rows), page_size)):
+                page = rows[start:start + page_size]
+                matched, modified = execute_values(mycursor, query, page, template=template, page_size=len(page), fetch=True)[0]
+                returnValue.matched_count += matched
+                returnValue.modified_count += modified
+                returnValue.chunks.append(Bulk_Chunk_Result(index=index, size=len(page), matched_count=matched, modified_count=modified))
+        except Exception as e:
+            error = e
+            returnValue = PostgreSQL.__error("BulkUpdate", e)
+        finally:
+            if started is not None:
+                PostgreSQL.__emit("bulk_update", started, None, None if error else returnValue.modified_count, error)
+            if mycursor: mycursor.close()
+            return returnValue
+
+    @staticmethod
+    def bulk_upsert(conn : connection, table_name : str, columns : list[str], key_columns : list[str], rows : list[tuple], update_columns : list[str] | None = None, page_size : int = 1000, print_data : bool = False) -> Bulk_Write_Result | JSONResponse:
+        if print_data:
+            logger.debug("PostgreSQL.BulkUpsert(%s) table_name: %s columns: %s key_columns: %s update_columns: %s rows: %s", conn.info.dbname, table_name, columns, key_columns, update_columns, len(rows))
+        
+        started = instrumentation.start()
+        returnValue: Any
+        mycursor: cursor = None
+        error: Exception | None = None
+        table = sql.Identifier(*table_name.split("."))
+        update_columns = [column for column in columns if column not in key_columns] if update_columns is None else update_columns
+        try:
+            if not set(key_columns) <= set(columns):
+                raise ValueError("Las llaves deben estar en \"columns\"")
+            query = sql.SQL("INSERT INTO {} AS t ({}) VALUES %s ON CONFLICT ({}) ").format(
+                table,
+                sql.SQL(", ").join(map(sql.Identifier, columns)),
+                sql.SQL(", ").join(map(sql.Identifier, key_columns))
+            )
+            if update_columns:
+                # Las filas iguales a las existentes no se reescriben ni se retornan
+                query += sql.SQL("DO UPDATE SET {} WHERE ({}) IS DISTINCT FROM ({}) ").format(
+                    sql.SQL(", ").join(sql.SQL("{0} = EXCLUDED.{0}").format(sql.Identifier(column)) for column in update_columns),
+                    sql.SQL(", ").join(sql.SQL("t.{}").format(sql.Identifier(column)) for column in update_columns),
+                    sql.SQL(", ").join(sql.SQL("EXCLUDED.{}").format(sql.Identifier(column)) for column in update_columns)
+                )
+            else:
+                query += sql.SQL("DO NOTHING ")
+            # xmax = 0 solo en las filas recién insertadas
+            query += sql.SQL("RETURNING (t.xmax = 0), {}").format(sql.SQL(", ").join(sql.SQL("t.{}").format(sql.Identifier(column)) for column in key_columns))
+            key_positions = [columns.index(column) for column in key_columns]
+            mycursor = conn.cursor()
+            returnValue = Bulk_Write_Result(method="insert_on_conflict")
+            for index, start in enumerate(range(0, len(rows), page_size)):
+                # ON CONFLICT no admite dos filas con la misma llave en una sentencia: prevalece la última
+                page = list({tuple(row[position] for position in key_positions): row for row in rows[start:start + page_size]}.values())
+                inserted = execute_values(mycursor, query, page, page_size=len(page), fetch=True)
+                upserted_ids = [dict(zip(key_columns, row[1:])) for row in inserted if row[0]]
+                upserted = len(upserted_ids)
+                chunk_result = Bulk_Chunk_Result(
+                    index=index,
+                    size=len(page),
+                    matched_count=len(page) - upserted,
+                    modified_count=len(inserted) - upserted,
+                    upserted_count=upserted
+                )
+                returnValue.matched_count += chunk_result.matched_count
+                returnValue.modified_count += chunk_result.modified_count
+                returnValue.upserted_count += upserted
+                returnValue.upserted_ids.extend(upserted_ids)
+                returnValue.chunks.append(chunk_result)
+        except Exception as e:
+            error = e
+            returnValue = PostgreSQL.__error("BulkUpsert", e)
+        finally:
+            if started is not None:
+                PostgreSQL.__emit("bulk_upsert", started, None, None if error else returnValue.modified_count + returnValue.upserted_count, error)
+            if mycursor: mycursor.close()
+            return returnValue
+
+    @staticmethod
+    def export(conn : connection, query : str, file : Any, vars : tuple | None = None, format : Export_Format = Export_Format.CSV, header : bool = True, print_data : bool = False) -> Export_Result | JSONResponse:
+        if print_data:
+            logger.debug("PostgreSQL.Export(%s) query: %s vars: %s format: %s", conn.info.dbname, query, vars, format.value)
+        
+        started = instrumentation.start()
+        returnValue: Any
+        mycursor: cursor = None
+        error: Exception | None = None
+        written: int | None = None
+        try:
+            if format is Export_Format.BSON:
+                raise ValueError("PostgreSQL no admite el formato BSON")
+            mycursor = conn.cursor()
+            # COPY no admite parámetros: la consulta se envía con los valores ya interpolados por psycopg2
+            query = (mycursor.mogrify(query, vars).decode(encodings[conn.encoding]) if vars else query).strip().rstrip(";")
+            options = sql.SQL("FORMAT {}").format(sql.SQL(format.value))
+            if header and format is Export_Format.CSV:
+                options += sql.SQL(", HEADER")
+            position = _tell(file)
+            # psycopg2 escribe cada bloque recibido directamente en el archivo, sin crear objetos por registro
+            mycursor.copy_expert(sql.SQL("COPY ({}) TO STDOUT WITH ({})").format(sql.SQL(query), options), file)
+            end = _tell(file)
+            written = end - position if position is not None and end is not None else None
+            returnValue = Export_Result(format=format, rows=mycursor.rowcount, bytes=written)
+        except Exception as e:
+            error = e
+            returnValue = PostgreSQL.__error("Export", e)
+        finally:
+            if started is not None:
+                instrumentation.emit(Database_Type.POSTGRESQL.value, "export", started, rows=None if error else mycursor.rowcount, bytes=written, error=error)
+            if mycursor: mycursor.close()
+            return returnValue
+
+    @staticmethod
+    def update(conn : connection, query : str, vars : tuple | None = None, print_data : bool = False) -> bool | JSONResponse:
+        if print_data:
+            logger.debug("PostgreSQL.Update(%s) query: %s vars: %s", conn.info.dbname, query, vars)
+        
+        started = instrumentation.start()
+        returnValue: Any
+        mycursor: cursor = None
+        error: Exception | None = None
+        try:
+            mycursor = conn.cursor(cursor_factory=NamedTupleCursor)
+            statement_cache.execute(conn, mycursor, query, vars)
             returnValue = len(mycursor.fetchall()) > 0
         except Exception as e:
-            print("Exception")
-            print(str(e.pgerror))
-            print("--------------------------------------------")
-            returnValue = JSONResponse(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content=HTTP_Response(success=False, message=f"There was an error: {str(e)}", data={}))
+            error = e
+            returnValue = PostgreSQL.__error("Update", e)
         finally:
+            if started is not None:
+                PostgreSQL.__emit("update", started, mycursor, None if error else mycursor.rowcount, error, query, vars, conn)
             if mycursor: mycursor.close()
             return returnValue
 
     @staticmethod
     def delete(conn : connection, query : str, vars : tuple, print_data : bool = False) -> bool | JSONResponse:
-        print(f"---------- PostgreSQL.Delete({conn.info.dbname}) ----------")
         if print_data:
-            print(f"query: {query}")
-            print(f"vars: {str(vars)}")
+            logger.debug("PostgreSQL.Delete(%s) query: %s vars: %s", conn.info.dbname, query, vars)
         
+        started = instrumentation.start()
         returnValue: Any
+        mycursor: cursor = None
+        error: Exception | None = None
         try:
-            mycursor: cursor = conn.cursor(cursor_factory=NamedTupleCursor)
-            mycursor.execute(query=query, vars=(vars,))
-            conn.commit()
+            mycursor = conn.cursor(cursor_factory=NamedTupleCursor)
+            statement_cache.execute(conn, mycursor, query, (vars,))
+            # Dentro de "service.transaction" la confirmación ocurre una sola vez al salir
+            if transaction.current(conn) is None:
+                conn.commit()
             returnValue = len(mycursor.fetchall()) > 0
         except Exception as e:
-            print("Exception")
-            print(str(e.pgerror))
-            print("--------------------------------------------")
-            returnValue = JSONResponse(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content=HTTP_Response(success=False, message=f"There was an error: {str(e)}", data={}))
+            error = e
+            returnValue = PostgreSQL.__error("Delete", e)
         finally:
+            if started is not None:
+                PostgreSQL.__emit("delete", started, mycursor, None if error else mycursor.rowcount, error, query, (vars,), conn)
             if mycursor: mycursor.close()
             return returnValue
 
     @staticmethod
     def notify(*, conn : connection, channel : str = 'notification', payload : dict, print_data : bool = False) -> bool | JSONResponse:
-        print(f"---------- PostgreSQL.Notify({conn.info.dbname}) ----------")
         if print_data:
-            print(f"channel: {channel}")
-            print(f"payload: {str(payload)}")
+            logger.debug("PostgreSQL.Notify(%s) channel: %s payload: %s", conn.info.dbname, channel, payload)
         
+        started = instrumentation.start()
         returnValue: Any
+        mycursor: cursor = None
+        error: Exception | None = None
         try:
-            mycursor: cursor = conn.cursor(cursor_factory=NamedTupleCursor)
-            mycursor.execute(query=f"NOTIFY {channel}, %s; ", vars=(str(payload).replace("'", "\""),))
+            mycursor = conn.cursor()
+            # pg_notify recibe el canal como parámetro (sin pasarlo a minúsculas como "NOTIFY canal", de ahí
+            # "channel_name"); el payload se serializa como JSON
+            mycursor.execute("SELECT pg_notify(%s, %s)", (channel_name(channel), encode_payload(payload)))
             returnValue = True
         except Exception as e:
-            print("Exception")
-            print(str(e.pgerror))
-            print("--------------------------------------------")
-            returnValue = JSONResponse(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content=HTTP_Response(success=False, message=f"There was an error: {str(e)}", data={}))
+            error = e
+            returnValue = PostgreSQL.__error("Notify", e)
         finally:
+            if started is not None:
+                PostgreSQL.__emit("notify", started, mycursor, None, error)
             if mycursor: mycursor.close()
             return returnValue
+
+    @staticmethod
+    def __error(operation : str, e : Exception) -> JSONResponse:
+        logger.error("PostgreSQL.%s: %s", operation, getattr(e, "pgerror", None) or str(e))
+        return error_response(f"There was an error: {str(e)}")
+
+    @staticmethod
+    def __emit(operation : str, started : float, mycursor : cursor | None, rows : int | None, error : Exception | None, statement : str | None = None, parameters : Any = None, conn : connection | None = None) -> None:
+        # Los bytes corresponden a la consulta enviada al servidor (ya con los parámetros interpolados)
+        query = mycursor.query if mycursor is not None else None
+        instrumentation.emit(Database_Type.POSTGRESQL.value, operation, started, rows=rows, bytes=len(query) if query else None, error=error, statement=statement, parameters=parameters, conn=conn)
+    
+    @staticmethod
+    def __values_template(mycursor : cursor, table : sql.Identifier, columns : list[str]) -> str:
+        # Plantilla "(%s::tipo, ...)" con el tipo base de cada columna de la tabla. No se incluye el largo o la
+        # precisión: una conversión explícita a varchar(n)/char(n)/bit(n) trunca sin error, mientras que la
+        # asignación del UPDATE lo valida. Se usa el nombre interno ("pg_catalog.bpchar") porque "character"
+        # o "bit" sin largo equivalen a char(1)/bit(1)
+        mycursor.execute(
+            "SELECT attname, format('%%I.%%I', nspname, typname) FROM pg_attribute JOIN pg_type ON pg_type.oid = atttypid JOIN pg_namespace ON pg_namespace.oid = typnamespace WHERE attrelid = %s::regclass AND attnum > 0 AND NOT attisdropped",
+            (table.as_string(mycursor),)
+        )
+        types = dict(mycursor.fetchall())
+        missing = [column for column in columns if column not in types]
+        if missing:
+            raise ValueError(f"Columnas inexistentes: {', '.join(missing)}")
+        return "(" + ", ".join(f"%s::{types[column]}" for column in columns) + ")"
     
     @staticmethod
     def __filter_postgresql_error_message(e: Exception) -> str:
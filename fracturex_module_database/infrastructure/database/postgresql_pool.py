@@ -0,0 +1,281 @@
+import threading
+import time
+import weakref
+from collections import deque
+from contextlib import contextmanager
+from typing import Iterator
+
+import psycopg2
+from psycopg2.extensions import (
+    connection,
+    TRANSACTION_STATUS_IDLE,
+    TRANSACTION_STATUS_UNKNOWN
+)
+
+from fracturex_module_database.infrastructure.database import transaction
+from fracturex_module_database.infrastructure.database.pool import Pool_Timeout_Error
+from fracturex_module_database.infrastructure.database.statement_cache import enable_statement_cache
+from fracturex_module_database.model.database_type import Database_Type
+from fracturex_module_database.model.pool_stats import Pool_Stats
+
+class _Pool_Connection(connection):
+    """
+    Conexión del pool: avisa al confirmar o deshacer, para ejecutar las acciones que esperan a que se
+    confirmen las escrituras hechas fuera de "transaction" (ver "transaction.after_implicit_commit")
+    """
+
+    def commit(self) -> None:
+        try:
+            super().commit()
+        except BaseException:
+            transaction.implicit_rollback(self)
+            raise
+        transaction.implicit_commit(self)
+
+    def rollback(self) -> None:
+        try:
+            super().rollback()
+        finally:
+            transaction.implicit_rollback(self)
+
+class PostgreSQL_Pool:
+    """
+    Pool de conexiones PostgreSQL acotado y seguro entre hilos
+
+    Las conexiones se entregan con `getconn()` y se devuelven con `putconn()` (o usando el
+    context manager `connection()`). Las conexiones ociosas por más de `max_idle` segundos se
+    cierran, conservando siempre `min_size` conexiones abiertas.
+
+    El pool no retiene las conexiones entregadas: si quien la pidió la cierra o la descarta sin
+    devolverla (como se hacía antes del pool), su lugar se recupera al liberarse la conexión o, si
+    está cerrada, en el siguiente `getconn()` o `stats()`.
+    """
+
+    def __init__(self, database_config_key : str, dsn : str, min_size : int = 1, max_size : int = 10, max_idle : float = 300.0, timeout : float = 30.0, health_check_interval : float = 30.0, statement_cache_size : int = 0, statement_cache_prepare_threshold : int = 2) -> None:
+        if max_size < 1 or min_size < 0 or min_size > max_size:
+            raise ValueError(f"Tamaño de pool inválido: min_size={min_size}, max_size={max_size}")
+        self.database_config_key = database_config_key
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_idle = max_idle
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self.statement_cache_size = statement_cache_size
+        self.statement_cache_prepare_threshold = statement_cache_prepare_threshold
+        self._dsn = dsn
+        self._cond = threading.Condition()
+        # Conexiones ociosas junto al momento en que fueron devueltas (LIFO para reutilizar las más recientes)
+        self._idle: deque[tuple[connection, float]] = deque()
+        # Conexiones entregadas, con el finalizador que recupera su lugar si se liberan sin devolverlas
+        self._in_use: dict[int, weakref.finalize] = {}
+        # Conexiones abiertas más las que se están abriendo
+        self._size = 0
+        self._waiting = 0
+        self._closed = False
+        # Estadísticas
+        self._checkouts = 0
+        self._timeouts = 0
+        self._created = 0
+        self._discarded = 0
+        self._leaked = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+        for _ in range(min_size):
+            conn = self._connect()
+            with self._cond:
+                self._size += 1
+                self._idle.append((conn, time.monotonic()))
+
+    def _connect(self) -> connection:
+        conn = psycopg2.connect(dsn=self._dsn, connection_factory=_Pool_Connection)
+        if self.statement_cache_size > 0:
+            enable_statement_cache(conn, max_size=self.statement_cache_size, prepare_threshold=self.statement_cache_prepare_threshold)
+        with self._cond:
+            self._created += 1
+        return conn
+
+    def _is_healthy(self, conn : connection, last_used : float) -> bool:
+        if conn.closed or conn.info.transaction_status == TRANSACTION_STATUS_UNKNOWN:
+            return False
+        if time.monotonic() - last_used < self.health_check_interval:
+            return True
+        # Verificar que el servidor siga respondiendo si la conexión lleva tiempo ociosa
+        try:
+            with conn.cursor() as mycursor:
+                mycursor.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _evict_idle_locked(self) -> list[connection]:
+        evicted: list[connection] = []
+        now = time.monotonic()
+        # Las conexiones más antiguas están al inicio del deque
+        while self._idle and self._size > self.min_size and now - self._idle[0][1] > self.max_idle:
+            conn, _ = self._idle.popleft()
+            self._size -= 1
+            self._discarded += 1
+            evicted.append(conn)
+        return evicted
+
+    def _reclaim(self, key : int) -> None:
+        # Finalizador: la conexión se liberó sin devolverla al pool (psycopg2 la cierra al liberarla)
+        with self._cond:
+            if self._in_use.pop(key, None) is not None:
+                self._size -= 1
+                self._discarded += 1
+                self._leaked += 1
+                self._cond.notify()
+
+    def _reclaim_closed_locked(self) -> None:
+        # Conexiones entregadas que ya se cerraron sin devolverlas al pool
+        for key, finalizer in list(self._in_use.items()):
+            item = finalizer.peek()
+            if item is not None and item[0].closed:
+                finalizer.detach()
+                del self._in_use[key]
+                self._size -= 1
+                self._discarded += 1
+                self._leaked += 1
+
+    @staticmethod
+    def _close_all(conns : list[connection]) -> None:
+        for conn in conns:
+            try:
+                conn.close()
+            except psycopg2.Error:
+                pass
+
+    def getconn(self, timeout : float | None = None) -> connection:
+        """
+        Función para obtener una conexión del pool, esperando como máximo `timeout` segundos
+        """
+        timeout = self.timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+        while True:
+            conn: connection | None = None
+            last_used = 0.0
+            with self._cond:
+                if self._closed:
+                    raise Pool_Timeout_Error(f"El pool '{self.database_config_key}' está cerrado")
+                evicted = self._evict_idle_locked()
+                while not self._idle and self._size >= self.max_size:
+                    self._reclaim_closed_locked()
+                    if self._size < self.max_size:
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        self._close_all(evicted)
+                        raise Pool_Timeout_Error(f"No hay conexiones disponibles en el pool '{self.database_config_key}' luego de {timeout} segundos")
+                    self._waiting += 1
+                    try:
+                        # Cerrar una conexión no avisa al pool: se vuelve a revisar al menos cada segundo
+                        self._cond.wait(min(remaining, 1.0))
+                    finally:
+                        self._waiting -= 1
+                if self._idle:
+                    conn, last_used = self._idle.pop()
+                else:
+                    self._size += 1
+            self._close_all(evicted)
+
+            if conn is None:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+            elif not self._is_healthy(conn, last_used):
+                self._close_all([conn])
+                with self._cond:
+                    self._size -= 1
+                    self._discarded += 1
+                    self._cond.notify()
+                continue
+
+            waited = time.monotonic() - started
+            with self._cond:
+                self._in_use[id(conn)] = weakref.finalize(conn, self._reclaim, id(conn))
+                self._checkouts += 1
+                self._wait_time_total += waited
+                self._wait_time_max = max(self._wait_time_max, waited)
+            return conn
+
+    def putconn(self, conn : connection, discard : bool = False) -> None:
+        """
+        Función para devolver una conexión al pool. Las transacciones abiertas se deshacen
+        """
+        with self._cond:
+            finalizer = self._in_use.pop(id(conn), None)
+            if finalizer is None:
+                raise ValueError("La conexión no pertenece a este pool")
+            finalizer.detach()
+        if not discard and not conn.closed and conn.info.transaction_status != TRANSACTION_STATUS_IDLE:
+            try:
+                conn.rollback()
+            except psycopg2.Error:
+                discard = True
+        discard = discard or bool(conn.closed)
+        # Lo que no se confirmó antes de devolverla se deshizo
+        transaction.implicit_rollback(conn)
+        with self._cond:
+            if discard or self._closed:
+                self._size -= 1
+                self._discarded += 1
+            else:
+                self._idle.append((conn, time.monotonic()))
+            evicted = self._evict_idle_locked()
+            self._cond.notify()
+        if discard or self._closed:
+            self._close_all([conn])
+        self._close_all(evicted)
+
+    def owns(self, conn : connection) -> bool:
+        with self._cond:
+            return id(conn) in self._in_use
+
+    @contextmanager
+    def connection(self, timeout : float | None = None) -> Iterator[connection]:
+        conn = self.getconn(timeout=timeout)
+        try:
+            yield conn
+        finally:
+            self.putconn(conn)
+
+    def stats(self) -> Pool_Stats:
+        with self._cond:
+            self._reclaim_closed_locked()
+            return Pool_Stats(
+                database_config_key=self.database_config_key,
+                type=Database_Type.POSTGRESQL,
+                min_size=self.min_size,
+                max_size=self.max_size,
+                size=self._size,
+                in_use=len(self._in_use),
+                idle=len(self._idle),
+                waiting=self._waiting,
+                checkouts=self._checkouts,
+                timeouts=self._timeouts,
+                created=self._created,
+                discarded=self._discarded,
+                leaked=self._leaked,
+                wait_time_total=self._wait_time_total,
+                wait_time_max=self._wait_time_max
+            )
+
+    def close(self) -> None:
+        """
+        Función para cerrar las conexiones ociosas. Las conexiones en uso se cierran al ser devueltas
+        """
+        with self._cond:
+            self._closed = True
+            idle = [conn for conn, _ in self._idle]
+            self._size -= len(idle)
+            self._idle.clear()
+            self._cond.notify_all()
+        self._close_all(idle)
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import random
+import re
+import threading
+import time
+from typing import TYPE_CHECKING
+
+from fracturex_module_database.infrastructure.database.pool import registry
+from fracturex_module_database.infrastructure.instrumentation import logger
+from fracturex_module_database.model.database_config import Database_Config
+from fracturex_module_database.model.replica_stats import Replica_Stats
+
+if TYPE_CHECKING:
+    from psycopg2.extensions import connection
+
+# Las llaves de los pools de las réplicas son "<llave del primario>:replica<índice>"
+_REPLICA_KEY = re.compile(r":replica\d+$")
+
+def primary_key(pool_key : str) -> str:
+    """
+    Función para obtener la llave de configuración del primario a partir de la llave del pool de una réplica
+
+    Las llaves que no son de réplicas se retornan sin cambios.
+    """
+    return _REPLICA_KEY.sub("", pool_key)
+
+class _Replica:
+
+    def __init__(self, database_config_key : str, index : int, database_config : Database_Config) -> None:
+        self.database_config_key = database_config_key
+        self.index = index
+        # Cada réplica tiene su propio pool en el registro, con la configuración del primario
+        self.pool_key = f"{database_config_key}:replica{index}"
+        self.database_config = database_config.model_copy(update={"url": database_config.replicas[index], "replicas": []})
+        self.latency = 0.0
+        self.in_flight = 0
+        self.reads = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.ejections = 0
+        self.ejected_until = 0.0
+
+    def score(self) -> float:
+        # Latencia esperada considerando las lecturas que ya esperan en la réplica
+        return self.latency * (self.in_flight + 1)
+
+class Replica_Router:
+    """
+    Enrutador de lecturas PostgreSQL hacia las réplicas de cada llave de configuración
+
+    Elige entre dos réplicas al azar la de menor latencia promedio (EWMA) ponderada por las lecturas en
+    curso, de modo que las réplicas lentas reciben menos carga sin que todas las lecturas se concentren
+    en la más rápida. Una réplica con `replica_max_failures` fallos de conexión seguidos se excluye por
+    `replica_ejection_time` segundos (el doble en cada exclusión seguida, hasta 8 veces), y vuelve a
+    recibir lecturas al terminar la exclusión.
+    """
+
+    def __init__(self, alpha : float = 0.3) -> None:
+        self.alpha = alpha
+        self._lock = threading.Lock()
+        self._replicas: dict[str, list[_Replica]] = {}
+
+    def _get_replicas(self, database_config_key : str, database_config : Database_Config) -> list[_Replica]:
+        replicas = self._replicas.get(database_config_key)
+        if replicas is None:
+            with self._lock:
+                replicas = self._replicas.get(database_config_key)
+                if replicas is None:
+                    replicas = [_Replica(database_config_key, index, database_config) for index in range(len(database_config.replicas))]
+                    self._replicas[database_config_key] = replicas
+        return replicas
+
+    def acquire(self, database_config_key : str, database_config : Database_Config) -> tuple[_Replica, connection] | None:
+        """
+        Función para obtener una conexión de la réplica elegida, o None si no hay réplicas disponibles
+        """
+        replicas = self._get_replicas(database_config_key, database_config)
+        now = time.monotonic()
+        with self._lock:
+            candidates = [replica for replica in replicas if replica.ejected_until <= now]
+            if not candidates:
+                return None
+            if len(candidates) > 2:
+                candidates = random.sample(candidates, 2)
+            replica = min(candidates, key=_Replica.score)
+            replica.in_flight += 1
+        try:
+            conn = registry.get_postgresql_pool(replica.pool_key, replica.database_config).getconn()
+        except Exception as e:
+            logger.warning("No se pudo conectar a la réplica %s: %s", replica.pool_key, str(e))
+            self._finish(replica, None, failed=True)
+            return None
+        return replica, conn
+
+    def release(self, replica : _Replica, conn : connection, elapsed : float | None, failed : bool = False) -> None:
+        """
+        Función para devolver la conexión de la réplica registrando la latencia de la lectura, o el fallo de conexión
+        """
+        self._finish(replica, elapsed, failed)
+        registry.release(conn, discard=failed)
+
+    def _finish(self, replica : _Replica, elapsed : float | None, failed : bool) -> None:
+        with self._lock:
+            replica.in_flight -= 1
+            if failed:
+                replica.failures += 1
+                replica.consecutive_failures += 1
+                if replica.consecutive_failures >= replica.database_config.replica_max_failures:
+                    replica.ejections += 1
+                    replica.consecutive_failures = 0
+                    replica.ejected_until = time.monotonic() + replica.database_config.replica_ejection_time * 2 ** min(replica.ejections - 1, 3)
+                    logger.warning("Réplica %s excluida por %.1f s", replica.pool_key, replica.ejected_until - time.monotonic())
+                return
+            replica.consecutive_failures = 0
+            replica.ejections = 0
+            replica.reads += 1
+            if elapsed is not None:
+                replica.latency = elapsed if replica.latency == 0.0 else self.alpha * elapsed + (1 - self.alpha) * replica.latency
+
+    def stats(self) -> list[Replica_Stats]:
+        now = time.monotonic()
+        with self._lock:
+            return [
+                Replica_Stats(
+                    database_config_key=replica.database_config_key,
+                    replica=replica.index,
+                    latency=replica.latency,
+                    in_flight=replica.in_flight,
+                    reads=replica.reads,
+                    failures=replica.failures,
+                    ejections=replica.ejections,
+                    ejected=replica.ejected_until > now
+                )
+                for replicas in self._replicas.values() for replica in replicas
+            ]
+
+# Enrutador compartido por todo el proceso
+router: Replica_Router = Replica_Router()
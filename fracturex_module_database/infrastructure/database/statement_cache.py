@@ -0,0 +1,225 @@
+import re
+import threading
+import weakref
+from collections import OrderedDict
+from itertools import count
+from typing import Any
+
+import psycopg2
+from psycopg2.extensions import (
+    connection,
+    cursor,
+    TRANSACTION_STATUS_IDLE,
+    TRANSACTION_STATUS_INTRANS
+)
+
+from fracturex_module_database.model.statement_cache_stats import Statement_Cache_Stats
+
+# Marcadores de psycopg2 que se traducen a parámetros posicionales del servidor
+_PLACEHOLDER = re.compile(r"%%|%s")
+# invalid_sql_statement_name, feature_not_supported ("cached plan must not change result type")
+_INVALIDATING_PGCODES = {"26000", "0A000"}
+
+_statement_ids = count(1)
+
+class Statement_Cache:
+    """
+    Caché LRU de sentencias preparadas (PREPARE/EXECUTE) de una conexión PostgreSQL
+
+    Una consulta se prepara luego de verse `prepare_threshold` veces. Solo aplica a consultas con
+    parámetros posicionales (`%s`); las que usan parámetros con nombre se ejecutan normalmente.
+    """
+
+    def __init__(self, max_size : int = 100, prepare_threshold : int = 2) -> None:
+        self.max_size = max_size
+        self.prepare_threshold = prepare_threshold
+        # Las llaves son (consulta, sin parámetros): sin parámetros psycopg2 envía la consulta tal cual
+        self._statements: OrderedDict[tuple[str, bool], tuple[str, int]] = OrderedDict()
+        self._seen: OrderedDict[tuple[str, bool], int] = OrderedDict()
+        # Consultas que el servidor no logra preparar (por ejemplo, tipos de parámetros indeterminados)
+        self._unpreparable: set[tuple[str, bool]] = set()
+        self._pending_deallocate: list[str] = []
+        self.hits = 0
+        self.misses = 0
+        self.prepares = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _translate(query : str, raw : bool) -> tuple[str, int]:
+        if raw:
+            return query, 0
+        position = 0
+
+        def replace(match : re.Match) -> str:
+            nonlocal position
+            if match.group() == "%%":
+                return "%"
+            position += 1
+            return f"${position}"
+
+        return _PLACEHOLDER.sub(replace, query), position
+
+    def _drain_pending(self, mycursor : cursor) -> None:
+        while self._pending_deallocate:
+            mycursor.execute(f"DEALLOCATE {self._pending_deallocate.pop()}")
+
+    def _prepare(self, conn : connection, mycursor : cursor, key : tuple[str, bool]) -> tuple[str, int] | None:
+        statement, parameters = self._translate(*key)
+        name = f"fracturex_stmt_{next(_statement_ids)}"
+        in_transaction = conn.info.transaction_status == TRANSACTION_STATUS_INTRANS
+        started_transaction = not conn.autocommit and conn.info.transaction_status == TRANSACTION_STATUS_IDLE
+        try:
+            # Un PREPARE fallido no debe abortar la transacción del llamador
+            if in_transaction:
+                mycursor.execute("SAVEPOINT fracturex_prepare")
+            self._drain_pending(mycursor)
+            while len(self._statements) >= self.max_size:
+                evicted, _ = self._statements.popitem(last=False)[1]
+                mycursor.execute(f"DEALLOCATE {evicted}")
+                self.evictions += 1
+            mycursor.execute(f"PREPARE {name} AS {statement}")
+            if in_transaction:
+                mycursor.execute("RELEASE SAVEPOINT fracturex_prepare")
+        except psycopg2.Error:
+            if in_transaction:
+                mycursor.execute("ROLLBACK TO SAVEPOINT fracturex_prepare")
+            elif started_transaction:
+                conn.rollback()
+            self._unpreparable.add(key)
+            return None
+        self.prepares += 1
+        self._statements[key] = (name, parameters)
+        return name, parameters
+
+    def execute(self, conn : connection, mycursor : cursor, query : str, vars : tuple | list | None = None) -> None:
+        """
+        Función para ejecutar una consulta usando su sentencia preparada cuando existe
+        """
+        key = (query, vars is None)
+        if (vars is not None and not isinstance(vars, (tuple, list))) or key in self._unpreparable:
+            mycursor.execute(query, vars)
+            return
+        prepared = self._statements.get(key)
+        if prepared is None:
+            self.misses += 1
+            seen = self._seen.pop(key, 0) + 1
+            if seen < self.prepare_threshold:
+                self._seen[key] = seen
+                # Limitar la memoria usada para contar consultas vistas
+                while len(self._seen) > self.max_size * 4:
+                    self._seen.popitem(last=False)
+                mycursor.execute(query, vars)
+                return
+            # En una transacción abortada no se intenta preparar; el error lo reporta la ejecución normal
+            if conn.info.transaction_status not in (TRANSACTION_STATUS_IDLE, TRANSACTION_STATUS_INTRANS):
+                mycursor.execute(query, vars)
+                return
+            prepared = self._prepare(conn, mycursor, key)
+            if prepared is None:
+                mycursor.execute(query, vars)
+                return
+        else:
+            self.hits += 1
+            self._statements.move_to_end(key)
+
+        name, parameters = prepared
+        if parameters != len(vars or ()):
+            # Dejar que psycopg2 reporte el error de cantidad de parámetros
+            mycursor.execute(query, vars)
+            return
+        started_transaction = not conn.autocommit and conn.info.transaction_status == TRANSACTION_STATUS_IDLE
+        try:
+            if parameters:
+                mycursor.execute(f"EXECUTE {name} ({', '.join(['%s'] * parameters)})", vars)
+            else:
+                mycursor.execute(f"EXECUTE {name}")
+        except psycopg2.Error as e:
+            if e.pgcode not in _INVALIDATING_PGCODES:
+                raise
+            # El plan quedó inválido (por ejemplo, cambió el esquema): se descarta para volver a prepararlo
+            self._statements.pop(key, None)
+            self.invalidations += 1
+            if e.pgcode != "26000":
+                self._pending_deallocate.append(name)
+            if not started_transaction and not conn.autocommit:
+                raise
+            if started_transaction:
+                conn.rollback()
+            mycursor.execute(query, vars)
+
+    def stats(self) -> Statement_Cache_Stats:
+        return Statement_Cache_Stats(
+            connections=1,
+            size=len(self._statements),
+            hits=self.hits,
+            misses=self.misses,
+            prepares=self.prepares,
+            evictions=self.evictions,
+            invalidations=self.invalidations
+        )
+
+_caches: "weakref.WeakKeyDictionary[connection, Statement_Cache]" = weakref.WeakKeyDictionary()
+_caches_lock = threading.Lock()
+# Contadores de las conexiones ya cerradas
+_retired = Statement_Cache_Stats()
+
+def _retire(cache : Statement_Cache) -> None:
+    with _caches_lock:
+        for field in ("hits", "misses", "prepares", "evictions", "invalidations"):
+            setattr(_retired, field, getattr(_retired, field) + getattr(cache, field))
+
+def enable_statement_cache(conn : connection, max_size : int = 100, prepare_threshold : int = 2) -> Statement_Cache:
+    """
+    Función para activar la caché de sentencias preparadas en una conexión
+
+    Parameters
+    ----------
+    conn : psycopg2.extensions.connection
+        Conexión en la que se preparan las sentencias
+    max_size : int = 100
+        Cantidad máxima de sentencias preparadas; las menos usadas recientemente se liberan con DEALLOCATE
+    prepare_threshold : int = 2
+        Cantidad de veces que debe verse una consulta antes de prepararla
+
+    Returns
+    -------
+    Statement_Cache
+        Caché asociada a la conexión
+    """
+    with _caches_lock:
+        cache = _caches.get(conn)
+        if cache is None:
+            cache = Statement_Cache(max_size=max_size, prepare_threshold=prepare_threshold)
+            _caches[conn] = cache
+            weakref.finalize(conn, _retire, cache)
+        return cache
+
+def get_statement_cache(conn : connection) -> Statement_Cache | None:
+    return _caches.get(conn)
+
+def get_statement_cache_stats() -> Statement_Cache_Stats:
+    """
+    Función para retornar los contadores acumulados de todas las cachés de sentencias del proceso
+    """
+    with _caches_lock:
+        caches = list(_caches.values())
+        returnValue = _retired.model_copy()
+    for cache in caches:
+        returnValue.connections += 1
+        returnValue.size += len(cache._statements)
+        for field in ("hits", "misses", "prepares", "evictions", "invalidations"):
+            setattr(returnValue, field, getattr(returnValue, field) + getattr(cache, field))
+    return returnValue
+
+def execute(conn : connection, mycursor : cursor, query : str, vars : Any = None) -> None:
+    """
+    Función para ejecutar una consulta pasando por la caché de sentencias de la conexión, si está activa
+    """
+    cache = _caches.get(conn)
+    if cache is not None:
+        cache.execute(conn, mycursor, query, vars)
+    elif vars is not None:
+        mycursor.execute(query=query, vars=vars)
+    else:
+        mycursor.execute(query=query)
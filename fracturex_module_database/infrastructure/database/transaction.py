@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import sys
+import threading
+import weakref
+from contextvars import ContextVar, Token
+from typing import TYPE_CHECKING, Any, Callable
+
+from fracturex_module_database.infrastructure.instrumentation import logger
+from fracturex_module_database.model.database_type import Database_Type
+from fracturex_module_database.model.dto.http_response import error_response
+from fracturex_module_database.model.isolation_level import Isolation_Level
+
+if TYPE_CHECKING:
+    from fastapi.responses import JSONResponse
+    from psycopg2.extensions import connection
+    from pymongo import MongoClient
+    from pymongo.client_session import ClientSession
+
+# Transacciones abiertas en el contexto actual (hilo o tarea de asyncio), de la más externa a la más interna
+_active: ContextVar[tuple[Transaction, ...]] = ContextVar("fracturex_transactions", default=())
+
+class Transaction:
+    """
+    Transacción abierta con `service.transaction`
+
+    Las operaciones CRUD retornan sus errores en lugar de lanzarlos, por lo que la transacción
+    registra el primero (`error`) y al salir deshace los cambios en vez de confirmarlos.
+    """
+
+    def __init__(self, conn : connection | MongoClient, database_type : Database_Type, parent : Transaction | None, isolation_level : Isolation_Level | None = None, read_only : bool = False) -> None:
+        self.conn = conn
+        self.database_type = database_type
+        self.parent = parent
+        self.isolation_level = isolation_level
+        self.read_only = read_only
+        # Punto de guardado de PostgreSQL cuando la transacción está anidada
+        self.savepoint: str | None = None
+        # Sesión de MongoDB (compartida por las transacciones anidadas)
+        self.session: ClientSession | None = parent.session if parent is not None else None
+        self.error: JSONResponse | BaseException | None = None
+        self.committed = False
+        self._rollback_only = False
+        self._autocommit = False
+        self._after_commit: list[Callable[[], Any]] = []
+
+    @property
+    def failed(self) -> bool:
+        return self.error is not None or self._rollback_only
+
+    def fail(self, error : JSONResponse | BaseException) -> None:
+        """
+        Función para marcar la transacción como fallida; MongoDB no tiene puntos de guardado, por lo que falla la transacción completa
+        """
+        transaction: Transaction | None = self
+        while transaction is not None:
+            if transaction.error is None:
+                transaction.error = error
+            transaction = transaction.parent if self.database_type == Database_Type.MONGODB else None
+
+    def set_rollback_only(self) -> None:
+        """
+        Función para deshacer la transacción al salir, sin que haya ocurrido un error
+        """
+        transaction: Transaction | None = self
+        while transaction is not None:
+            transaction._rollback_only = True
+            transaction = transaction.parent if self.database_type == Database_Type.MONGODB else None
+
+    def after_commit(self, callback : Callable[[], Any]) -> None:
+        """
+        Función para ejecutar `callback` cuando la transacción más externa se confirme
+        """
+        self._after_commit.append(callback)
+
+    def begin(self) -> None:
+        if self.parent is not None and self.isolation_level is not None:
+            raise ValueError("El nivel de aislamiento solo se puede definir en la transacción más externa")
+        if self.database_type == Database_Type.POSTGRESQL:
+            self._begin_postgresql()
+        elif self.parent is None:
+            self._begin_mongodb()
+
+    def end(self, exception : BaseException | None = None) -> None:
+        if exception is not None:
+            self.fail(exception)
+        if self.database_type == Database_Type.POSTGRESQL:
+            self._end_postgresql()
+        elif self.parent is None:
+            self._end_mongodb()
+        if self.parent is not None:
+            # Las acciones esperan a que se confirme la transacción externa
+            if not self.failed:
+                self.parent._after_commit.extend(self._after_commit)
+        elif self.committed:
+            for callback in self._after_commit:
+                try:
+                    callback()
+                except Exception:
+                    logger.exception("Error en una acción posterior a la confirmación de la transacción")
+
+    def _begin_postgresql(self) -> None:
+        from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+
+        conn: connection = self.conn
+        if self.parent is not None:
+            self.savepoint = f"fracturex_savepoint_{len(_active.get())}"
+            with conn.cursor() as mycursor:
+                mycursor.execute(f"SAVEPOINT {self.savepoint}")
+            return
+        # En modo autocommit no se abriría una transacción implícita
+        self._autocommit = conn.autocommit
+        if self._autocommit:
+            conn.autocommit = False
+        if self.isolation_level is None and not self.read_only:
+            return
+        options = []
+        if self.isolation_level is not None:
+            options.append(f"ISOLATION LEVEL {self.isolation_level.value}")
+        if self.read_only:
+            options.append("READ ONLY")
+        try:
+            if conn.info.transaction_status != TRANSACTION_STATUS_IDLE:
+                raise ValueError("La conexión tiene una transacción en curso; no se puede definir el nivel de aislamiento")
+            with conn.cursor() as mycursor:
+                mycursor.execute(f"SET TRANSACTION {' '.join(options)}")
+        except BaseException:
+            if self._autocommit:
+                conn.rollback()
+                conn.autocommit = True
+            raise
+
+    def _end_postgresql(self) -> None:
+        import psycopg2
+        from psycopg2.extensions import TRANSACTION_STATUS_INERROR
+
+        conn: connection = self.conn
+        try:
+            if self.savepoint is not None:
+                with conn.cursor() as mycursor:
+                    if self.failed or conn.info.transaction_status == TRANSACTION_STATUS_INERROR:
+                        mycursor.execute(f"ROLLBACK TO SAVEPOINT {self.savepoint}")
+                    mycursor.execute(f"RELEASE SAVEPOINT {self.savepoint}")
+                self.committed = not self.failed
+            elif self.failed or conn.info.transaction_status == TRANSACTION_STATUS_INERROR:
+                conn.rollback()
+            else:
+                conn.commit()
+                self.committed = True
+        except psycopg2.Error as e:
+            logger.error("PostgreSQL.Transaction: %s", getattr(e, "pgerror", None) or str(e))
+            self.fail(error_response(f"There was an error: {str(e)}"))
+            if self.savepoint is None and not conn.closed:
+                conn.rollback()
+        finally:
+            if self._autocommit and not conn.closed:
+                conn.autocommit = True
+
+    def _begin_mongodb(self) -> None:
+        from pymongo.read_concern import ReadConcern
+
+        read_concern = None
+        if self.isolation_level == Isolation_Level.READ_COMMITTED:
+            read_concern = ReadConcern("majority")
+        elif self.isolation_level is not None:
+            read_concern = ReadConcern("snapshot")
+        self.session = self.conn.start_session()
+        self.session.start_transaction(read_concern=read_concern)
+
+    def _end_mongodb(self) -> None:
+        from pymongo import errors
+
+        try:
+            if self.failed:
+                self.session.abort_transaction()
+            else:
+                self.session.commit_transaction()
+                self.committed = True
+        except errors.PyMongoError as e:
+            logger.error("MongoDB.Transaction: %s", str(e))
+            self.fail(error_response(f"There was an error: {str(e)}"))
+        finally:
+            self.session.end_session()
+
+def _is_mongodb_client(conn : Any) -> bool:
+    pymongo = sys.modules.get("pymongo")
+    return pymongo is not None and isinstance(conn, pymongo.MongoClient)
+
+def current(conn : connection | MongoClient) -> Transaction | None:
+    """
+    Función para retornar la transacción más interna abierta sobre la conexión en el contexto actual
+    """
+    for transaction in reversed(_active.get()):
+        if transaction.conn is conn:
+            return transaction
+    return None
+
+def mongodb_session(conn : MongoClient) -> ClientSession | None:
+    """
+    Función para retornar la sesión de la transacción abierta sobre el MongoClient, si la hay
+    """
+    if not _active.get():
+        return None
+    transaction = current(conn)
+    return transaction.session if transaction is not None else None
+
+def mark_failed(conn : connection | MongoClient, error : JSONResponse | BaseException) -> None:
+    transaction = current(conn)
+    if transaction is not None:
+        transaction.fail(error)
+
+def begin(conn : connection | MongoClient, isolation_level : Isolation_Level | None = None, read_only : bool = False) -> Transaction:
+    """
+    Función para abrir una transacción (o un punto de guardado si ya hay una abierta sobre la conexión)
+    """
+    transaction = Transaction(
+        conn=conn,
+        database_type=Database_Type.MONGODB if _is_mongodb_client(conn) else Database_Type.POSTGRESQL,
+        parent=current(conn),
+        isolation_level=isolation_level,
+        read_only=read_only
+    )
+    transaction.begin()
+    return transaction
+
+# Acciones pendientes de la transacción implícita de cada conexión PostgreSQL: operaciones hechas fuera de
+# "transaction" con autocommit desactivado, que quedan confirmadas cuando quien tiene la conexión llama a commit()
+_implicit: weakref.WeakKeyDictionary[connection, list[Callable[[], Any]]] = weakref.WeakKeyDictionary()
+_implicit_lock = threading.Lock()
+
+def after_implicit_commit(conn : connection | MongoClient, callback : Callable[[], Any]) -> None:
+    """
+    Función para ejecutar `callback` cuando se confirme la transacción implícita abierta en la conexión
+
+    Solo aplica a las conexiones PostgreSQL con una transacción abierta (autocommit desactivado) y
+    requiere que la conexión avise al confirmar o deshacer, como las del pool ("implicit_commit").
+    """
+    info = getattr(conn, "info", None)
+    if info is None or _is_mongodb_client(conn):
+        return
+    from psycopg2.extensions import TRANSACTION_STATUS_INTRANS
+
+    if info.transaction_status != TRANSACTION_STATUS_INTRANS:
+        return
+    with _implicit_lock:
+        _implicit.setdefault(conn, []).append(callback)
+
+def implicit_commit(conn : connection) -> None:
+    """
+    Función para ejecutar las acciones pendientes de la conexión luego de confirmar su transacción
+    """
+    if not _implicit:
+        return
+    with _implicit_lock:
+        callbacks = _implicit.pop(conn, ())
+    for callback in callbacks:
+        try:
+            callback()
+        except Exception:
+            logger.exception("Error en una acción posterior a la confirmación de la transacción")
+
+def implicit_rollback(conn : connection) -> None:
+    """
+    Función para descartar las acciones pendientes de la conexión luego de deshacer su transacción
+    """
+    if not _implicit:
+        return
+    with _implicit_lock:
+        _implicit.pop(conn, None)
+
+def push(transaction : Transaction) -> Token:
+    return _active.set(_active.get() + (transaction,))
+
+def pop(token : Token) -> None:
+    _active.reset(token)
@@ -0,0 +1,108 @@
+"""
+Soporte de `service.select_many`: ejecutor acotado donde corren las consultas de cada base de datos,
+cancelación de las consultas que exceden el tiempo y estrategias para mezclar los resultados
+"""
+from __future__ import annotations
+
+import heapq
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from operator import itemgetter
+from typing import TYPE_CHECKING, Any, Iterable
+
+from fracturex_module_database.infrastructure.instrumentation import logger
+
+if TYPE_CHECKING:
+    from psycopg2.extensions import connection
+    from pymongo import MongoClient
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+def configure_executor(max_workers : int | None = None) -> None:
+    """
+    Función para definir la cantidad máxima de consultas que "select_many" ejecuta a la vez
+
+    Parameters
+    ----------
+    max_workers : int | None = None
+        Cantidad máxima de hilos. Por defecto min(32, núcleos + 4)
+    """
+    global _executor
+    with _executor_lock:
+        previous, _executor = _executor, _create_executor(max_workers)
+    if previous is not None:
+        previous.shutdown(wait=False)
+
+def _create_executor(max_workers : int | None = None) -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=max_workers or min(32, (os.cpu_count() or 1) + 4), thread_name_prefix="fracturex_fan_out")
+
+def get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = _create_executor()
+    return _executor
+
+class Shard_Call:
+    """
+    Consulta en curso sobre una base de datos, que se puede cancelar desde otro hilo
+
+    La conexión solo se cancela mientras está asociada a la consulta: luego de "detach" vuelve al pool
+    y podría estar ejecutando la consulta de otro usuario. `started` es el momento (time.perf_counter)
+    en que un hilo del ejecutor empezó a atenderla, o None mientras espera en la cola.
+    """
+
+    def __init__(self, database_config_key : str) -> None:
+        self.database_config_key = database_config_key
+        self.cancelled = False
+        self.started: float | None = None
+        self._conn: connection | MongoClient | None = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        self.started = time.perf_counter()
+
+    def attach(self, conn : connection | MongoClient) -> bool:
+        with self._lock:
+            if self.cancelled:
+                return False
+            self._conn = conn
+            return True
+
+    def detach(self) -> None:
+        with self._lock:
+            self._conn = None
+
+    def cancel(self) -> None:
+        with self._lock:
+            self.cancelled = True
+            # Solo psycopg2 permite interrumpir la consulta en curso; en MongoDB se descarta el resultado
+            if self._conn is not None and hasattr(self._conn, "cancel"):
+                try:
+                    self._conn.cancel()
+                except Exception:
+                    logger.exception("No se pudo cancelar la consulta de %s", self.database_config_key)
+
+def merge_sorted(shard_rows : Iterable[list[dict]], sort_key : str, descending : bool = False, limit : int | None = None) -> list[dict]:
+    """
+    Función para mezclar (k-way) los registros de cada base de datos ordenados por "sort_key"
+
+    Cada lista se ordena antes de mezclarla; si la consulta ya usa ORDER BY/sort por la misma llave
+    el ordenamiento es lineal.
+    """
+    key = itemgetter(sort_key)
+    merged = heapq.merge(*(sorted(rows, key=key, reverse=descending) for rows in shard_rows), key=key, reverse=descending)
+    return list(islice(merged, limit))
+
+def concat(shard_rows : Iterable[list[Any]], limit : int | None = None) -> list[Any]:
+    rows: list[Any] = []
+    for shard in shard_rows:
+        rows.extend(shard if limit is None else shard[:limit - len(rows)])
+        if limit is not None and len(rows) >= limit:
+            break
+    return rows
@@ -0,0 +1,222 @@
+"""
+Asesor de índices de MongoDB: suscriptor de instrumentación que registra la forma de las consultas de
+`select`, `update` y `delete` (campos de igualdad, orden y rango, sin valores) y la compara con los
+índices de cada colección
+
+Los índices sugeridos siguen la regla igualdad-orden-rango (ESR): primero los campos comparados por
+igualdad, luego los del orden y al final los de rango.
+"""
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from fracturex_module_database.infrastructure.instrumentation import Operation_Event
+from fracturex_module_database.model.database_type import Database_Type
+from fracturex_module_database.model.index_report import (
+    Index_Report,
+    Index_Suggestion,
+    Unused_Index
+)
+
+if TYPE_CHECKING:
+    from pymongo import MongoClient
+
+# Operadores que equivalen a una igualdad para el uso de índices
+_EQUALITY_OPERATORS = {"$eq", "$in"}
+
+class Query_Shape(NamedTuple):
+    collection_name: str
+    equality: tuple[str, ...]
+    sort: tuple[tuple[str, int], ...]
+    range: tuple[str, ...]
+
+def _sort_keys(sort : Any) -> list[tuple[str, int]]:
+    # "sort" puede venir como lista de tuplas, lista de diccionarios o un diccionario ($sort)
+    if not sort:
+        return []
+    if isinstance(sort, dict):
+        return list(sort.items())
+    returnValue = []
+    for item in sort:
+        returnValue.extend(item.items() if isinstance(item, dict) else [tuple(item)])
+    return returnValue
+
+def _filter_fields(query : dict, equality : set[str], ranges : set[str]) -> None:
+    for field, value in query.items():
+        if field == "$and":
+            for condition in value:
+                _filter_fields(condition, equality, ranges)
+        elif field.startswith("$"):
+            # $or se separa en formas distintas; $nor, $expr, $text, ... no usan índices de la misma forma
+            continue
+        elif isinstance(value, dict) and value and all(key.startswith("$") for key in value):
+            (equality if set(value) <= _EQUALITY_OPERATORS else ranges).add(field)
+        else:
+            equality.add(field)
+
+def _branches(query : dict) -> list[dict]:
+    # Cada rama de un $or de primer nivel usa su propio índice
+    branches = query.get("$or")
+    if not isinstance(branches, list) or not branches:
+        return [query]
+    rest = {field: value for field, value in query.items() if field != "$or"}
+    return [{"$and": [rest, branch]} for branch in branches]
+
+def query_shapes(collection_name : str, query : dict | None = None, aggregate_pipeline : list[dict] | None = None, sort : Any = None) -> list[Query_Shape]:
+    """
+    Función para obtener las formas de una consulta (una por rama de $or); lista vacía si no filtra ni ordena
+    """
+    if aggregate_pipeline:
+        # Solo las etapas $match iniciales (y un $sort inmediato) pueden usar índices
+        matches = []
+        stages = iter(aggregate_pipeline)
+        stage = next(stages, None)
+        while stage is not None and "$match" in stage:
+            matches.append(stage["$match"])
+            stage = next(stages, None)
+        if stage is not None:
+            sort = stage.get("$sort")
+        query = {"$and": matches} if matches else {}
+    returnValue = []
+    for branch in _branches(query or {}):
+        equality: set[str] = set()
+        ranges: set[str] = set()
+        _filter_fields(branch, equality, ranges)
+        ranges -= equality
+        # Un campo de igualdad no cambia el orden: se puede omitir del orden
+        sort_keys = tuple((field, direction) for field, direction in _sort_keys(sort) if field not in equality)
+        ranges -= {field for field, _ in sort_keys}
+        if equality or sort_keys or ranges:
+            returnValue.append(Query_Shape(collection_name, tuple(sorted(equality)), sort_keys, tuple(sorted(ranges))))
+    return returnValue
+
+def suggested_keys(shape : Query_Shape) -> list[tuple[str, int]]:
+    return [(field, 1) for field in shape.equality] + list(shape.sort) + [(field, 1) for field in shape.range]
+
+def covers(keys : list[tuple[str, Any]], shape : Query_Shape) -> bool:
+    """
+    Función para saber si un índice atiende la consulta sin recorrer la colección ni ordenar en memoria
+    """
+    fields = [field for field, _ in keys]
+    position = len(shape.equality)
+    if set(fields[:position]) != set(shape.equality):
+        return False
+    if shape.sort:
+        index_sort = keys[position:position + len(shape.sort)]
+        if [field for field, _ in index_sort] != [field for field, _ in shape.sort]:
+            return False
+        # El índice se puede recorrer en ambos sentidos
+        if not (all(direction == wanted for (_, direction), (_, wanted) in zip(index_sort, shape.sort)) or all(isinstance(direction, int) and direction == -wanted for (_, direction), (_, wanted) in zip(index_sort, shape.sort))):
+            return False
+        position += len(shape.sort)
+    if shape.range and not shape.equality and not shape.sort:
+        return position < len(fields) and fields[position] in shape.range
+    return True
+
+def uses(keys : list[tuple[str, Any]], shape : Query_Shape) -> bool:
+    # La consulta puede usar el índice al menos en parte (su primer campo)
+    first = keys[0][0]
+    return first in shape.equality or first in shape.range or bool(shape.sort) and first == shape.sort[0][0]
+
+class _Shape_Stats:
+
+    __slots__ = ("count", "total_time")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_time = 0.0
+
+class Index_Advisor:
+    """
+    Suscriptor de instrumentación que acumula, por base de datos, las formas de las consultas de MongoDB
+    """
+
+    def __init__(self, max_shapes : int = 10000) -> None:
+        self.max_shapes = max_shapes
+        self._lock = threading.Lock()
+        self._shapes: dict[str, dict[Query_Shape, _Shape_Stats]] = {}
+
+    def __call__(self, event : Operation_Event) -> None:
+        if event.backend != Database_Type.MONGODB.value or event.statement is None or event.conn is None or event.error is not None:
+            return
+        shapes = query_shapes(event.statement["collection"], event.statement.get("filter"), event.statement.get("pipeline"), event.statement.get("sort"))
+        if not shapes:
+            return
+        database_name = event.conn.get_database().name
+        with self._lock:
+            database_shapes = self._shapes.setdefault(database_name, {})
+            for shape in shapes:
+                stats = database_shapes.get(shape)
+                if stats is None:
+                    if len(database_shapes) >= self.max_shapes:
+                        continue
+                    stats = database_shapes[shape] = _Shape_Stats()
+                stats.count += 1
+                stats.total_time += event.duration
+
+    def shapes(self, database_name : str) -> dict[Query_Shape, tuple[int, float]]:
+        with self._lock:
+            return {shape: (stats.count, stats.total_time) for shape, stats in self._shapes.get(database_name, {}).items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._shapes.clear()
+
+    def report(self, conn : MongoClient, collection_names : list[str] | None = None) -> Index_Report:
+        """
+        Función para comparar las formas registradas con los índices existentes
+        """
+        database = conn.get_database()
+        shapes = self.shapes(database.name)
+        names = collection_names if collection_names is not None else sorted({shape.collection_name for shape in shapes})
+        returnValue = Index_Report(database_name=database.name, queries=sum(count for count, _ in shapes.values()))
+        for collection_name in names:
+            collection = database[collection_name]
+            indexes = {index["name"]: list(index["key"].items()) for index in collection.list_indexes()}
+            collection_shapes = {shape: stats for shape, stats in shapes.items() if shape.collection_name == collection_name}
+            uncovered = {}
+            for shape, (count, total_time) in collection_shapes.items():
+                if any(covers(keys, shape) for keys in indexes.values()):
+                    returnValue.covered_queries += count
+                else:
+                    uncovered[shape] = (count, total_time)
+            returnValue.missing.extend(self._suggest(collection_name, uncovered))
+            accesses = _index_accesses(collection)
+            for name, keys in indexes.items():
+                if name == "_id_":
+                    continue
+                queries = sum(count for shape, (count, _) in collection_shapes.items() if uses(keys, shape))
+                if queries == 0 and not accesses.get(name):
+                    returnValue.unused.append(Unused_Index(collection_name=collection_name, name=name, keys=keys, accesses=accesses.get(name), queries=queries))
+        returnValue.missing.sort(key=lambda suggestion: suggestion.total_time, reverse=True)
+        return returnValue
+
+    @staticmethod
+    def _suggest(collection_name : str, uncovered : dict[Query_Shape, tuple[int, float]]) -> list[Index_Suggestion]:
+        # Se elige primero el índice que cubre más consultas; las que cubre ya no cuentan para los siguientes
+        candidates = {tuple(suggested_keys(shape)) for shape in uncovered}
+        returnValue = []
+        while uncovered and candidates:
+            best = max(candidates, key=lambda keys: sum(count for shape, (count, _) in uncovered.items() if covers(list(keys), shape)))
+            covered = [shape for shape in uncovered if covers(list(best), shape)]
+            candidates.discard(best)
+            if not covered:
+                continue
+            returnValue.append(Index_Suggestion(
+                collection_name=collection_name,
+                keys=list(best),
+                queries=sum(uncovered[shape][0] for shape in covered),
+                shapes=len(covered),
+                total_time=sum(uncovered[shape][1] for shape in covered)
+            ))
+            for shape in covered:
+                del uncovered[shape]
+        return returnValue
+
+def _index_accesses(collection : Any) -> dict[str, int]:
+    # $indexStats requiere permisos y un servidor real; sin él no se informan los usos
+    try:
+        return {stats["name"]: int(stats["accesses"]["ops"]) for stats in collection.aggregate([{"$indexStats": {}}])}
+    except Exception:
+        return {}
@@ -0,0 +1,175 @@
+import logging
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable, NamedTuple
+from pydantic import BaseModel
+
+# Logger del módulo; "print_data" envía aquí (nivel DEBUG) la información de cada operación
+logger = logging.getLogger("fracturex_module_database")
+
+# Límites superiores (en segundos) de los buckets del histograma de latencia
+LATENCY_BUCKETS: tuple[float, ...] = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class Operation_Event(NamedTuple):
+    """
+    Evento emitido al terminar cada operación CRUD
+    """
+    backend: str
+    operation: str
+    duration: float
+    rows: int | None = None
+    bytes: int | None = None
+    error: str | None = None
+    # Consulta ejecutada (texto SQL, o filtro/pipeline de MongoDB), sus parámetros y la conexión usada; solo en las operaciones que los informan
+    statement: Any = None
+    parameters: Any = None
+    conn: Any = None
+
+_subscribers: tuple[Callable[[Operation_Event], None], ...] = ()
+_subscribers_lock = threading.Lock()
+
+def subscribe(callback : Callable[[Operation_Event], None]) -> Callable[[], None]:
+    """
+    Función para recibir un Operation_Event por cada operación CRUD
+
+    Parameters
+    ----------
+    callback : Callable[[Operation_Event], None]
+        Función llamada de forma síncrona en el hilo que ejecutó la operación; debe ser rápida
+
+    Returns
+    -------
+    Callable[[], None]
+        Función para cancelar la suscripción
+    """
+    global _subscribers
+    with _subscribers_lock:
+        if callback not in _subscribers:
+            _subscribers = _subscribers + (callback,)
+    return lambda: unsubscribe(callback)
+
+def unsubscribe(callback : Callable[[Operation_Event], None]) -> None:
+    global _subscribers
+    with _subscribers_lock:
+        _subscribers = tuple(subscriber for subscriber in _subscribers if subscriber != callback)
+
+def start() -> float | None:
+    """
+    Función para marcar el inicio de una operación. Retorna None si nadie está suscrito, para no medir
+    """
+    return time.perf_counter() if _subscribers else None
+
+def emit(backend : str, operation : str, started : float, rows : int | None = None, bytes : int | None = None, error : BaseException | None = None, statement : Any = None, parameters : Any = None, conn : Any = None) -> None:
+    event = Operation_Event(
+        backend=backend,
+        operation=operation,
+        duration=time.perf_counter() - started,
+        rows=rows,
+        bytes=bytes,
+        error=type(error).__name__ if error is not None else None,
+        statement=statement,
+        parameters=parameters,
+        conn=conn
+    )
+    for subscriber in _subscribers:
+        try:
+            subscriber(event)
+        except Exception:
+            logger.exception("Error en un suscriptor de instrumentación")
+
+class _Histogram:
+    __slots__ = ("buckets", "count", "sum", "errors", "rows", "bytes")
+
+    def __init__(self) -> None:
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.errors = 0
+        self.rows = 0
+        self.bytes = 0
+
+class Metrics_Collector:
+    """
+    Suscriptor que acumula histogramas de latencia y contadores por (backend, operación)
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._histograms: dict[tuple[str, str], _Histogram] = {}
+
+    def __call__(self, event : Operation_Event) -> None:
+        key = (event.backend, event.operation)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = _Histogram()
+            histogram.buckets[bisect_left(LATENCY_BUCKETS, event.duration)] += 1
+            histogram.count += 1
+            histogram.sum += event.duration
+            if event.error is not None:
+                histogram.errors += 1
+            if event.rows is not None:
+                histogram.rows += event.rows
+            if event.bytes is not None:
+                histogram.bytes += event.bytes
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+    def render_prometheus(self) -> str:
+        """
+        Función para retornar las métricas en el formato de texto de Prometheus
+        """
+        lines = [
+            "# HELP fracturex_database_operation_duration_seconds Duración de las operaciones CRUD",
+            "# TYPE fracturex_database_operation_duration_seconds histogram"
+        ]
+        counters: list[tuple[str, str, int]] = []
+        with self._lock:
+            for (backend, operation), histogram in sorted(self._histograms.items()):
+                labels = f'backend="{backend}",operation="{operation}"'
+                cumulative = 0
+                for bound, bucket in zip(LATENCY_BUCKETS + (float("inf"),), histogram.buckets):
+                    cumulative += bucket
+                    lines.append(f'fracturex_database_operation_duration_seconds_bucket{{{labels},le="{"+Inf" if bound == float("inf") else bound}"}} {cumulative}')
+                lines.append(f"fracturex_database_operation_duration_seconds_sum{{{labels}}} {histogram.sum}")
+                lines.append(f"fracturex_database_operation_duration_seconds_count{{{labels}}} {histogram.count}")
+                counters.append(("errors", labels, histogram.errors))
+                counters.append(("rows", labels, histogram.rows))
+                counters.append(("bytes", labels, histogram.bytes))
+        for name, description in (("errors", "Operaciones CRUD fallidas"), ("rows", "Filas/documentos retornados o afectados"), ("bytes", "Bytes de consulta enviados")):
+            lines.append(f"# HELP fracturex_database_operation_{name}_total {description}")
+            lines.append(f"# TYPE fracturex_database_operation_{name}_total counter")
+            lines.extend(f"fracturex_database_operation_{name}_total{{{labels}}} {value}" for counter, labels, value in counters if counter == name)
+        return "\n".join(lines) + "\n"
+
+def render_model_metrics(prefix : str, samples : list[tuple[str, BaseModel]]) -> str:
+    """
+    Función para exponer como gauges de Prometheus los campos numéricos de modelos de estadísticas
+
+    Parameters
+    ----------
+    prefix : str
+        Prefijo de los nombres de las métricas
+    samples : list[tuple[str, BaseModel]]
+        Pares (labels ya formateados, por ejemplo 'database_config_key="main"', modelo)
+    """
+    lines: list[str] = []
+    fields = [name for name, field in type(samples[0][1]).model_fields.items() if field.annotation in (int, float)] if samples else []
+    for field in fields:
+        lines.append(f"# TYPE {prefix}_{field} gauge")
+        for labels, sample in samples:
+            lines.append(f"{prefix}_{field}{{{labels}}} {getattr(sample, field)}" if labels else f"{prefix}_{field} {getattr(sample, field)}")
+    return "\n".join(lines) + "\n" if lines else ""
+
+# Colector de métricas del proceso; se activa con "enable_metrics"
+metrics: Metrics_Collector = Metrics_Collector()
+
+def enable_metrics() -> Metrics_Collector:
+    subscribe(metrics)
+    return metrics
+
+def disable_metrics() -> None:
+    unsubscribe(metrics)
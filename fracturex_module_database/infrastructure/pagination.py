@@ -0,0 +1,130 @@
+"""
+Paginación por llave (keyset) de `select`: en lugar de OFFSET/skip cada página continúa después de los
+valores de la llave del último registro, por lo que su costo no crece con la profundidad de la página.
+
+Los valores se guardan en un token opaco (JSON en base64) junto con una huella de la consulta, para
+rechazar tokens generados por otra consulta.
+"""
+import base64
+import hashlib
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+from uuid import UUID
+
+def fingerprint(*parts : Any) -> str:
+    """
+    Función para obtener la huella de una consulta (texto, filtros, llave y orden)
+    """
+    return hashlib.sha1(json.dumps(parts, default=str, separators=(",", ":")).encode()).hexdigest()[:16]
+
+def _encode_value(value : Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, datetime):
+        return {"$dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"$date": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"$dec": str(value)}
+    if isinstance(value, UUID):
+        return {"$uuid": str(value)}
+    if type(value).__name__ == "ObjectId":
+        return {"$oid": str(value)}
+    raise ValueError(f"Tipo no admitido en la llave de paginación: {type(value).__name__}")
+
+def _decode_value(value : Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    # Solo se aceptan valores simples: un token manipulado no puede inyectar operadores de MongoDB
+    if isinstance(value, dict) and len(value) == 1:
+        (tag, text), = value.items()
+        if isinstance(text, str):
+            if tag == "$dt":
+                return datetime.fromisoformat(text)
+            if tag == "$date":
+                return date.fromisoformat(text)
+            if tag == "$dec":
+                return Decimal(text)
+            if tag == "$uuid":
+                return UUID(text)
+            if tag == "$oid":
+                from bson import ObjectId
+                return ObjectId(text)
+    raise ValueError("Token de página inválido")
+
+def encode_token(query_fingerprint : str, values : tuple) -> str:
+    """
+    Función para construir el token de la página siguiente a partir de la llave del último registro
+    """
+    data = json.dumps({"f": query_fingerprint, "k": [_encode_value(value) for value in values]}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+def decode_token(token : str, query_fingerprint : str, size : int) -> tuple:
+    """
+    Función para obtener los valores de la llave guardados en un token
+
+    Raises
+    ------
+    ValueError
+        Si el token no es válido o se generó para otra consulta
+    """
+    try:
+        data = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        values = data["k"]
+        token_fingerprint = data["f"]
+    except (ValueError, TypeError, KeyError):
+        raise ValueError("Token de página inválido") from None
+    if token_fingerprint != query_fingerprint:
+        raise ValueError("El token de página corresponde a otra consulta")
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Token de página inválido")
+    return tuple(_decode_value(value) for value in values)
+
+def mongodb_keyset_filter(keyset : list[str], descending : bool, after : tuple) -> dict:
+    """
+    Función para construir el filtro de MongoDB de los documentos posteriores a "after"
+
+    (k1 > v1) OR (k1 = v1 AND k2 > v2) OR ...
+    """
+    operator = "$lt" if descending else "$gt"
+    branches = []
+    for index, key in enumerate(keyset):
+        branch = {previous: after[position] for position, previous in enumerate(keyset[:index])}
+        branch[key] = {operator: after[index]}
+        branches.append(branch)
+    return branches[0] if len(branches) == 1 else {"$or": branches}
+
+def mongodb_keys(keyset : list[str]) -> list[str]:
+    """
+    Función para obtener los campos de la llave de MongoDB, con "_id" al final para desempatar
+    """
+    return keyset if "_id" in keyset else [*keyset, "_id"]
+
+def include_fields(projection : dict | None, fields : list[str]) -> dict | None:
+    """
+    Función para asegurar que una proyección de MongoDB incluya los campos de la llave
+    """
+    if not projection:
+        return projection
+    projection = dict(projection)
+    inclusion = any(value not in (0, False) for field, value in projection.items() if field != "_id")
+    for field in fields:
+        if inclusion or field == "_id":
+            projection[field] = 1
+        else:
+            projection.pop(field, None)
+    return projection
+
+def document_key(document : dict, fields : list[str]) -> tuple:
+    """
+    Función para obtener los valores de la llave de un documento (admite rutas con ".")
+    """
+    values = []
+    for field in fields:
+        value: Any = document
+        for part in field.split("."):
+            value = value.get(part) if isinstance(value, dict) else None
+        values.append(value)
+    return tuple(values)
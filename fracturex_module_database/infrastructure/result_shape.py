@@ -0,0 +1,146 @@
+import re
+from array import array
+from functools import lru_cache
+from typing import Any, Iterable, Sequence
+
+from fracturex_module_database.model.result_format import (
+    Result_Format,
+    Tabular_Result
+)
+
+# Caracteres que NamedTupleCursor reemplaza por "_" en los nombres de columna
+_CLEAN_COLUMN = re.compile("[" + re.escape(" !\"#$%&'()*+,-./:;<=>?@[\\]^`{|}~") + "]")
+
+@lru_cache(maxsize=512)
+def column_keys(names : tuple[str, ...]) -> tuple[str, ...]:
+    """
+    Función para obtener las llaves de los registros a partir de los nombres de columna
+
+    Se normalizan igual que lo hacía NamedTupleCursor, para conservar las llaves de los diccionarios
+    que retornaba `select` (por ejemplo "?column?" -> "f_column_").
+    """
+    keys: list[str] = []
+    for name in names:
+        key = _CLEAN_COLUMN.sub("_", name)
+        if not key or key[0] == "_" or "0" <= key[0] <= "9":
+            key = "f" + key
+        keys.append(key)
+    if len(set(keys)) != len(keys):
+        raise ValueError(f"La consulta retorna nombres de columna duplicados: {list(names)}")
+    return tuple(keys)
+
+def _typecode(values : list[Any]) -> str | None:
+    # Tipo de array.array para una columna numérica sin nulos, o None si la columna no es numérica
+    typecode = None
+    for value in values:
+        value_type = type(value)
+        if value_type is float:
+            typecode = "d"
+        elif value_type is int:
+            typecode = typecode or "q"
+        else:
+            return None
+    return typecode
+
+def _to_array(values : list[Any]) -> array | list[Any]:
+    typecode = _typecode(values)
+    if typecode is None:
+        return values
+    try:
+        return array(typecode, values)
+    except OverflowError:
+        # Enteros que no caben en 64 bits
+        return values
+
+def _to_numpy(values : list[Any]) -> Any:
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError("Result_Format.NUMPY requiere tener numpy instalado") from e
+    typecode = _typecode(values)
+    if typecode is not None:
+        try:
+            return numpy.array(values, dtype=numpy.float64 if typecode == "d" else numpy.int64)
+        except OverflowError:
+            pass
+    returnValue = numpy.empty(len(values), dtype=object)
+    returnValue[:] = values
+    return returnValue
+
+def shape_rows(columns : Sequence[str], rows : list[tuple], result_format : Result_Format = Result_Format.RECORDS) -> list[dict] | Tabular_Result | dict[str, Any]:
+    """
+    Función para construir el resultado de una consulta en el formato pedido
+
+    Parameters
+    ----------
+    columns : Sequence[str]
+        Llaves de las columnas (ver "column_keys")
+    rows : list[tuple]
+        Registros, como tuplas en el orden de "columns"
+    result_format : Result_Format = Result_Format.RECORDS
+        Formato del resultado
+
+    Returns
+    -------
+    list[dict]
+        Result_Format.RECORDS
+    Tabular_Result
+        Result_Format.TUPLES
+    dict[str, list | array.array | numpy.ndarray]
+        Result_Format.COLUMNAR, Result_Format.ARRAY y Result_Format.NUMPY
+    """
+    if result_format is Result_Format.RECORDS:
+        return [dict(zip(columns, row)) for row in rows]
+    if result_format is Result_Format.TUPLES:
+        return Tabular_Result(columns=list(columns), rows=rows)
+    values: Iterable[list[Any]] = map(list, zip(*rows)) if rows else ([] for _ in columns)
+    if result_format is Result_Format.ARRAY:
+        values = map(_to_array, values)
+    elif result_format is Result_Format.NUMPY:
+        values = map(_to_numpy, values)
+    return dict(zip(columns, values))
+
+def projection_columns(projection : dict | None) -> list[str] | None:
+    """
+    Función para obtener las columnas de una proyección de MongoDB de inclusión (None si no la hay o es de exclusión)
+    """
+    if not projection:
+        return None
+    columns = [field for field, value in projection.items() if field != "_id" and value not in (0, False)]
+    if not columns:
+        return None
+    # "_id" se incluye salvo que se excluya explícitamente
+    if projection.get("_id", 1) not in (0, False):
+        columns.insert(0, "_id")
+    return columns
+
+def _get_path(document : dict, path : str) -> Any:
+    value: Any = document
+    for part in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+def shape_documents(documents : list[dict], result_format : Result_Format = Result_Format.RECORDS, columns : list[str] | None = None) -> list[dict] | Tabular_Result | dict[str, Any]:
+    """
+    Función para construir el resultado de una consulta de MongoDB en el formato pedido
+
+    Parameters
+    ----------
+    documents : list[dict]
+        Documentos retornados por la consulta
+    result_format : Result_Format = Result_Format.RECORDS
+        Formato del resultado
+    columns : list[str] | None = None
+        Campos a usar como columnas (admite rutas con "."). Por defecto todos los campos, en el orden en que aparecen
+    """
+    if result_format is Result_Format.RECORDS:
+        return documents
+    if columns is None:
+        columns = list(dict.fromkeys(field for document in documents for field in document))
+    if any("." in column for column in columns):
+        rows = [tuple(_get_path(document, column) for column in columns) for document in documents]
+    else:
+        rows = [tuple(map(document.get, columns)) for document in documents]
+    return shape_rows(columns, rows, result_format)
@@ -0,0 +1,180 @@
+"""
+Serialización de resultados a JSON (bytes) para respuestas HTTP
+
+Los tipos que retornan los motores y que el módulo json no conoce (datetime, Decimal, UUID, ObjectId,
+memoryview, array, numpy, ...) se convierten con una tabla de despacho por tipo, sin recorrer los
+registros por separado. Por defecto se usa el módulo json; si orjson está instalado (extra
+`fracturex-module-database[orjson]`) se usa como codificador y resuelve de forma nativa datetime, date,
+time, UUID y numpy.
+"""
+from __future__ import annotations
+
+import base64
+import json
+from array import array
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Callable, Iterable, Iterator
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from fracturex_module_database.model.page import Page
+from fracturex_module_database.model.result_format import Tabular_Result
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Enteros que orjson puede escribir (64 bits con signo); fuera de ese rango se usa texto con ambos codificadores
+_INT_MIN = -2 ** 63
+_INT_MAX = 2 ** 63 - 1
+
+def _decimal(value : Decimal) -> int | float | str:
+    # Igual que fastapi.encoders: entero si no tiene decimales (por ejemplo numeric(30,0) o SUM(bigint) puede no caber en 64 bits)
+    if value.as_tuple().exponent >= 0:
+        integer = int(value)
+        return integer if _INT_MIN <= integer <= _INT_MAX else str(integer)
+    return float(value)
+
+def _bytes(value : bytes | bytearray | memoryview) -> str:
+    return base64.b64encode(value).decode("ascii")
+
+# Conversión por tipo exacto de los valores que el codificador no resuelve por sí mismo
+_ENCODERS: dict[type, Callable[[Any], Any]] = {
+    Decimal: _decimal,
+    datetime: datetime.isoformat,
+    date: date.isoformat,
+    time: time.isoformat,
+    timedelta: timedelta.total_seconds,
+    UUID: str,
+    bytes: _bytes,
+    bytearray: _bytes,
+    memoryview: _bytes,
+    set: list,
+    frozenset: list,
+    array: array.tolist,
+    Page: lambda page: {"rows": page.rows, "next_page_token": page.next_page_token},
+    Tabular_Result: lambda result: {"columns": result.columns, "rows": result.rows}
+}
+
+def register_encoder(value_type : type, encoder : Callable[[Any], Any]) -> None:
+    """
+    Función para definir cómo se serializa un tipo (también reemplaza la conversión de los tipos incluidos, por ejemplo Decimal -> str)
+
+    Parameters
+    ----------
+    value_type : type
+        Tipo a convertir (las subclases usan la conversión de la clase base si no tienen una propia)
+    encoder : Callable[[Any], Any]
+        Función que retorna un valor serializable a JSON
+    """
+    _ENCODERS[value_type] = encoder
+
+def default(value : Any) -> Any:
+    """
+    Función "default" de json/orjson con la tabla de despacho por tipo
+    """
+    encoder = _ENCODERS.get(type(value))
+    if encoder is not None:
+        return encoder(value)
+    # Tipos de módulos opcionales: se registran la primera vez que aparecen
+    module = type(value).__module__.split(".", 1)[0]
+    if module == "bson" and type(value).__name__ == "ObjectId":
+        _ENCODERS[type(value)] = str
+        return str(value)
+    if module == "numpy":
+        return value.tolist()
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, Enum):
+        return value.value
+    for base in type(value).__mro__[1:]:
+        encoder = _ENCODERS.get(base)
+        if encoder is not None:
+            _ENCODERS[type(value)] = encoder
+            return encoder(value)
+    if isinstance(value, tuple) and hasattr(value, "_asdict"):
+        return value._asdict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+if orjson is not None:
+    _OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def dumps(value : Any) -> bytes:
+        """
+        Función para serializar un valor a JSON (bytes, UTF-8)
+        """
+        return orjson.dumps(value, default=default, option=_OPTIONS)
+else:
+    _encoder = json.JSONEncoder(default=default, ensure_ascii=False, separators=(",", ":"))
+    _SCALARS = frozenset({str, int, float, bool, type(None)})
+
+    def _plain(value : Any) -> Any:
+        # json escribe las subclases de tuple (Page, Tabular_Result y otras NamedTuple) como listas sin llamar a
+        # "default", mientras que orjson sí lo llama: se convierten antes, en cualquier nivel, para que ambos
+        # codificadores den el mismo JSON. Las listas y diccionarios sin cambios no se copian
+        value_type = type(value)
+        if value_type in _SCALARS:
+            return value
+        if value_type is list or value_type is tuple:
+            returnValue = None
+            for index, item in enumerate(value):
+                converted = _plain(item)
+                if converted is not item:
+                    if returnValue is None:
+                        returnValue = list(value)
+                    returnValue[index] = converted
+            return value if returnValue is None else returnValue
+        if value_type is dict:
+            returnValue = None
+            for key, item in value.items():
+                converted = _plain(item)
+                if converted is not item:
+                    if returnValue is None:
+                        returnValue = dict(value)
+                    returnValue[key] = converted
+            return value if returnValue is None else returnValue
+        if isinstance(value, tuple) and (value_type in _ENCODERS or hasattr(value, "_asdict")):
+            return _plain(default(value))
+        return value
+
+    def dumps(value : Any) -> bytes:
+        """
+        Función para serializar un valor a JSON (bytes, UTF-8)
+        """
+        return _encoder.encode(_plain(value)).encode()
+
+def encode_response(data : Any, success : bool = True, message : str = "") -> bytes:
+    """
+    Función para serializar un resultado con la forma de HTTP_Response ({"success", "message", "data"})
+    """
+    return b'{"success":' + (b"true" if success else b"false") + b',"message":' + dumps(message) + b',"data":' + dumps(data) + b"}"
+
+def iter_response(rows : Iterable[Any], success : bool = True, message : str = "", chunk_size : int = 1000) -> Iterator[bytes]:
+    """
+    Función para serializar por partes un resultado con la forma de HTTP_Response, sin materializar todos los registros
+
+    Cada parte contiene hasta "chunk_size" registros de "rows" (por ejemplo, el iterador de "select_stream").
+    """
+    yield b'{"success":' + (b"true" if success else b"false") + b',"message":' + dumps(message) + b',"data":['
+    chunk: list[Any] = []
+    separator = b""
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            # Se codifica la lista completa (una sola llamada al codificador) y se quitan los corchetes
+            yield separator + dumps(chunk)[1:-1]
+            separator = b","
+            chunk = []
+    if chunk:
+        yield separator + dumps(chunk)[1:-1]
+    yield b"]}"
+
+def backend() -> str:
+    """
+    Función para saber qué codificador se usa ("orjson" o "json")
+    """
+    return "orjson" if orjson is not None else "json"
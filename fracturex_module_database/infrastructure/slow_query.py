@@ -0,0 +1,297 @@
+"""
+Registro de consultas lentas: suscriptor de instrumentación que agrupa por huella (consulta normalizada)
+las operaciones que superan un umbral y, opcionalmente, captura su plan de ejecución
+
+Los planes se obtienen en un hilo aparte con una conexión propia, muestreados y con un límite por
+minuto, para no sumar carga a la base de datos justo cuando está lenta.
+"""
+from __future__ import annotations
+
+import json
+import queue
+import random
+import re
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable
+
+from fracturex_module_database.infrastructure.database.pool import registry
+from fracturex_module_database.infrastructure.database.replica import primary_key
+from fracturex_module_database.infrastructure.instrumentation import (
+    Operation_Event,
+    logger
+)
+from fracturex_module_database.model.database_type import Database_Type
+from fracturex_module_database.model.slow_query_stats import Slow_Query_Stats
+
+if TYPE_CHECKING:
+    from psycopg2.extensions import connection
+    from pymongo import MongoClient
+
+# Literales de SQL que se reemplazan por "?" al normalizar
+_SQL_STRING = re.compile(r"'(?:[^']|'')*'")
+_SQL_NUMBER = re.compile(r"(?<![\w$])-?\d+(?:\.\d+)?(?:e[+-]?\d+)?\b", re.IGNORECASE)
+_SQL_PLACEHOLDER = re.compile(r"%(?:\(\w+\))?s")
+_SQL_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SQL_SPACE = re.compile(r"\s+")
+# Largo máximo del texto de ejemplo guardado por huella
+_SAMPLE_LENGTH = 2000
+
+def fingerprint_sql(query : str) -> str:
+    """
+    Función para normalizar una consulta SQL: literales y parámetros como "?", listas "IN (?, ?, ...)" como "(...)" y espacios colapsados
+    """
+    query = _SQL_STRING.sub("?", query)
+    query = _SQL_PLACEHOLDER.sub("?", query)
+    query = _SQL_NUMBER.sub("?", query)
+    query = _SQL_LIST.sub("(...)", query)
+    return _SQL_SPACE.sub(" ", query).strip().rstrip(";").lower()
+
+def _shape(value : Any) -> Any:
+    # Estructura de un filtro/pipeline de MongoDB con los valores reemplazados por "?"
+    if isinstance(value, dict):
+        return {key: _shape(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        # Las listas de valores ($in, $nin) cuentan como una sola forma
+        shapes = [_shape(item) for item in value]
+        return shapes if any(isinstance(item, (dict, list)) for item in shapes) else "?"
+    return "?"
+
+def fingerprint_mongodb(statement : dict) -> str:
+    """
+    Función para normalizar una consulta de MongoDB: colección, operación y estructura del filtro o pipeline sin valores
+    """
+    if statement.get("pipeline"):
+        return f"{statement['collection']}.aggregate {json.dumps(_shape(statement['pipeline']), separators=(',', ':'))}"
+    text = f"{statement['collection']}.find {json.dumps(_shape(statement.get('filter') or {}), separators=(',', ':'))}"
+    if statement.get("sort"):
+        text += f" sort {json.dumps(statement['sort'], default=str, separators=(',', ':'))}"
+    return text
+
+def parameters_shape(parameters : Any) -> str | None:
+    """
+    Función para describir los parámetros de una consulta sin sus valores (por ejemplo "(int, str, list[3])")
+    """
+    if parameters is None:
+        return None
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{key}: {_type_name(value)}" for key, value in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(map(_type_name, parameters)) + ")"
+    return _type_name(parameters)
+
+def _type_name(value : Any) -> str:
+    if isinstance(value, (list, tuple)):
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
+
+def _sort_document(sort : Any) -> dict[str, Any]:
+    # "sort" de pymongo (llave, lista de pares o lista de documentos) como documento del comando
+    if isinstance(sort, str):
+        return {sort: 1}
+    if isinstance(sort, dict):
+        return dict(sort)
+    returnValue: dict[str, Any] = {}
+    for item in sort:
+        if isinstance(item, dict):
+            returnValue.update(item)
+        elif isinstance(item, (list, tuple)):
+            returnValue[item[0]] = item[1]
+        else:
+            returnValue[item] = 1
+    return returnValue
+
+class _Entry:
+
+    def __init__(self, fingerprint : str, backend : str, operation : str) -> None:
+        self.fingerprint = fingerprint
+        self.backend = backend
+        self.operation = operation
+        self.count = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.rows = 0
+        self.parameters: str | None = None
+        self.sample: str | None = None
+        self.explain: str | None = None
+        self.explained_at = 0.0
+
+class Slow_Query_Log:
+    """
+    Suscriptor de instrumentación que acumula las operaciones que tardan más de `threshold` segundos
+
+    Con `explain` se captura `EXPLAIN (ANALYZE, BUFFERS)` en PostgreSQL (dentro de una transacción que
+    se deshace, por lo que también sirve para update/delete) o `explain` con "executionStats" en MongoDB.
+    Cada huella se explica como máximo una vez cada `explain_interval` segundos y en total
+    `explain_per_minute` veces por minuto, con probabilidad `explain_sample_rate`.
+    """
+
+    def __init__(self, threshold : float = 0.5, explain : bool = False, explain_sample_rate : float = 1.0, explain_interval : float = 300.0, explain_per_minute : int = 6, explain_timeout : float = 10.0, max_entries : int = 1000, log : bool = True, get_connection : Callable[[str], Any] | None = None, release_connection : Callable[[Any], None] | None = None) -> None:
+        self.threshold = threshold
+        self.explain = explain and get_connection is not None
+        self.explain_sample_rate = explain_sample_rate
+        self.explain_interval = explain_interval
+        self.explain_per_minute = explain_per_minute
+        self.explain_timeout = explain_timeout
+        self.max_entries = max_entries
+        self.log = log
+        self._get_connection = get_connection
+        self._release_connection = release_connection
+        self._lock = threading.Lock()
+        self._entries: dict[str, _Entry] = {}
+        # Cubeta de tokens para los EXPLAIN (se recarga a "explain_per_minute" por minuto)
+        self._explain_tokens = float(explain_per_minute)
+        self._explain_refilled = time.monotonic()
+        self._explain_queue: queue.Queue = queue.Queue(maxsize=64)
+        self._worker: threading.Thread | None = None
+
+    def __call__(self, event : Operation_Event) -> None:
+        if event.duration < self.threshold or event.statement is None:
+            return
+        if event.backend == Database_Type.POSTGRESQL.value:
+            if not isinstance(event.statement, str):
+                # Consultas compuestas con psycopg2.sql
+                event = event._replace(statement=event.statement.as_string(event.conn))
+            fingerprint = fingerprint_sql(event.statement)
+        else:
+            fingerprint = fingerprint_mongodb(event.statement)
+        key = f"{event.backend}:{fingerprint}"
+        now = time.monotonic()
+        explain = False
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                if len(self._entries) >= self.max_entries:
+                    # Se descarta la huella con menos tiempo acumulado
+                    del self._entries[min(self._entries, key=lambda item: self._entries[item].total_time)]
+                entry = self._entries[key] = _Entry(fingerprint, event.backend, event.operation)
+                entry.sample = (event.statement if isinstance(event.statement, str) else json.dumps(event.statement, default=str))[:_SAMPLE_LENGTH]
+            entry.count += 1
+            entry.total_time += event.duration
+            entry.max_time = max(entry.max_time, event.duration)
+            entry.rows += event.rows or 0
+            entry.parameters = parameters_shape(event.parameters)
+            if self.explain and event.error is None and now - entry.explained_at >= self.explain_interval and random.random() < self.explain_sample_rate and self._take_explain_token(now):
+                entry.explained_at = now
+                explain = True
+        if self.log:
+            logger.warning("Consulta lenta (%.3f s, %s filas) %s.%s: %s", event.duration, event.rows, event.backend, event.operation, fingerprint)
+        if explain:
+            self._schedule_explain(key, event)
+
+    def _take_explain_token(self, now : float) -> bool:
+        self._explain_tokens = min(float(self.explain_per_minute), self._explain_tokens + (now - self._explain_refilled) * self.explain_per_minute / 60.0)
+        self._explain_refilled = now
+        if self._explain_tokens < 1.0:
+            return False
+        self._explain_tokens -= 1.0
+        return True
+
+    def _schedule_explain(self, key : str, event : Operation_Event) -> None:
+        # Solo se pueden explicar las consultas hechas con conexiones del registro (se usa otra conexión de la misma llave)
+        database_config_key = registry.get_database_config_key(event.conn) if event.conn is not None else None
+        if database_config_key is None:
+            return
+        # Las lecturas en réplicas se explican en el primario (los pools de réplicas no son llaves de configuración)
+        database_config_key = primary_key(database_config_key)
+        try:
+            self._explain_queue.put_nowait((key, event.backend, database_config_key, event.statement, event.parameters))
+        except queue.Full:
+            return
+        if self._worker is None:
+            with self._lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(target=self._run, name="fracturex_slow_query_explain", daemon=True)
+                    self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            job = self._explain_queue.get()
+            if job is None:
+                return
+            key, backend, database_config_key, statement, parameters = job
+            conn = self._get_connection(database_config_key)
+            if conn is None or not hasattr(conn, "cursor") and not hasattr(conn, "get_database"):
+                continue
+            try:
+                if backend == Database_Type.POSTGRESQL.value:
+                    plan = self._explain_postgresql(conn, statement, parameters)
+                else:
+                    plan = self._explain_mongodb(conn, statement)
+            except Exception as e:
+                plan = f"No se pudo obtener el plan: {str(e)}"
+            finally:
+                self._release_connection(conn)
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.explain = plan
+
+    def _explain_postgresql(self, conn : connection, query : str, parameters : Any) -> str:
+        try:
+            with conn.cursor() as mycursor:
+                # ANALYZE ejecuta la consulta: la transacción se deshace y no espera bloqueos de otras transacciones
+                mycursor.execute("SET LOCAL lock_timeout = %s", (f"{int(self.explain_timeout * 1000)}ms",))
+                mycursor.execute("SET LOCAL statement_timeout = %s", (f"{int(self.explain_timeout * 1000)}ms",))
+                mycursor.execute(f"EXPLAIN (ANALYZE, BUFFERS) {query}", parameters or None)
+                return "\n".join(row[0] for row in mycursor.fetchall())
+        finally:
+            conn.rollback()
+
+    def _explain_mongodb(self, conn : MongoClient, statement : dict) -> str:
+        database = conn.get_database()
+        # Se explica la consulta completa: el orden, el límite y la proyección cambian el plan
+        sort = _sort_document(statement["sort"]) if statement.get("sort") else None
+        if statement.get("pipeline"):
+            stages = list(statement["pipeline"])
+            if sort:
+                stages.append({"$sort": sort})
+            if statement.get("skip"):
+                stages.append({"$skip": statement["skip"]})
+            if statement.get("limit"):
+                stages.append({"$limit": statement["limit"]})
+            if statement.get("projection"):
+                stages.append({"$project": statement["projection"]})
+            command = {"aggregate": statement["collection"], "pipeline": stages, "cursor": {}}
+        else:
+            command = {"find": statement["collection"], "filter": statement.get("filter") or {}}
+            if sort:
+                command["sort"] = sort
+            for field in ("skip", "limit", "projection"):
+                if statement.get(field):
+                    command[field] = statement[field]
+        plan = database.command("explain", command, verbosity="executionStats", maxTimeMS=int(self.explain_timeout * 1000))
+        return json.dumps({field: plan.get(field) for field in ("queryPlanner", "executionStats", "stages") if field in plan}, default=str, indent=1)
+
+    def top(self, limit : int = 10, order_by : str = "total_time") -> list[Slow_Query_Stats]:
+        """
+        Función para retornar las huellas con más tiempo acumulado (o según "order_by": "count", "max_time", "mean_time")
+        """
+        with self._lock:
+            stats = [
+                Slow_Query_Stats(
+                    fingerprint=entry.fingerprint,
+                    backend=entry.backend,
+                    operation=entry.operation,
+                    count=entry.count,
+                    total_time=entry.total_time,
+                    mean_time=entry.total_time / entry.count,
+                    max_time=entry.max_time,
+                    rows=entry.rows,
+                    parameters=entry.parameters,
+                    sample=entry.sample,
+                    explain=entry.explain
+                )
+                for entry in self._entries.values()
+            ]
+        return sorted(stats, key=lambda item: getattr(item, order_by), reverse=True)[:limit]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def close(self) -> None:
+        if self._worker is not None:
+            self._explain_queue.put(None)
+            self._worker.join(timeout=self.explain_timeout)
+            self._worker = None
@@ -0,0 +1,284 @@
+from __future__ import annotations
+
+import os
+import pickle
+import shutil
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Iterator
+
+from fracturex_module_database.infrastructure.instrumentation import logger
+from fracturex_module_database.model.database_type import Database_Type
+from fracturex_module_database.model.write_behind import (
+    Overflow_Policy,
+    Write_Behind_Stats
+)
+
+def _read_spill(path : str, quarantine_path : str | None = None) -> Iterator[list]:
+    # El archivo de desborde es una secuencia de listas de registros serializadas con pickle. Un final
+    # ilegible (por ejemplo, el proceso terminó mientras escribía) se trata como fin del archivo; con
+    # "quarantine_path" esos bytes se agregan a ese archivo para revisarlos a mano en lugar de perderlos
+    with open(path, "rb") as file:
+        size = os.fstat(file.fileno()).st_size
+        while True:
+            offset = file.tell()
+            if offset >= size:
+                return
+            try:
+                rows = pickle.load(file)
+            except Exception as e:
+                logger.error("Write_Behind_Buffer: archivo de desborde %s ilegible desde el byte %s: %s", path, offset, str(e))
+                if quarantine_path is not None:
+                    file.seek(offset)
+                    with open(quarantine_path, "ab") as corrupt:
+                        shutil.copyfileobj(file, corrupt)
+                return
+            yield rows
+
+class Write_Behind_Buffer:
+    """
+    Buffer de inserciones diferidas para una tabla/colección: `put` encola y retorna de inmediato, y un
+    hilo propio escribe los registros en lotes de `batch_size` o cuando el más antiguo cumple
+    `flush_interval` segundos en el buffer
+
+    Con más de `max_buffered` registros en memoria se aplica `overflow`: BLOCK espera a que haya lugar
+    (hasta `block_timeout` segundos), DROP descarta el registro y SPILL lo agrega a `spill_path`. Con
+    `spill_path` los lotes que no se pudieron escribir también se guardan en el archivo y se reintentan
+    en cada `flush_interval`, incluso luego de reiniciar el proceso (la entrega es al menos una vez).
+    Si el archivo termina en un registro ilegible (el proceso terminó mientras escribía), esa parte se
+    mueve a `spill_path + ".corrupt"`.
+    """
+
+    def __init__(self, database_config_key : str, target : str, write : Callable[[list], int], batch_size : int = 1000, flush_interval : float = 1.0, max_buffered : int = 100000, overflow : Overflow_Policy = Overflow_Policy.BLOCK, block_timeout : float | None = None, spill_path : str | None = None, database_type : Database_Type | None = None) -> None:
+        if overflow is Overflow_Policy.SPILL and spill_path is None:
+            raise ValueError("Overflow_Policy.SPILL requiere \"spill_path\"")
+        self.database_config_key = database_config_key
+        self.target = target
+        self.database_type = database_type
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffered = max_buffered
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self.spill_path = spill_path
+        self._write = write
+        self._cond = threading.Condition()
+        # Los lotes se escriben de a uno para no competir por conexiones ni desordenar los registros
+        self._write_lock = threading.Lock()
+        self._spill_lock = threading.Lock()
+        self._rows: deque[tuple[float, Any]] = deque()
+        self._closed = False
+        self._spill_checked = 0.0
+        # Estadísticas
+        self.enqueued = 0
+        self.flushed = 0
+        self.failed = 0
+        self.dropped = 0
+        self.spilled = 0
+        self.flushes = 0
+        self.flush_time_total = 0.0
+        self.flush_time_max = 0.0
+        self.queue_delay_max = 0.0
+        self.last_error: str | None = None
+        self.spilled_pending = self._count_spilled()
+        self._thread = threading.Thread(target=self._run, name=f"fracturex_write_behind_{target}", daemon=True)
+        self._thread.start()
+
+    def put(self, row : Any) -> bool:
+        """
+        Función para encolar un registro. Retorna False si se descartó por estar el buffer lleno
+        """
+        with self._cond:
+            if self._closed:
+                raise RuntimeError(f"El buffer de escritura diferida de \"{self.target}\" está cerrado")
+            if len(self._rows) >= self.max_buffered and self.overflow is Overflow_Policy.DROP:
+                self.dropped += 1
+                return False
+            if len(self._rows) >= self.max_buffered and self.overflow is Overflow_Policy.BLOCK:
+                deadline = time.monotonic() + self.block_timeout if self.block_timeout is not None else None
+                while len(self._rows) >= self.max_buffered and not self._closed:
+                    remaining = deadline - time.monotonic() if deadline is not None else None
+                    if remaining is not None and remaining <= 0:
+                        self.dropped += 1
+                        return False
+                    self._cond.wait(remaining)
+                if self._closed:
+                    # close() despertó la espera: el hilo que escribe ya no tomaría este registro
+                    raise RuntimeError(f"El buffer de escritura diferida de \"{self.target}\" está cerrado")
+            self.enqueued += 1
+            spill = len(self._rows) >= self.max_buffered and self.overflow is Overflow_Policy.SPILL
+            if not spill:
+                self._rows.append((time.monotonic(), row))
+                if len(self._rows) >= self.batch_size:
+                    self._cond.notify_all()
+        if spill:
+            try:
+                self._spill([row])
+            except OSError as e:
+                self._record_error(e)
+                with self._cond:
+                    self.dropped += 1
+                return False
+        return True
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._closed:
+                    now = time.monotonic()
+                    if len(self._rows) >= self.batch_size or self._rows and now - self._rows[0][0] >= self.flush_interval:
+                        break
+                    if not self._rows and self.spilled_pending and now - self._spill_checked >= self.flush_interval:
+                        break
+                    self._cond.wait(self._rows[0][0] + self.flush_interval - now if self._rows else self.flush_interval if self.spilled_pending else None)
+                closed = self._closed
+            try:
+                if closed:
+                    # Al cerrar se escribe todo lo pendiente (y se intenta una vez con lo desbordado)
+                    self.flush()
+                    self._drain_spill()
+                elif self._take_and_write() == 0:
+                    self._spill_checked = time.monotonic()
+                    self._drain_spill()
+            except Exception as e:
+                # Un error de E/S (archivo de desborde, disco lleno) no debe detener el hilo: los
+                # productores con Overflow_Policy.BLOCK quedarían esperando para siempre
+                self._record_error(e)
+            if closed:
+                return
+
+    def _take(self) -> list[tuple[float, Any]]:
+        with self._cond:
+            batch = [self._rows.popleft() for _ in range(min(self.batch_size, len(self._rows)))]
+            self._cond.notify_all()
+        return batch
+
+    def _take_and_write(self) -> int:
+        batch = self._take()
+        if batch:
+            self._write_batch([row for _, row in batch], batch[0][0])
+        return len(batch)
+
+    def flush(self) -> int:
+        """
+        Función para escribir de inmediato todos los registros en memoria. Retorna la cantidad escrita
+        """
+        flushed = self.flushed
+        while self._take_and_write():
+            pass
+        return self.flushed - flushed
+
+    def _write_batch(self, rows : list, enqueued_at : float | None, spilled : bool = False) -> bool:
+        with self._write_lock:
+            started = time.perf_counter()
+            error: Exception | None = None
+            try:
+                written = self._write(rows)
+            except Exception as e:
+                error = e
+                written = 0
+            elapsed = time.perf_counter() - started
+        with self._cond:
+            self.flushes += 1
+            self.flush_time_total += elapsed
+            self.flush_time_max = max(self.flush_time_max, elapsed)
+            if enqueued_at is not None:
+                self.queue_delay_max = max(self.queue_delay_max, time.monotonic() - enqueued_at)
+            self.flushed += written
+            if error is None:
+                # Registros rechazados individualmente (por ejemplo, llaves duplicadas): no se reintentan
+                self.failed += len(rows) - written
+            elif self.spill_path is None:
+                self.failed += len(rows)
+            self.last_error = str(error) if error is not None else self.last_error
+        if error is not None:
+            logger.error("Write_Behind_Buffer(%s.%s): %s", self.database_config_key, self.target, str(error))
+            if self.spill_path is not None:
+                try:
+                    self._spill(rows, new=not spilled)
+                except OSError as e:
+                    self._record_error(e)
+                    with self._cond:
+                        self.failed += len(rows)
+        return error is None
+
+    def _record_error(self, error : Exception) -> None:
+        logger.error("Write_Behind_Buffer(%s.%s): %s", self.database_config_key, self.target, str(error))
+        with self._cond:
+            self.last_error = str(error)
+
+    def _spill(self, rows : list, new : bool = True) -> None:
+        with self._spill_lock:
+            with open(self.spill_path, "ab") as file:
+                pickle.dump(rows, file, protocol=pickle.HIGHEST_PROTOCOL)
+            with self._cond:
+                self.spilled += len(rows) if new else 0
+                self.spilled_pending += len(rows)
+
+    def _count_spilled(self) -> int:
+        if self.spill_path is None:
+            return 0
+        return sum(len(rows) for path in (self.spill_path + ".draining", self.spill_path) if os.path.exists(path) for rows in _read_spill(path))
+
+    def _drain_spill(self) -> None:
+        if self.spill_path is None:
+            return
+        draining = self.spill_path + ".draining"
+        with self._spill_lock:
+            # Lo que se desborde mientras tanto va a un archivo nuevo
+            if not os.path.exists(draining):
+                if not os.path.exists(self.spill_path):
+                    return
+                os.replace(self.spill_path, draining)
+        pending: list = []
+        failed = False
+        records = _read_spill(draining, quarantine_path=self.spill_path + ".corrupt")
+        for rows in records:
+            self._unspill(len(rows))
+            pending.extend(rows)
+            while len(pending) >= self.batch_size and not failed:
+                batch, pending = pending[:self.batch_size], pending[self.batch_size:]
+                failed = not self._write_batch(batch, None, spilled=True)
+            if failed:
+                break
+        if failed:
+            # El lote fallido ya volvió al archivo de desborde; el resto vuelve con él
+            for rows in records:
+                self._unspill(len(rows))
+                pending.extend(rows)
+            if pending:
+                self._spill(pending, new=False)
+        elif pending:
+            self._write_batch(pending, None, spilled=True)
+        records.close()
+        os.remove(draining)
+
+    def _unspill(self, count : int) -> None:
+        with self._cond:
+            self.spilled_pending -= count
+
+    def close(self, timeout : float | None = None) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    def stats(self) -> Write_Behind_Stats:
+        with self._cond:
+            return Write_Behind_Stats(
+                database_config_key=self.database_config_key,
+                target=self.target,
+                buffered=len(self._rows),
+                spilled_pending=self.spilled_pending,
+                enqueued=self.enqueued,
+                flushed=self.flushed,
+                failed=self.failed,
+                dropped=self.dropped,
+                spilled=self.spilled,
+                flushes=self.flushes,
+                flush_time_avg=self.flush_time_total / self.flushes if self.flushes else 0.0,
+                flush_time_max=self.flush_time_max,
+                queue_delay_max=self.queue_delay_max,
+                last_error=self.last_error
+            )
@@ -0,0 +1,26 @@
+from typing import Any
+from pydantic import BaseModel
+
+class Bulk_Chunk_Result(BaseModel):
+    index: int
+    size: int
+    inserted_count: int = 0
+    matched_count: int = 0
+    modified_count: int = 0
+    upserted_count: int = 0
+    errors: list[str] = []
+
+class Bulk_Insert_Result(BaseModel):
+    method: str
+    inserted_count: int = 0
+    inserted_ids: list[Any] = []
+    chunks: list[Bulk_Chunk_Result] = []
+
+class Bulk_Write_Result(BaseModel):
+    method: str
+    # Registros que existían (según las llaves), los que cambiaron y los creados por "bulk_upsert"
+    matched_count: int = 0
+    modified_count: int = 0
+    upserted_count: int = 0
+    upserted_ids: list[Any] = []
+    chunks: list[Bulk_Chunk_Result] = []
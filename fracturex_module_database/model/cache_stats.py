@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+
+class Cache_Stats(BaseModel):
+    entries: int = 0
+    bytes: int = 0
+    hits: int = 0
+    misses: int = 0
+    sets: int = 0
+    invalidations: int = 0
+    hit_rate: float = 0.0
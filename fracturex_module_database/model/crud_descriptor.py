@@ -0,0 +1,172 @@
+"""
+Descriptores de operaciones CRUD sin validación
+
+Construir un modelo pydantic (`PostgreSQL.Select`, `MongoDB.Insert`, ...) valida cada campo en cada
+llamada. Para consultas pequeñas y muy frecuentes, `Modelo.descriptor(...)` retorna un objeto con
+`__slots__` y los mismos atributos que el modelo, que `service` acepta en su lugar, sin validación.
+`_replace(...)` (como en namedtuple, ya que hay modelos con un campo "replace") retorna una copia con
+otros valores, por ejemplo nuevos "vars", de modo que el descriptor se arma una vez y se reutiliza.
+
+En el camino más frecuente conviene obtener la clase una vez con `descriptor_class(Modelo)` (evita
+reenviar los argumentos) o reutilizar un descriptor con `_replace`.
+
+Con `set_validation(True)` (o FRACTUREX_MODULE_DATABASE_DEBUG=1 en el .env) los descriptores se validan
+con el modelo al crearlos y en cada `_replace`.
+"""
+from copy import copy
+from typing import Any, ClassVar
+
+from pydantic import BaseModel, ConfigDict
+
+from fracturex_module_database.model.database_type import Database_Type
+
+_MISSING: Any = object()
+# Validar los descriptores con su modelo (None = según FRACTUREX_MODULE_DATABASE_DEBUG, leído al crear la primera clase)
+_validation: bool | None = None
+_descriptor_classes: dict[type, type["Crud_Descriptor"]] = {}
+
+def set_validation(enabled : bool) -> None:
+    """
+    Función para activar o desactivar la validación de los descriptores (modo de depuración)
+
+    Parameters
+    ----------
+    enabled : bool
+        Validar cada descriptor con su modelo pydantic al crearlo y en cada "_replace"
+    """
+    global _validation
+    _validation = enabled
+
+class Crud_Descriptor:
+    """
+    Base de los descriptores: cada modelo tiene una subclase con sus campos como `__slots__`
+    """
+
+    __slots__ = ()
+    model: ClassVar[type[BaseModel]]
+    database_type: ClassVar[Database_Type]
+
+    def model_copy(self, update : dict[str, Any] | None = None, deep : bool = False) -> "Crud_Descriptor":
+        # Compatible con BaseModel.model_copy, para el código que copia la información del CRUD
+        # ("_replace" lo genera "descriptor_class" con los campos del modelo)
+        if deep:
+            # La conexión no se puede copiar (con el modelo pydantic la copia profunda también falla)
+            raise ValueError("Los descriptores no admiten model_copy(deep=True): use _replace con copias de los valores a modificar")
+        return self._replace(**update) if update else self._replace()
+
+    def validate(self) -> BaseModel:
+        """
+        Función para validar el descriptor con su modelo
+
+        Returns
+        -------
+        BaseModel
+            Modelo validado (lanza pydantic.ValidationError si algún valor no es válido)
+        """
+        return self.model(**{name: getattr(self, name) for name in self.__slots__})
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({', '.join(f'{name}={getattr(self, name)!r}' for name in self.__slots__)})"
+
+    def __eq__(self, other : Any) -> bool:
+        return type(other) is type(self) and all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    __hash__ = None
+
+def _validate(descriptor : Crud_Descriptor) -> None:
+    # Los valores se reemplazan por los validados (pydantic puede convertirlos, por ejemplo list -> tuple)
+    model = descriptor.validate()
+    for name in descriptor.__slots__:
+        setattr(descriptor, name, getattr(model, name))
+
+def descriptor_class(model : type[BaseModel]) -> type[Crud_Descriptor]:
+    """
+    Función para obtener (y crear la primera vez) la clase de descriptor de un modelo
+    """
+    returnValue = _descriptor_classes.get(model)
+    if returnValue is not None:
+        return returnValue
+    global _validation
+    if _validation is None:
+        from fracturex_module_database.config.environment import environment
+        _validation = environment.FRACTUREX_MODULE_DATABASE_DEBUG
+    fields = tuple(model.model_fields)
+    defaults: dict[str, Any] = {}
+    parameters: list[str] = []
+    init_lines: list[str] = []
+    replace_lines: list[str] = []
+    for index, (name, field) in enumerate(model.model_fields.items()):
+        if field.is_required():
+            parameters.append(name)
+            init_lines.append(f"  self.{name} = {name}")
+        else:
+            default = field.get_default(call_default_factory=True)
+            defaults[f"_default_{index}"] = default
+            if isinstance(default, (list, dict, set)):
+                # Igual que pydantic, cada instancia recibe su propia copia de los valores por defecto mutables
+                parameters.append(f"{name}=_MISSING")
+                init_lines.append(f"  self.{name} = _copy(_default_{index}) if {name} is _MISSING else {name}")
+            else:
+                parameters.append(f"{name}=_default_{index}")
+                init_lines.append(f"  self.{name} = {name}")
+        replace_lines.append(f"  new.{name} = self.{name} if {name} is _MISSING else {name}")
+    # Se generan "__init__" y "_replace" con los campos como argumentos (igual que dataclasses): un ciclo
+    # sobre los campos costaría tanto como la validación que se quiere evitar
+    source = "\n".join([
+        f"def _create({', '.join(['_cls', *defaults])}):",
+        f" def __init__(self, *, {', '.join(parameters)}):",
+        *init_lines,
+        "  if _validation:",
+        "   _validate(self)",
+        f" def _replace(self, *, {', '.join(f'{name}=_MISSING' for name in fields)}):",
+        "  new = _new(_cls)",
+        *replace_lines,
+        "  if _validation:",
+        "   _validate(new)",
+        "  return new",
+        " return __init__, _replace"
+    ])
+    namespace: dict[str, Any] = {}
+    exec(source, globals(), namespace)
+    returnValue = type(f"{model.__name__}_Descriptor", (Crud_Descriptor,), {
+        "__slots__": fields,
+        "__module__": __name__,
+        "__qualname__": f"{model.__qualname__}_Descriptor",
+        "model": model,
+        "database_type": getattr(model, "database_type", None)
+    })
+    returnValue.__init__, returnValue._replace = namespace["_create"](returnValue, **defaults)
+    returnValue.__init__.__qualname__ = f"{returnValue.__qualname__}.__init__"
+    returnValue._replace.__qualname__ = f"{returnValue.__qualname__}._replace"
+    returnValue._replace.__doc__ = "Función para obtener una copia del descriptor con los valores indicados"
+    _descriptor_classes[model] = returnValue
+    return returnValue
+
+# Nombres usados por el código generado
+_copy = copy
+_new = object.__new__
+
+class Crud_Info(BaseModel):
+    """
+    Base de los modelos con la información de cada operación CRUD
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    @classmethod
+    def descriptor(cls, **values : Any) -> Crud_Descriptor:
+        """
+        Función para crear un descriptor del modelo: mismos campos, sin validación (salvo en modo de depuración)
+
+        Returns
+        -------
+        Crud_Descriptor
+            Objeto que "service" acepta en lugar del modelo; "_replace" retorna una copia con otros valores
+        """
+        return (_descriptor_classes.get(cls) or descriptor_class(cls))(**values)
+
+    def to_descriptor(self) -> Crud_Descriptor:
+        """
+        Función para obtener un descriptor con los valores (ya validados) del modelo
+        """
+        return descriptor_class(type(self))(**{name: getattr(self, name) for name in type(self).model_fields})
@@ -5,3 +5,19 @@ from fracturex_module_database.model.database_type import Database_Type
 class Database_Config(BaseModel):
     type: Database_Type = None
     url: str
+    # Configuración del pool de conexiones
+    pool_min_size: int = 1
+    pool_max_size: int = 10
+    pool_max_idle: float = 300.0
+    pool_timeout: float = 30.0
+    pool_health_check_interval: float = 30.0
+    # Caché de sentencias preparadas por conexión PostgreSQL (0 = desactivada)
+    statement_cache_size: int = 0
+    statement_cache_prepare_threshold: int = 2
+    # Réplicas de lectura PostgreSQL (URLs); "select" las usa en lugar del primario
+    replicas: list[str] = []
+    # Fallos de conexión seguidos tras los que una réplica se excluye, y segundos que dura la primera exclusión
+    replica_max_failures: int = 3
+    replica_ejection_time: float = 10.0
+    # Read preference de MongoDB para "select" (por ejemplo "nearest" o "secondaryPreferred"); None usa la del cliente
+    read_preference: str | None = None
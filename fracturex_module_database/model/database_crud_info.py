@@ -1,70 +1,48 @@
-import psycopg2
-from pydantic import BaseModel, ConfigDict
-from pymongo import MongoClient
+"""
+Modelos con la información de cada operación CRUD
 
-class PostgreSQL(BaseModel):
-    
-    class Insert(BaseModel):
-        conn : psycopg2.extensions.connection
-        query : str
-        vars : tuple
-        model_config = ConfigDict(arbitrary_types_allowed=True)
-    
-    class Select(BaseModel):
-        conn : psycopg2.extensions.connection
-        query : str
-        vars : tuple = None
-        model_config = ConfigDict(arbitrary_types_allowed=True)
-    
-    class Update(BaseModel):
-        conn : psycopg2.extensions.connection
-        query : str
-        vars : tuple
-        model_config = ConfigDict(arbitrary_types_allowed=True)
-    
-    class Delete(BaseModel):
-        conn : psycopg2.extensions.connection
-        query : str
-        vars : tuple = None
-        model_config = ConfigDict(arbitrary_types_allowed=True)
-    
-class MongoDB(BaseModel):
-    
-    class Insert(BaseModel):
-        conn : MongoClient
-        collection_name : str
-        document : dict
-        model_config = ConfigDict(arbitrary_types_allowed=True)
-    
-    class Select(BaseModel):
-        conn : MongoClient
-        collection_name : str
-        query : dict = None
-        aggregate_pipeline : list[dict] = None
-        sort : list[dict[str, int]] = None
-        model_config = ConfigDict(arbitrary_types_allowed=True)
-        
-    class Update(BaseModel):
-        conn : MongoClient
-        collection_name : str
-        query : dict = None
-        update_values : dict
-        model_config = ConfigDict(arbitrary_types_allowed=True)
-        
-    class Delete(BaseModel):
-        conn : MongoClient
-        collection_name : str
-        query : dict = None
-        model_config = ConfigDict(arbitrary_types_allowed=True)
+Los modelos de cada motor viven en su propio módulo y se cargan al pedirlos por primera vez, de modo
+que usar solo PostgreSQL no importa pymongo/bson (y viceversa).
+"""
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
 
-class Insert(BaseModel):
-    info : PostgreSQL.Insert | MongoDB.Insert
+from pydantic import BaseModel, create_model
 
-class Select(BaseModel):
-    info : PostgreSQL.Select | MongoDB.Select
+if TYPE_CHECKING:
+    from fracturex_module_database.model.mongodb_crud_info import MongoDB
+    from fracturex_module_database.model.postgresql_crud_info import PostgreSQL
 
-class Update(BaseModel):
-    info : PostgreSQL.Update | MongoDB.Update
+_ENGINE_MODULES: dict[str, str] = {
+    "PostgreSQL": "fracturex_module_database.model.postgresql_crud_info",
+    "MongoDB": "fracturex_module_database.model.mongodb_crud_info"
+}
+# Modelos que aceptan la información de cualquiera de los motores que soportan la operación
+_WRAPPERS: dict[str, tuple[str, ...]] = {
+    "Insert": ("PostgreSQL", "MongoDB"),
+    "Select": ("PostgreSQL", "MongoDB"),
+    "Update": ("PostgreSQL", "MongoDB"),
+    "Delete": ("PostgreSQL", "MongoDB"),
+    "BulkInsert": ("PostgreSQL", "MongoDB"),
+    "BulkUpdate": ("PostgreSQL", "MongoDB"),
+    "BulkUpsert": ("PostgreSQL", "MongoDB"),
+    "Export": ("PostgreSQL", "MongoDB"),
+    "Notify": ("PostgreSQL",)
+}
 
-class Delete(BaseModel):
-    info : PostgreSQL.Delete | MongoDB.Delete
+def __getattr__(name : str) -> Any:
+    if name in _ENGINE_MODULES:
+        value = getattr(import_module(_ENGINE_MODULES[name]), name)
+    elif name in _WRAPPERS:
+        info = [getattr(__getattr__(engine), name) for engine in _WRAPPERS[name]]
+        annotation = info[0]
+        for model in info[1:]:
+            annotation = annotation | model
+        value = create_model(name, __base__=BaseModel, __module__=__name__, info=(annotation, ...))
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+def __dir__() -> list[str]:
+    return sorted(list(globals()) + list(_ENGINE_MODULES) + list(_WRAPPERS))
@@ -1,7 +1,62 @@
+from __future__ import annotations
+
+import sys
+from typing import TYPE_CHECKING, Any, Iterable
 from pydantic import BaseModel
 
+if TYPE_CHECKING:
+    from fastapi.responses import JSONResponse
+    from starlette.responses import Response, StreamingResponse
+
 class HTTP_Response(BaseModel):
     success: bool
     message: str
     data: list[dict] | dict
-    
\ No newline at end of file
+
+def error_response(message: str, status_code: int = 500) -> JSONResponse:
+    """
+    Función para construir la respuesta JSON de error retornada por las operaciones CRUD
+    """
+    # "fastapi.responses.JSONResponse" es la misma clase de starlette; importarla desde fastapi carga todo el framework
+    from starlette.responses import JSONResponse
+    return JSONResponse(status_code=status_code, content=HTTP_Response(success=False, message=message, data={}).model_dump())
+
+def success_response(data: Any, message: str = "", status_code: int = 200) -> Response:
+    """
+    Función para construir la respuesta JSON de un resultado (por ejemplo, de "select") con la forma de HTTP_Response
+
+    Los registros se serializan directamente a bytes (con orjson si está instalado), sin validar un HTTP_Response ni recorrerlos para convertir ObjectId, datetime, Decimal, UUID, etc.
+    """
+    from starlette.responses import Response
+
+    from fracturex_module_database.infrastructure.serialization import encode_response
+    return Response(content=encode_response(data, message=message), status_code=status_code, media_type="application/json")
+
+def streaming_response(rows: Iterable[Any], message: str = "", chunk_size: int = 1000, status_code: int = 200) -> StreamingResponse:
+    """
+    Función para construir una respuesta JSON con la forma de HTTP_Response que se envía por partes (chunked) a medida que se leen los registros
+
+    Pensada para el iterador de "select_stream": la memoria usada depende de "chunk_size" y no del total de registros.
+    """
+    from starlette.responses import StreamingResponse
+
+    from fracturex_module_database.infrastructure.serialization import iter_response
+    return StreamingResponse(iter_response(rows, message=message, chunk_size=chunk_size), status_code=status_code, media_type="application/json")
+
+def error_message(response: JSONResponse) -> str:
+    """
+    Función para obtener el mensaje de una respuesta construida con "error_response"
+    """
+    import json
+    try:
+        return json.loads(response.body)["message"]
+    except (ValueError, KeyError, TypeError):
+        return response.body.decode(errors="replace")
+
+def is_error_response(value: Any) -> bool:
+    """
+    Función para saber si el valor retornado por una operación es una respuesta JSON de error, sin importar fastapi
+    """
+    # Otro hilo puede estar importando el módulo (aún sin JSONResponse): en ese caso no existe ninguna instancia
+    response_class = getattr(sys.modules.get("starlette.responses"), "JSONResponse", None)
+    return response_class is not None and isinstance(value, response_class)
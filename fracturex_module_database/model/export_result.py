@@ -0,0 +1,16 @@
+from enum import Enum
+from pydantic import BaseModel
+
+class Export_Format(Enum):
+    # Formatos de "COPY ... TO STDOUT" de PostgreSQL
+    CSV         = "csv"
+    TEXT        = "text"
+    BINARY      = "binary"
+    # Documentos BSON concatenados (formato de mongodump), en MongoDB
+    BSON        = "bson"
+
+class Export_Result(BaseModel):
+    format: Export_Format
+    rows: int | None = None
+    # Bytes escritos en el archivo (None si el archivo no permite "tell")
+    bytes: int | None = None
@@ -0,0 +1,27 @@
+from enum import Enum
+from typing import Any
+from pydantic import BaseModel
+
+class Merge_Strategy(Enum):
+    # Registros de cada base de datos, uno tras otro en el orden de las llaves
+    CONCAT      = "CONCAT"
+    # Mezcla ordenada (k-way) por "sort_key" de los registros de todas las bases de datos
+    SORTED      = "SORTED"
+    # Los primeros "limit" registros en llegar; las consultas restantes se cancelan
+    FIRST_N     = "FIRST_N"
+
+class Shard_Result(BaseModel):
+    database_config_key: str
+    success: bool = False
+    row_count: int = 0
+    elapsed: float = 0.0
+    timed_out: bool = False
+    cancelled: bool = False
+    error: str | None = None
+
+class Fan_Out_Result(BaseModel):
+    rows: list[Any] = []
+    shards: list[Shard_Result] = []
+    elapsed: float = 0.0
+    # Alguna base de datos falló o no respondió a tiempo (las canceladas por FIRST_N no cuentan)
+    partial: bool = False
@@ -0,0 +1,25 @@
+from abc import ABC, abstractmethod
+from typing import Iterable
+
+class ICache_Backend(ABC):
+    @abstractmethod
+    def get(self, key: str) -> bytes | None:
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl: float | None, tags: Iterable[str]) -> None:
+        pass
+
+    @abstractmethod
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        pass
+
+    def size(self) -> tuple[int, int]:
+        """
+        Cantidad de entradas y bytes almacenados, si el backend puede reportarlos
+        """
+        return (0, 0)
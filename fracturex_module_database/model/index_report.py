@@ -0,0 +1,43 @@
+from typing import Any
+from pydantic import BaseModel
+
+class Index_Spec(BaseModel):
+    collection_name: str
+    # Campos y dirección (1, -1, "text", "hashed", "2dsphere", ...) en orden
+    keys: list[tuple[str, int | str]]
+    name: str | None = None
+    unique: bool = False
+    sparse: bool = False
+    expire_after_seconds: int | None = None
+    partial_filter_expression: dict | None = None
+
+class Index_Suggestion(BaseModel):
+    collection_name: str
+    keys: list[tuple[str, int]]
+    # Consultas registradas (y formas distintas) que el índice cubriría, y su tiempo acumulado en segundos
+    queries: int = 0
+    shapes: int = 0
+    total_time: float = 0.0
+
+class Unused_Index(BaseModel):
+    collection_name: str
+    name: str
+    keys: list[tuple[str, Any]]
+    # Usos informados por $indexStats desde el inicio del servidor (None si no está disponible)
+    accesses: int | None = None
+    queries: int = 0
+
+class Index_Report(BaseModel):
+    database_name: str
+    queries: int = 0
+    covered_queries: int = 0
+    missing: list[Index_Suggestion] = []
+    unused: list[Unused_Index] = []
+
+class Ensure_Indexes_Result(BaseModel):
+    created: list[str] = []
+    existing: list[str] = []
+    # Índices con las mismas llaves o nombre pero distintas opciones; no se modifican
+    conflicts: list[str] = []
+    # Consultas registradas por el asesor de índices que cubre cada índice de la especificación
+    queries: dict[str, int] = {}
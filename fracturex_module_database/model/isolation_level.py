@@ -0,0 +1,7 @@
+from enum import Enum
+
+class Isolation_Level(Enum):
+    # Los valores se usan tal cual en "SET TRANSACTION ISOLATION LEVEL"
+    READ_COMMITTED  = "READ COMMITTED"
+    REPEATABLE_READ = "REPEATABLE READ"
+    SERIALIZABLE    = "SERIALIZABLE"
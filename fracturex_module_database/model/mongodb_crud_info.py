@@ -0,0 +1,80 @@
+from typing import Any, ClassVar
+from pydantic import BaseModel
+from pymongo import MongoClient
+
+from fracturex_module_database.model.crud_descriptor import Crud_Info
+from fracturex_module_database.model.database_type import Database_Type
+from fracturex_module_database.model.index_report import Index_Spec
+from fracturex_module_database.model.result_format import Result_Format
+
+class _MongoDB_Info(Crud_Info):
+    database_type : ClassVar[Database_Type] = Database_Type.MONGODB
+
+class MongoDB(BaseModel):
+    
+    class Insert(_MongoDB_Info):
+        conn : MongoClient
+        collection_name : str
+        document : dict
+    
+    class Select(_MongoDB_Info):
+        conn : MongoClient
+        collection_name : str
+        query : dict = None
+        aggregate_pipeline : list[dict] = None
+        sort : list[dict[str, int]] = None
+        projection : dict = None
+        result_format : Result_Format = Result_Format.RECORDS
+        limit : int | None = None
+        skip : int | None = None
+        batch_size : int | None = None
+        # Paginación por llave: campos por los que se ordena ("_id" se agrega para desempatar)
+        keyset : list[str] | None = None
+        descending : bool = False
+        page_size : int | None = None
+        page_token : str | None = None
+        
+    class Update(_MongoDB_Info):
+        conn : MongoClient
+        collection_name : str
+        query : dict = None
+        update_values : dict
+        
+    class Delete(_MongoDB_Info):
+        conn : MongoClient
+        collection_name : str
+        query : dict = None
+        
+    class BulkInsert(_MongoDB_Info):
+        conn : MongoClient
+        collection_name : str
+        documents : list[dict]
+        chunk_size : int = 1000
+        
+    class BulkUpdate(_MongoDB_Info):
+        conn : MongoClient
+        collection_name : str
+        documents : list[dict]
+        # Campos de cada documento que identifican el registro; los demás se asignan con "$set"
+        key_fields : list[str] = ["_id"]
+        # Reemplazar el documento completo en lugar de asignar sus campos
+        replace : bool = False
+        chunk_size : int = 1000
+        
+    class BulkUpsert(BulkUpdate):
+        pass
+        
+    class Export(_MongoDB_Info):
+        conn : MongoClient
+        collection_name : str
+        # Objeto con "write" (archivo binario, io.BytesIO, mmap.mmap, ...) donde se escriben los documentos BSON
+        file : Any
+        query : dict = None
+        aggregate_pipeline : list[dict] = None
+        sort : list[dict[str, int]] = None
+        projection : dict = None
+        batch_size : int = 1000
+        
+    class EnsureIndexes(_MongoDB_Info):
+        conn : MongoClient
+        indexes : list[Index_Spec]
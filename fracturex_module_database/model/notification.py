@@ -0,0 +1,9 @@
+from typing import Any, NamedTuple
+
+class Notification(NamedTuple):
+    """
+    Notificación recibida por un Notification_Listener, con el payload ya decodificado
+    """
+    channel: str
+    payload: Any
+    pid: int
@@ -0,0 +1,10 @@
+from typing import Any, NamedTuple
+
+class Page(NamedTuple):
+    """
+    Página retornada por `select` cuando se define "page_size"
+    """
+    # Registros en el formato pedido con "result_format"
+    rows: Any
+    # Token para pedir la página siguiente ("page_token"), o None si es la última
+    next_page_token: str | None
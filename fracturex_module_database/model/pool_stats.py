@@ -0,0 +1,21 @@
+from pydantic import BaseModel
+
+from fracturex_module_database.model.database_type import Database_Type
+
+class Pool_Stats(BaseModel):
+    database_config_key: str
+    type: Database_Type
+    min_size: int
+    max_size: int
+    size: int = 0
+    in_use: int = 0
+    idle: int = 0
+    waiting: int = 0
+    checkouts: int = 0
+    timeouts: int = 0
+    created: int = 0
+    discarded: int = 0
+    # Conexiones cerradas o liberadas sin devolverlas al pool
+    leaked: int = 0
+    wait_time_total: float = 0.0
+    wait_time_max: float = 0.0
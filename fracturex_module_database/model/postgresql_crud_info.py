@@ -0,0 +1,77 @@
+from typing import Any, ClassVar
+import psycopg2
+from pydantic import BaseModel
+
+from fracturex_module_database.model.crud_descriptor import Crud_Info
+from fracturex_module_database.model.database_type import Database_Type
+from fracturex_module_database.model.export_result import Export_Format
+from fracturex_module_database.model.result_format import Result_Format
+
+class _PostgreSQL_Info(Crud_Info):
+    database_type : ClassVar[Database_Type] = Database_Type.POSTGRESQL
+
+class PostgreSQL(BaseModel):
+    
+    class Insert(_PostgreSQL_Info):
+        conn : psycopg2.extensions.connection
+        query : str
+        vars : tuple
+    
+    class Select(_PostgreSQL_Info):
+        conn : psycopg2.extensions.connection
+        query : str
+        vars : tuple = None
+        result_format : Result_Format = Result_Format.RECORDS
+        # Columnas a retornar (proyección sobre el resultado de "query")
+        columns : list[str] | None = None
+        # Paginación por llave: columnas únicas y no nulas del resultado por las que se ordena
+        keyset : list[str] | None = None
+        descending : bool = False
+        page_size : int | None = None
+        page_token : str | None = None
+    
+    class Update(_PostgreSQL_Info):
+        conn : psycopg2.extensions.connection
+        query : str
+        vars : tuple
+    
+    class Delete(_PostgreSQL_Info):
+        conn : psycopg2.extensions.connection
+        query : str
+        vars : tuple = None
+    
+    class BulkInsert(_PostgreSQL_Info):
+        conn : psycopg2.extensions.connection
+        table_name : str
+        columns : list[str]
+        rows : list[tuple]
+        returning : list[str] | None = None
+        page_size : int = 1000
+        copy_threshold : int = 10000
+    
+    class BulkUpdate(_PostgreSQL_Info):
+        conn : psycopg2.extensions.connection
+        table_name : str
+        # Columnas de cada fila de "rows"; las de "key_columns" identifican el registro y las demás se actualizan
+        columns : list[str]
+        key_columns : list[str]
+        rows : list[tuple]
+        page_size : int = 1000
+    
+    class BulkUpsert(BulkUpdate):
+        # Columnas a actualizar si el registro ya existe (por defecto las que no son llave; [] no actualiza)
+        update_columns : list[str] | None = None
+    
+    class Notify(_PostgreSQL_Info):
+        conn : psycopg2.extensions.connection
+        channel : str = 'notification'
+        payload : dict
+    
+    class Export(_PostgreSQL_Info):
+        conn : psycopg2.extensions.connection
+        query : str
+        vars : tuple = None
+        # Objeto con "write" (archivo binario, io.BytesIO, mmap.mmap, ...) donde se escribe la salida de COPY
+        file : Any
+        format : Export_Format = Export_Format.CSV
+        header : bool = True
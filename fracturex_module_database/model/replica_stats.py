@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+
+class Replica_Stats(BaseModel):
+    database_config_key: str
+    replica: int
+    # Latencia promedio (EWMA) de las lecturas, en segundos
+    latency: float = 0.0
+    in_flight: int = 0
+    reads: int = 0
+    failures: int = 0
+    ejections: int = 0
+    ejected: bool = False
@@ -0,0 +1,21 @@
+from enum import Enum
+from typing import Any, NamedTuple
+
+class Result_Format(Enum):
+    # Lista de diccionarios, uno por registro (formato por defecto)
+    RECORDS     = "RECORDS"
+    # Tabular_Result: nombres de columna una sola vez y una tupla por registro
+    TUPLES      = "TUPLES"
+    # Diccionario columna -> lista de valores
+    COLUMNAR    = "COLUMNAR"
+    # Como COLUMNAR, pero las columnas numéricas sin nulos son array.array
+    ARRAY       = "ARRAY"
+    # Diccionario columna -> numpy.ndarray (requiere numpy instalado)
+    NUMPY       = "NUMPY"
+
+class Tabular_Result(NamedTuple):
+    """
+    Resultado en formato Result_Format.TUPLES
+    """
+    columns: list[str]
+    rows: list[tuple[Any, ...]]
@@ -0,0 +1,9 @@
+from pydantic import BaseModel
+
+class Single_Flight_Stats(BaseModel):
+    # Consultas ejecutadas en la base de datos y consultas que recibieron el resultado de otra en curso
+    executions: int = 0
+    shared: int = 0
+    # Esperas que superaron "wait_timeout" y ejecutaron su propia consulta
+    timeouts: int = 0
+    in_flight: int = 0
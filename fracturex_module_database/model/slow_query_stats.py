@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+
+class Slow_Query_Stats(BaseModel):
+    # Consulta normalizada (literales y parámetros como "?")
+    fingerprint: str
+    backend: str
+    operation: str
+    count: int = 0
+    # Tiempos en segundos
+    total_time: float = 0.0
+    mean_time: float = 0.0
+    max_time: float = 0.0
+    rows: int = 0
+    # Tipos de los parámetros de la última ejecución, sin sus valores
+    parameters: str | None = None
+    # Primera consulta registrada con esta huella, y su plan de ejecución si se capturó
+    sample: str | None = None
+    explain: str | None = None
@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+
+class Statement_Cache_Stats(BaseModel):
+    connections: int = 0
+    size: int = 0
+    hits: int = 0
+    misses: int = 0
+    prepares: int = 0
+    evictions: int = 0
+    invalidations: int = 0
@@ -0,0 +1,25 @@
+from enum import Enum
+from pydantic import BaseModel
+
+class Overflow_Policy(Enum):
+    # Qué hace "insert_behind" cuando el buffer está lleno
+    BLOCK = "block"
+    DROP  = "drop"
+    SPILL = "spill"
+
+class Write_Behind_Stats(BaseModel):
+    database_config_key: str
+    target: str
+    buffered: int = 0
+    spilled_pending: int = 0
+    enqueued: int = 0
+    flushed: int = 0
+    failed: int = 0
+    dropped: int = 0
+    spilled: int = 0
+    flushes: int = 0
+    # Duración promedio y máxima de cada escritura, y espera máxima de un registro en el buffer, en segundos
+    flush_time_avg: float = 0.0
+    flush_time_max: float = 0.0
+    queue_delay_max: float = 0.0
+    last_error: str | None = None
@@ -0,0 +1,287 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from contextvars import copy_context
+from functools import partial
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Callable
+from weakref import WeakKeyDictionary
+
+from fracturex_module_database.infrastructure.cache.single_flight import select_flight
+from fracturex_module_database.infrastructure.database import transaction as database_transaction
+from fracturex_module_database.infrastructure.database.pool import registry
+from fracturex_module_database.infrastructure.database.transaction import Transaction
+from fracturex_module_database.model.bulk_result import (
+    Bulk_Insert_Result,
+    Bulk_Write_Result
+)
+from fracturex_module_database.model.database_type import Database_Type
+from fracturex_module_database.model.dto.http_response import (
+    error_response,
+    is_error_response
+)
+from fracturex_module_database.model.fan_out_result import Merge_Strategy
+from fracturex_module_database.model.isolation_level import Isolation_Level
+from fracturex_module_database.service import service
+
+if TYPE_CHECKING:
+    import psycopg2
+    from bson import ObjectId
+    from fastapi.responses import JSONResponse
+    from pymongo import MongoClient
+    from fracturex_module_database.infrastructure.database.notification import Notification_Listener
+    from fracturex_module_database.model.export_result import Export_Result
+    from fracturex_module_database.model.fan_out_result import Fan_Out_Result
+    from fracturex_module_database.model.notification import Notification
+    from fracturex_module_database.model.page import Page
+    from fracturex_module_database.model.database_crud_info import (
+        PostgreSQL,
+        MongoDB
+    )
+
+# Ejecutor acotado donde corren las llamadas bloqueantes de psycopg2/pymongo
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+# Semáforos por event loop y llave de configuración: las esperas por una conexión ocurren en el event loop y
+# no en un hilo del ejecutor. Un asyncio.Semaphore queda ligado al loop donde espera por primera vez, por lo
+# que cada loop (por ejemplo, uno por hilo o uno por prueba) tiene los suyos. Como el semáforo referencia a
+# su loop, las entradas de los loops cerrados se descartan al registrar un loop nuevo
+_connection_semaphores: WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, asyncio.Semaphore]] = WeakKeyDictionary()
+_connection_semaphores_lock = threading.Lock()
+
+def configure_executor(max_workers : int | None = None) -> None:
+    """
+    Función para definir la cantidad máxima de hilos usados por el servicio asíncrono
+
+    Parameters
+    ----------
+    max_workers : int | None = None
+        Cantidad máxima de hilos. Por defecto min(32, núcleos + 4)
+    """
+    global _executor
+    with _executor_lock:
+        previous, _executor = _executor, _create_executor(max_workers)
+    if previous is not None:
+        previous.shutdown(wait=False)
+
+def _create_executor(max_workers : int | None = None) -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=max_workers or min(32, (os.cpu_count() or 1) + 4), thread_name_prefix="fracturex_database")
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = _create_executor()
+    return _executor
+
+async def _run(function : Callable[..., Any], *args : Any, **kwargs : Any) -> Any:
+    # Se copia el contexto de la tarea para que el hilo vea las transacciones abiertas con "transaction"
+    return await asyncio.get_running_loop().run_in_executor(_get_executor(), partial(copy_context().run, function, *args, **kwargs))
+
+def _get_connection_semaphore(database_config_key : str | None) -> asyncio.Semaphore | None:
+    # Solo los pools PostgreSQL entregan conexiones exclusivas; el MongoClient se comparte
+    try:
+        database_configs = service.environment.FRACTUREX_MODULE_DATABASE_CONFIG
+    except Exception:
+        # El error de configuración se reporta al intentar conectar
+        return None
+    database_config_key = database_config_key if database_config_key is not None else next(iter(database_configs), None)
+    database_config = database_configs.get(database_config_key)
+    if database_config is None or database_config.type != Database_Type.POSTGRESQL:
+        return None
+    loop = asyncio.get_running_loop()
+    semaphores = _connection_semaphores.get(loop)
+    if semaphores is None:
+        with _connection_semaphores_lock:
+            for closed in [item for item in _connection_semaphores.keys() if item.is_closed()]:
+                del _connection_semaphores[closed]
+            semaphores = _connection_semaphores.setdefault(loop, {})
+    semaphore = semaphores.get(database_config_key)
+    if semaphore is None:
+        semaphore = semaphores.setdefault(database_config_key, asyncio.Semaphore(database_config.pool_max_size))
+    return semaphore
+
+async def get_database_connection(database_config_key : str = None) -> psycopg2.extensions.connection | MongoClient | JSONResponse:
+    """
+    Versión asíncrona de "service.get_database_connection". La conexión debe devolverse con "release_database_connection"
+    
+    La espera por una conexión PostgreSQL libre ocurre en el event loop, sin ocupar hilos del ejecutor.
+    """
+    semaphore = _get_connection_semaphore(database_config_key)
+    if semaphore is not None:
+        await semaphore.acquire()
+    try:
+        conn = await _run(service.get_database_connection, database_config_key)
+    except BaseException:
+        if semaphore is not None:
+            semaphore.release()
+        raise
+    if is_error_response(conn) and semaphore is not None:
+        semaphore.release()
+    return conn
+
+async def release_database_connection(conn : psycopg2.extensions.connection | MongoClient, discard : bool = False) -> None:
+    """
+    Versión asíncrona de "service.release_database_connection"
+    """
+    database_config_key = registry.get_database_config_key(conn)
+    try:
+        await _run(service.release_database_connection, conn, discard=discard)
+    finally:
+        # La conexión se devuelve en el mismo loop donde se obtuvo
+        semaphores = _connection_semaphores.get(asyncio.get_running_loop())
+        semaphore = semaphores.get(database_config_key) if semaphores is not None and database_config_key is not None else None
+        if semaphore is not None:
+            semaphore.release()
+
+@asynccontextmanager
+async def database_connection(database_config_key : str = None) -> AsyncIterator[psycopg2.extensions.connection | MongoClient | JSONResponse]:
+    """
+    Versión asíncrona de "service.database_connection"
+    """
+    conn = await get_database_connection(database_config_key)
+    try:
+        yield conn
+    finally:
+        if not is_error_response(conn):
+            await release_database_connection(conn)
+
+@asynccontextmanager
+async def transaction(conn : psycopg2.extensions.connection | MongoClient, isolation_level : Isolation_Level | None = None, read_only : bool = False) -> AsyncIterator[Transaction]:
+    """
+    Versión asíncrona de "service.transaction". Las operaciones de este módulo hechas dentro del bloque (en la misma tarea) forman parte de la transacción
+    """
+    current_transaction = await _run(database_transaction.begin, conn, isolation_level=isolation_level, read_only=read_only)
+    # La transacción se registra en el contexto de la tarea, que "_run" copia a cada llamada
+    token = database_transaction.push(current_transaction)
+    error: BaseException | None = None
+    try:
+        yield current_transaction
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        database_transaction.pop(token)
+        await _run(current_transaction.end, error)
+
+async def insert(crud_info : PostgreSQL.Insert | MongoDB.Insert, print_data : bool = False) -> list[dict] | ObjectId | JSONResponse:
+    """
+    Versión asíncrona de "service.insert"
+    """
+    return await _run(service.insert, crud_info, print_data=print_data)
+
+async def bulk_insert(crud_info : PostgreSQL.BulkInsert | MongoDB.BulkInsert, print_data : bool = False) -> Bulk_Insert_Result | JSONResponse:
+    """
+    Versión asíncrona de "service.bulk_insert"
+    """
+    return await _run(service.bulk_insert, crud_info, print_data=print_data)
+
+async def bulk_update(crud_info : PostgreSQL.BulkUpdate | MongoDB.BulkUpdate, print_data : bool = False) -> Bulk_Write_Result | JSONResponse:
+    """
+    Versión asíncrona de "service.bulk_update"
+    """
+    return await _run(service.bulk_update, crud_info, print_data=print_data)
+
+async def bulk_upsert(crud_info : PostgreSQL.BulkUpsert | MongoDB.BulkUpsert, print_data : bool = False) -> Bulk_Write_Result | JSONResponse:
+    """
+    Versión asíncrona de "service.bulk_upsert"
+    """
+    return await _run(service.bulk_upsert, crud_info, print_data=print_data)
+
+async def select(crud_info : PostgreSQL.Select | MongoDB.Select, print_data : bool = False, cache_ttl : float | None = None, cache_tags : list[str] | None = None, coalesce : bool = False) -> list | Page | JSONResponse:
+    """
+    Versión asíncrona de "service.select". Con "coalesce" la espera por una consulta idéntica en curso ocurre en el event loop, sin ocupar un hilo del ejecutor
+    """
+    if cache_ttl is not None:
+        # La caché de resultados (y el agrupamiento, si se pidió) se resuelve en "service.select"
+        return await _run(service.select, crud_info, print_data=print_data, cache_ttl=cache_ttl, cache_tags=cache_tags, coalesce=coalesce)
+    if coalesce:
+        key = service._coalescing_key(crud_info)
+        if key is not None:
+            try:
+                found, returnValue = await select_flight.wait_async(key)
+            except TimeoutError:
+                # La espera ya se excedió una vez: se consulta directamente
+                return await _run(service.select, crud_info, print_data=print_data)
+            if found:
+                return returnValue
+    return await _run(service.select, crud_info, print_data=print_data, coalesce=coalesce)
+
+async def select_many(database_config_keys : list[str], crud_info : PostgreSQL.Select | MongoDB.Select, merge : Merge_Strategy = Merge_Strategy.CONCAT, sort_key : str | None = None, descending : bool = False, limit : int | None = None, timeout : float | None = None, print_data : bool = False) -> Fan_Out_Result | JSONResponse:
+    """
+    Versión asíncrona de "service.select_many". Las consultas corren en el ejecutor de "select_many"; este solo ocupa un hilo mientras espera
+    """
+    return await _run(service.select_many, database_config_keys, crud_info, merge=merge, sort_key=sort_key, descending=descending, limit=limit, timeout=timeout, print_data=print_data)
+
+async def export(crud_info : PostgreSQL.Export | MongoDB.Export, print_data : bool = False) -> Export_Result | JSONResponse:
+    """
+    Versión asíncrona de "service.export". El archivo se escribe desde un hilo del ejecutor
+    """
+    return await _run(service.export, crud_info, print_data=print_data)
+
+async def update(crud_info : PostgreSQL.Update | MongoDB.Update, print_data : bool = False) -> bool | JSONResponse:
+    """
+    Versión asíncrona de "service.update"
+    """
+    return await _run(service.update, crud_info, print_data=print_data)
+
+async def delete(crud_info : PostgreSQL.Delete | MongoDB.Delete, print_data : bool = False) -> bool | JSONResponse:
+    """
+    Versión asíncrona de "service.delete"
+    """
+    return await _run(service.delete, crud_info, print_data=print_data)
+
+async def notify(crud_info : PostgreSQL.Notify, print_data : bool = False, coalesce : bool = False) -> bool | JSONResponse:
+    """
+    Versión asíncrona de "service.notify"
+    """
+    return await _run(service.notify, crud_info, print_data=print_data, coalesce=coalesce)
+
+async def listen(channels : list[str], callback : Callable[[Notification], Awaitable[Any] | Any], database_config_key : str = None, max_queue : int = 1000, concurrency : int = 1) -> Notification_Listener | JSONResponse:
+    """
+    Función para escuchar (LISTEN) canales de PostgreSQL y recibir cada notificación en "callback"
+    
+    Se usa una conexión dedicada (fuera del pool) que se reconecta sola. Los payloads JSON se decodifican y los sobres {"fx_batch": [...]} de "notify(..., coalesce=True)" se entregan como notificaciones individuales.
+    
+    Parameters
+    ----------
+    channels : list[str]
+        Canales a escuchar
+    
+    callback : Callable[[Notification], Awaitable[Any] | Any]
+        Función que recibe cada Notification. Si es asíncrona se espera en el event loop; si no, se ejecuta en el ejecutor del servicio
+    
+    database_config_key : str = None
+        Nombre de la llave del registro de la base de datos
+    
+    max_queue : int = 1000
+        Cantidad de notificaciones sin procesar a partir de la cual se deja de leer la conexión (contrapresión)
+    
+    concurrency : int = 1
+        Cantidad de notificaciones procesadas a la vez. Con 1 se procesan en orden
+    
+    Returns
+    -------
+    Notification_Listener
+        Listener iniciado; se detiene con "await listener.close()"
+    
+    JSONResponse
+        Respuesta en formato JSON en caso de haber error
+    """
+    from fracturex_module_database.infrastructure.database.notification import Notification_Listener
+    from fracturex_module_database.model.notification import Notification
+
+    try:
+        database_configs = service.environment.FRACTUREX_MODULE_DATABASE_CONFIG
+        database_config_key = database_config_key if database_config_key is not None else next(iter(database_configs), None)
+        database_config = database_configs.get(database_config_key)
+        if database_config is None or database_config.type != Database_Type.POSTGRESQL:
+            return error_response("Sin registro de base de datos PostgreSQL")
+        listener = Notification_Listener(database_config.url, channels, callback, max_queue=max_queue, concurrency=concurrency, executor=_get_executor())
+        return await listener.start()
+    except Exception as e:
+        return error_response(f"No se pudo conectar a la base de datos: {str(e)}")
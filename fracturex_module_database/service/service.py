@@ -1,25 +1,128 @@
-from bson import ObjectId
-import psycopg2
-from pymongo import MongoClient
-from fastapi import status
-from fastapi.responses import JSONResponse
+from __future__ import annotations
+
+import atexit
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from contextlib import contextmanager
+from contextvars import ContextVar
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator
+from pydantic import BaseModel
 
 from fracturex_module_database.config.environment import environment
-from fracturex_module_database.infrastructure.database import (
-    mongodb, 
-    postgresql
+from fracturex_module_database.infrastructure.cache.result_cache import (
+    mongodb_tags,
+    postgresql_tags,
+    result_cache
+)
+from fracturex_module_database.infrastructure.cache.single_flight import select_flight
+from fracturex_module_database.infrastructure import (
+    fan_out,
+    instrumentation,
+    pagination
 )
-from fracturex_module_database.model.database_crud_info import (
-    PostgreSQL,
-    MongoDB
+from fracturex_module_database.infrastructure.database import transaction as database_transaction
+from fracturex_module_database.infrastructure.database.pool import registry
+from fracturex_module_database.infrastructure.database.replica import router as replica_router
+from fracturex_module_database.infrastructure.database.transaction import Transaction
+from fracturex_module_database.model.bulk_result import (
+    Bulk_Insert_Result,
+    Bulk_Write_Result
 )
+from fracturex_module_database.model.cache_stats import Cache_Stats
 from fracturex_module_database.model.database_type import Database_Type
 from fracturex_module_database.model.database_config import Database_Config
-from fracturex_module_database.model.dto.http_response import HTTP_Response
+from fracturex_module_database.model.export_result import Export_Result
+from fracturex_module_database.model.fan_out_result import (
+    Fan_Out_Result,
+    Merge_Strategy,
+    Shard_Result
+)
+from fracturex_module_database.model.index_report import (
+    Ensure_Indexes_Result,
+    Index_Report
+)
+from fracturex_module_database.model.isolation_level import Isolation_Level
+from fracturex_module_database.model.dto.http_response import (
+    error_message,
+    error_response,
+    is_error_response
+)
+from fracturex_module_database.model.page import Page
+from fracturex_module_database.model.pool_stats import Pool_Stats
+from fracturex_module_database.model.replica_stats import Replica_Stats
+from fracturex_module_database.model.result_format import Result_Format
+from fracturex_module_database.model.single_flight_stats import Single_Flight_Stats
+from fracturex_module_database.model.slow_query_stats import Slow_Query_Stats
+from fracturex_module_database.model.statement_cache_stats import Statement_Cache_Stats
+from fracturex_module_database.model.write_behind import (
+    Overflow_Policy,
+    Write_Behind_Stats
+)
+
+if TYPE_CHECKING:
+    import psycopg2
+    from bson import ObjectId
+    from fastapi.responses import JSONResponse
+    from pymongo import MongoClient
+    from fracturex_module_database.infrastructure.database.notification import Notification_Publisher
+    from fracturex_module_database.model.crud_descriptor import Crud_Descriptor
+    from fracturex_module_database.model.database_crud_info import (
+        PostgreSQL,
+        MongoDB
+    )
+
+# Módulo y clase de infraestructura de cada motor; se importan al usarse por primera vez
+_BACKEND_MODULES: dict[Database_Type, tuple[str, str]] = {
+    Database_Type.POSTGRESQL: ("fracturex_module_database.infrastructure.database.postgresql", "PostgreSQL"),
+    Database_Type.MONGODB: ("fracturex_module_database.infrastructure.database.mongodb", "MongoDB")
+}
+_backends: dict[Database_Type, Any] = {}
+# Tags que invalida cada clase de información del CRUD al escribir (ver "_after_write")
+_write_tags: dict[type, Callable[[Any], Iterable[str]] | None] = {}
+# Escrituras hechas dentro de "read_your_writes": (llave -> momento de la última escritura, ventana en segundos)
+_recent_writes: ContextVar[tuple[dict[str, float], float | None] | None] = ContextVar("fracturex_read_your_writes", default=None)
+
+def _backend(database_type : Database_Type) -> Any:
+    backend = _backends.get(database_type)
+    if backend is None:
+        module_name, class_name = _BACKEND_MODULES[database_type]
+        backend = _backends[database_type] = getattr(import_module(module_name), class_name)
+    return backend
+
+# Llamada al motor de cada operación de escritura, por tipo de base de datos
+_INSERT: dict[Database_Type, Callable[[Any, bool], Any]] = {
+    Database_Type.POSTGRESQL: lambda crud_info, print_data: _backend(Database_Type.POSTGRESQL).insert(conn=crud_info.conn, query=crud_info.query, vars=crud_info.vars, print_data=print_data),
+    Database_Type.MONGODB: lambda crud_info, print_data: _backend(Database_Type.MONGODB).insert(conn=crud_info.conn, collection_name=crud_info.collection_name, document=crud_info.document, print_data=print_data)
+}
+_BULK_INSERT: dict[Database_Type, Callable[[Any, bool], Any]] = {
+    Database_Type.POSTGRESQL: lambda crud_info, print_data: _backend(Database_Type.POSTGRESQL).bulk_insert(conn=crud_info.conn, table_name=crud_info.table_name, columns=crud_info.columns, rows=crud_info.rows, returning=crud_info.returning, page_size=crud_info.page_size, copy_threshold=crud_info.copy_threshold, print_data=print_data),
+    Database_Type.MONGODB: lambda crud_info, print_data: _backend(Database_Type.MONGODB).bulk_insert(conn=crud_info.conn, collection_name=crud_info.collection_name, documents=crud_info.documents, chunk_size=crud_info.chunk_size, print_data=print_data)
+}
+_BULK_UPDATE: dict[Database_Type, Callable[[Any, bool], Any]] = {
+    Database_Type.POSTGRESQL: lambda crud_info, print_data: _backend(Database_Type.POSTGRESQL).bulk_update(conn=crud_info.conn, table_name=crud_info.table_name, columns=crud_info.columns, key_columns=crud_info.key_columns, rows=crud_info.rows, page_size=crud_info.page_size, print_data=print_data),
+    Database_Type.MONGODB: lambda crud_info, print_data: _backend(Database_Type.MONGODB).bulk_update(conn=crud_info.conn, collection_name=crud_info.collection_name, documents=crud_info.documents, key_fields=crud_info.key_fields, replace=crud_info.replace, chunk_size=crud_info.chunk_size, print_data=print_data)
+}
+_BULK_UPSERT: dict[Database_Type, Callable[[Any, bool], Any]] = {
+    Database_Type.POSTGRESQL: lambda crud_info, print_data: _backend(Database_Type.POSTGRESQL).bulk_upsert(conn=crud_info.conn, table_name=crud_info.table_name, columns=crud_info.columns, key_columns=crud_info.key_columns, rows=crud_info.rows, update_columns=crud_info.update_columns, page_size=crud_info.page_size, print_data=print_data),
+    Database_Type.MONGODB: lambda crud_info, print_data: _backend(Database_Type.MONGODB).bulk_update(conn=crud_info.conn, collection_name=crud_info.collection_name, documents=crud_info.documents, key_fields=crud_info.key_fields, replace=crud_info.replace, upsert=True, chunk_size=crud_info.chunk_size, print_data=print_data)
+}
+_UPDATE: dict[Database_Type, Callable[[Any, bool], Any]] = {
+    Database_Type.POSTGRESQL: lambda crud_info, print_data: _backend(Database_Type.POSTGRESQL).update(conn=crud_info.conn, query=crud_info.query, vars=crud_info.vars, print_data=print_data),
+    Database_Type.MONGODB: lambda crud_info, print_data: _backend(Database_Type.MONGODB).update(conn=crud_info.conn, collection_name=crud_info.collection_name, query=crud_info.query, update_values=crud_info.update_values, print_data=print_data)
+}
+_DELETE: dict[Database_Type, Callable[[Any, bool], Any]] = {
+    Database_Type.POSTGRESQL: lambda crud_info, print_data: _backend(Database_Type.POSTGRESQL).delete(conn=crud_info.conn, query=crud_info.query, vars=crud_info.vars, print_data=print_data),
+    Database_Type.MONGODB: lambda crud_info, print_data: _backend(Database_Type.MONGODB).delete(conn=crud_info.conn, collection_name=crud_info.collection_name, query=crud_info.query, print_data=print_data)
+}
 
 def get_database_connection(database_config_key : str = None) -> psycopg2.extensions.connection | MongoClient | JSONResponse:
     """
-    Función para retornar la primera conexión a la base de datos (específicamente donde se inicia sesión), o la indicada con el parámetro "database_config_key"
+    Función para retornar una conexión del pool de la primera base de datos (específicamente donde se inicia sesión), o la indicada con el parámetro "database_config_key"
+    
+    Las conexiones PostgreSQL se toman de un pool compartido por el proceso y deben devolverse con "release_database_connection" (o usar "database_connection") para reutilizarlas. Una conexión cerrada con "close()" o descartada sin devolverla no se reutiliza, pero su lugar en el pool se recupera. Las conexiones MongoDB son un MongoClient compartido por llave y no deben cerrarse.
     
     Parameters
     ----------
@@ -35,35 +138,319 @@ def get_database_connection(database_config_key : str = None) -> psycopg2.extens
     JSONResponse
         Respuesta en formato JSON del error al conectar a una BD con los datos suministrados.
     """
-    # Retornar None en caso de que no haya registros
-    if environment.FRACTUREX_MODULE_DATABASE_CONFIG is None or len(environment.FRACTUREX_MODULE_DATABASE_CONFIG.keys()) == 0:
-        return JSONResponse(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, 
-            content=HTTP_Response(success=False, message="Sin registro de base de datos").model_dump()
-        )
     try:
-        database_config : Database_Config = Database_Config(**(environment.FRACTUREX_MODULE_DATABASE_CONFIG.get(database_config_key if database_config_key is not None else list(environment.DATABASE_CONFIG.keys())[0])))
-        # Asignar el type
-        if "postgresql" in database_config.url.lower():
-            database_config.type = Database_Type.POSTGRESQL
-        elif "mongodb" in database_config.url.lower():
-            database_config.type = Database_Type.MONGODB
-        else:
-            return JSONResponse(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, 
-                content=HTTP_Response(success=False, message="Sin registro de base de datos").model_dump()
-            )
-        # Retornar la conexión
-        if database_config.type == Database_Type.POSTGRESQL:
-            return psycopg2.connect(dsn=database_config.url)
-        elif database_config.type == Database_Type.MONGODB:
-            return MongoClient(host=database_config.url)
+        database_configs = environment.FRACTUREX_MODULE_DATABASE_CONFIG
+        # Retornar un error en caso de que no haya registros
+        if len(database_configs) == 0:
+            return error_response("Sin registro de base de datos")
+        database_config_key = database_config_key if database_config_key is not None else next(iter(database_configs))
+        database_config = database_configs.get(database_config_key)
+        if database_config is None or database_config.type is None:
+            return error_response("Sin registro de base de datos")
+        # Retornar la conexión del pool
+        return registry.acquire(database_config_key, database_config)
     except Exception as e:
         # Retornar un error en caso de que no logre conectar
-        return JSONResponse(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, 
-            content=HTTP_Response(success=False, message=f"No se pudo conectar a la base de datos: {str(e)}", data={}).model_dump()
-        )
+        return error_response(f"No se pudo conectar a la base de datos: {str(e)}")
+
+def release_database_connection(conn : psycopg2.extensions.connection | MongoClient, discard : bool = False) -> None:
+    """
+    Función para devolver al pool una conexión obtenida con "get_database_connection"
+    
+    Parameters
+    ----------
+    conn : psycopg2.extensions.connection | MongoClient
+        Conexión a devolver. Las transacciones sin confirmar se deshacen
+    
+    discard : bool = False
+        Cerrar la conexión en lugar de reutilizarla (por ejemplo, luego de un error de red)
+    """
+    registry.release(conn, discard=discard)
+
+@contextmanager
+def database_connection(database_config_key : str = None) -> Iterator[psycopg2.extensions.connection | MongoClient | JSONResponse]:
+    """
+    Context manager que obtiene una conexión del pool y la devuelve al salir
+    
+    Parameters
+    ----------
+    database_config_key : str = None
+        Nombre de la llave del registro de la base de datos
+    
+    Returns
+    -------
+    psycopg2.extensions.connection | MongoClient
+        Conexión a la base de datos
+    JSONResponse
+        Respuesta en formato JSON del error al conectar (no se devuelve nada al pool)
+    """
+    conn = get_database_connection(database_config_key)
+    try:
+        yield conn
+    finally:
+        if not is_error_response(conn):
+            release_database_connection(conn)
+
+@contextmanager
+def transaction(conn : psycopg2.extensions.connection | MongoClient, isolation_level : Isolation_Level | None = None, read_only : bool = False) -> Iterator[Transaction]:
+    """
+    Context manager que agrupa las operaciones CRUD hechas con la conexión en una sola transacción
+    
+    Al salir se confirma una sola vez; si alguna operación retornó un error, si se lanzó una excepción o si se llamó a "set_rollback_only" se deshace. Anidado sobre la misma conexión usa un punto de guardado (SAVEPOINT) en PostgreSQL; en MongoDB se une a la transacción externa, que falla completa. En MongoDB se usa una sesión (requiere un replica set o un clúster fragmentado).
+    
+    Parameters
+    ----------
+    conn : psycopg2.extensions.connection | MongoClient
+        Conexión sobre la que se abre la transacción
+    
+    isolation_level : Isolation_Level | None = None
+        Nivel de aislamiento (solo en la transacción más externa). En MongoDB READ_COMMITTED usa el read concern "majority" y los demás "snapshot"
+    
+    read_only : bool = False
+        Abrir la transacción PostgreSQL en modo solo lectura
+    
+    Returns
+    -------
+    Transaction
+        Estado de la transacción: "committed" indica si se confirmó y "error" el primer error registrado
+    """
+    current_transaction = database_transaction.begin(conn, isolation_level=isolation_level, read_only=read_only)
+    token = database_transaction.push(current_transaction)
+    error: BaseException | None = None
+    try:
+        yield current_transaction
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        database_transaction.pop(token)
+        current_transaction.end(error)
+
+def get_statement_cache_stats() -> Statement_Cache_Stats:
+    """
+    Función para retornar los aciertos, fallos, preparaciones e invalidaciones de las cachés de sentencias preparadas
+    
+    La caché se activa por llave con "statement_cache_size" en la configuración de la base de datos, o por conexión con "statement_cache.enable_statement_cache".
+    
+    Returns
+    -------
+    Statement_Cache_Stats
+        Contadores acumulados de todas las conexiones PostgreSQL del proceso
+    """
+    return _statement_cache_stats()
+
+def get_pool_stats() -> dict[str, Pool_Stats]:
+    """
+    Función para retornar las estadísticas de los pools de conexiones del proceso
+    
+    Returns
+    -------
+    dict[str, Pool_Stats]
+        Estadísticas (conexiones en uso, ociosas, tiempo de espera, etc.) por llave de configuración
+    """
+    return registry.stats()
+
+def get_metrics() -> str:
+    """
+    Función para retornar las métricas del módulo en el formato de texto de Prometheus
+    
+    Incluye los histogramas de latencia por operación (si se activaron con "instrumentation.enable_metrics"), las estadísticas de los pools, de las réplicas de lectura, de la caché de sentencias preparadas, de la caché de resultados, del agrupamiento de consultas idénticas y de los buffers de escritura diferida.
+    
+    Returns
+    -------
+    str
+        Texto listo para exponer en un endpoint "/metrics"
+    """
+    pool_stats = registry.stats()
+    return "".join((
+        instrumentation.metrics.render_prometheus(),
+        instrumentation.render_model_metrics("fracturex_database_pool", [(f'database_config_key="{key}",type="{stats.type.value}"', stats) for key, stats in pool_stats.items()]),
+        instrumentation.render_model_metrics("fracturex_database_replica", [(f'database_config_key="{stats.database_config_key}",replica="{stats.replica}"', stats) for stats in replica_router.stats()]),
+        instrumentation.render_model_metrics("fracturex_database_statement_cache", [("", _statement_cache_stats())]),
+        instrumentation.render_model_metrics("fracturex_database_result_cache", [("", result_cache.stats())]),
+        instrumentation.render_model_metrics("fracturex_database_select_coalescing", [("", select_flight.stats())]),
+        instrumentation.render_model_metrics("fracturex_database_write_behind", [(f'database_config_key="{stats.database_config_key}",target="{stats.target}"', stats) for stats in get_write_behind_stats()])
+    ))
+
+# Registro de consultas lentas activo (se crea con "enable_slow_query_log")
+_slow_query_log: Any = None
+
+def enable_slow_query_log(threshold : float = 0.5, explain : bool = False, explain_sample_rate : float = 1.0, explain_interval : float = 300.0, explain_per_minute : int = 6, explain_timeout : float = 10.0, max_entries : int = 1000, log : bool = True) -> None:
+    """
+    Función para registrar las consultas (PostgreSQL select/update/delete y MongoDB select) que tarden más de "threshold" segundos
+    
+    Las consultas se agrupan por huella (consulta normalizada, sin literales ni parámetros) y se consultan con "get_slow_queries". Si se vuelve a llamar, el registro anterior se reemplaza.
+    
+    Parameters
+    ----------
+    threshold : float = 0.5
+        Duración en segundos a partir de la cual una consulta se considera lenta
+    
+    explain : bool = False
+        Capturar el plan de ejecución ("EXPLAIN (ANALYZE, BUFFERS)" en PostgreSQL, "explain" con "executionStats" en MongoDB) en un hilo aparte y con otra conexión de la misma llave. En PostgreSQL la consulta se vuelve a ejecutar dentro de una transacción que se deshace
+    
+    explain_sample_rate : float = 1.0
+        Probabilidad de capturar el plan de una consulta lenta
+    
+    explain_interval : float = 300.0
+        Segundos mínimos entre dos capturas del plan de una misma huella
+    
+    explain_per_minute : int = 6
+        Capturas de planes permitidas por minuto en todo el proceso
+    
+    explain_timeout : float = 10.0
+        Tiempo máximo en segundos de cada captura del plan (también como "lock_timeout" en PostgreSQL)
+    
+    max_entries : int = 1000
+        Huellas distintas a conservar; al superarse se descarta la de menor tiempo acumulado
+    
+    log : bool = True
+        Escribir una advertencia en el logger del módulo por cada consulta lenta
+    """
+    global _slow_query_log
+    from fracturex_module_database.infrastructure.slow_query import Slow_Query_Log
+
+    disable_slow_query_log()
+    _slow_query_log = Slow_Query_Log(
+        threshold=threshold,
+        explain=explain,
+        explain_sample_rate=explain_sample_rate,
+        explain_interval=explain_interval,
+        explain_per_minute=explain_per_minute,
+        explain_timeout=explain_timeout,
+        max_entries=max_entries,
+        log=log,
+        get_connection=get_database_connection,
+        release_connection=release_database_connection
+    )
+    instrumentation.subscribe(_slow_query_log)
+
+def disable_slow_query_log() -> None:
+    """
+    Función para dejar de registrar consultas lentas; lo acumulado se descarta
+    """
+    global _slow_query_log
+    if _slow_query_log is not None:
+        instrumentation.unsubscribe(_slow_query_log)
+        _slow_query_log.close()
+        _slow_query_log = None
+
+def get_slow_queries(limit : int = 10, order_by : str = "total_time") -> list[Slow_Query_Stats]:
+    """
+    Función para retornar el reporte de consultas lentas agrupadas por huella
+    
+    Parameters
+    ----------
+    limit : int = 10
+        Cantidad de huellas a retornar
+    
+    order_by : str = "total_time"
+        Campo de Slow_Query_Stats por el que se ordena de mayor a menor ("total_time", "count", "mean_time" o "max_time")
+    
+    Returns
+    -------
+    list[Slow_Query_Stats]
+        Huellas más costosas, con su plan de ejecución si se capturó. Lista vacía si el registro no está activo
+    """
+    if _slow_query_log is None:
+        return []
+    return _slow_query_log.top(limit, order_by)
+
+# Asesor de índices de MongoDB activo (se crea con "enable_index_advisor")
+_index_advisor: Any = None
+
+def enable_index_advisor(max_shapes : int = 10000) -> None:
+    """
+    Función para registrar la forma (campos de igualdad, orden y rango, sin valores) de las consultas de MongoDB select/update/delete
+    
+    Con las formas registradas "get_index_report" sugiere los índices que faltan y detecta los que no se usan. Si ya estaba activo se mantiene lo registrado.
+    
+    Parameters
+    ----------
+    max_shapes : int = 10000
+        Formas distintas a registrar por base de datos; las nuevas formas que superen el límite se ignoran
+    """
+    global _index_advisor
+    from fracturex_module_database.infrastructure.index_advisor import Index_Advisor
+
+    if _index_advisor is None:
+        _index_advisor = Index_Advisor(max_shapes)
+    _index_advisor.max_shapes = max_shapes
+    instrumentation.subscribe(_index_advisor)
+
+def disable_index_advisor() -> None:
+    """
+    Función para dejar de registrar las formas de las consultas de MongoDB; lo registrado se descarta
+    """
+    global _index_advisor
+    if _index_advisor is not None:
+        instrumentation.unsubscribe(_index_advisor)
+        _index_advisor = None
+
+def get_index_report(conn : MongoClient, collection_names : list[str] | None = None) -> Index_Report | JSONResponse:
+    """
+    Función para comparar las consultas registradas por el asesor de índices con los índices de la base de datos de la conexión
+    
+    Parameters
+    ----------
+    conn : MongoClient
+        Conexión a la base de datos a revisar
+    
+    collection_names : list[str] | None = None
+        Colecciones a revisar. Por defecto las que tienen consultas registradas
+    
+    Returns
+    -------
+    Index_Report
+        Índices sugeridos (regla igualdad-orden-rango) con las consultas que cubriría cada uno, ordenados por tiempo acumulado, e índices sin consultas registradas ni usos en $indexStats
+    
+    JSONResponse
+        Respuesta en formato JSON si el asesor no está activo o en caso de haber error
+    """
+    if _index_advisor is None:
+        return error_response("El asesor de índices no está activo (enable_index_advisor)", 400)
+    try:
+        return _index_advisor.report(conn, collection_names)
+    except Exception as e:
+        instrumentation.logger.error("MongoDB.IndexReport: %s", str(e))
+        return error_response(f"There was an error: {str(e)}")
+
+def ensure_indexes(crud_info : MongoDB.EnsureIndexes, print_data : bool = False) -> Ensure_Indexes_Result | JSONResponse:
+    """
+    Función para crear los índices de una especificación que aún no existan, pensada para ejecutarse al iniciar la aplicación
+    
+    Es idempotente: los índices con las mismas llaves y opciones se informan como existentes, y los que existen con otras opciones (o con el mismo nombre y otras llaves) se informan como conflictos sin modificarlos. Los índices faltantes de cada colección se crean con una sola orden "createIndexes".
+    
+    Parameters
+    ----------
+    crud_info : database.model.database_crud_info.MongoDB.EnsureIndexes
+        Conexión y lista de Index_Spec
+    
+    print_data : bool = False
+        Encargado de mostrar o no la información al momento de realizar el CRUD
+    
+    Returns
+    -------
+    Ensure_Indexes_Result
+        Índices creados, existentes y en conflicto ("colección.nombre"), y si el asesor de índices está activo las consultas registradas que cubre cada índice de la especificación
+    
+    JSONResponse
+        Respuesta en formato JSON en caso de haber error
+    """
+    returnValue = _backend(Database_Type.MONGODB).ensure_indexes(conn=crud_info.conn, indexes=crud_info.indexes, print_data=print_data)
+    if _index_advisor is not None and not is_error_response(returnValue):
+        from fracturex_module_database.infrastructure.index_advisor import covers
+
+        shapes = _index_advisor.shapes(crud_info.conn.get_database().name)
+        for index in crud_info.indexes:
+            name = f"{index.collection_name}.{index.name or '_'.join(f'{field}_{direction}' for field, direction in index.keys)}"
+            returnValue.queries[name] = sum(count for shape, (count, _) in shapes.items() if shape.collection_name == index.collection_name and covers(index.keys, shape))
+    return returnValue
+
+def _statement_cache_stats() -> Statement_Cache_Stats:
+    # La caché de sentencias depende de psycopg2; si no se ha cargado no hay conexiones PostgreSQL que medir
+    statement_cache = sys.modules.get("fracturex_module_database.infrastructure.database.statement_cache")
+    return statement_cache.get_statement_cache_stats() if statement_cache is not None else Statement_Cache_Stats()
 
 def get_database_config(database_config_key : str) -> Database_Config | None:
     """
@@ -81,7 +468,21 @@ def get_database_config(database_config_key : str) -> Database_Config | None:
     None
         None en caso de que la llave no se encuentre
     """
-    return Database_Config(**(environment.FRACTUREX_MODULE_DATABASE_CONFIG.get(database_config_key, None)))
+    database_config = environment.FRACTUREX_MODULE_DATABASE_CONFIG.get(database_config_key)
+    return database_config.model_copy() if database_config is not None else None
+
+def reload_database_config() -> dict[str, Database_Config]:
+    """
+    Función para volver a leer la configuración de las bases de datos (variable "FRACTUREX_MODULE_DATABASE_CONFIG")
+    
+    Los pools ya creados conservan la configuración con la que se crearon.
+    
+    Returns
+    -------
+    dict[str, Database_Config]
+        Configuración de cada base de datos, por llave
+    """
+    return environment.reload()
 
 def insert(crud_info : PostgreSQL.Insert | MongoDB.Insert, print_data : bool = False) -> list[dict] | ObjectId | JSONResponse:
     """
@@ -106,15 +507,88 @@ def insert(crud_info : PostgreSQL.Insert | MongoDB.Insert, print_data : bool = F
     JSONResponse
         Respuesta en formato JSON en caso de haber error
     """
-    if isinstance(crud_info, PostgreSQL.Insert):
-        return postgresql.PostgreSQL.insert(conn=crud_info.conn, query=crud_info.query, vars=crud_info.vars, print_data=print_data)
-    elif isinstance(crud_info, MongoDB.Insert):
-        return mongodb.MongoDB.insert(conn=crud_info.conn, collection_name=crud_info.collection_name, document=crud_info.document, print_data=print_data)
+    return _after_write(crud_info, _INSERT[crud_info.database_type](crud_info, print_data))
 
-def select(crud_info : PostgreSQL.Select | MongoDB.Select, print_data : bool = False) -> list | JSONResponse:
+def bulk_insert(crud_info : PostgreSQL.BulkInsert | MongoDB.BulkInsert, print_data : bool = False) -> Bulk_Insert_Result | JSONResponse:
+    """
+    Función para insertar un lote de registros en una base de datos
+    
+    En PostgreSQL se usa "COPY FROM STDIN" si el lote supera "copy_threshold" y no se pide "returning", de lo contrario un INSERT multi-fila por cada página ("execute_values"). En MongoDB se usa "insert_many(ordered=False)" por bloques de "chunk_size".
+    
+    Parameters
+    ----------
+    crud_info : database.model.database_crud_info.PostgreSQL.BulkInsert | database.model.database_crud_info.MongoDB.BulkInsert
+        Información del CRUD a realizar
+    
+    print_data : bool = False
+        Encargado de mostrar o no la información al momento de realizar el CRUD
+    
+    Returns
+    -------
+    Bulk_Insert_Result
+        Método usado, cantidad de registros insertados, IDs generados y resumen por bloque
+        
+    JSONResponse
+        Respuesta en formato JSON en caso de haber error
+    """
+    return _after_write(crud_info, _BULK_INSERT[crud_info.database_type](crud_info, print_data))
+
+def bulk_update(crud_info : PostgreSQL.BulkUpdate | MongoDB.BulkUpdate, print_data : bool = False) -> Bulk_Write_Result | JSONResponse:
+    """
+    Función para actualizar un lote de registros identificados por sus llaves
+    
+    En PostgreSQL se ejecuta un "UPDATE ... FROM (VALUES ...)" por cada página de "page_size" filas; las filas iguales a las existentes no se reescriben. En MongoDB se usa "bulk_write(ordered=False)" con un "UpdateOne" ("$set") o "ReplaceOne" por documento, por bloques de "chunk_size".
+    
+    Parameters
+    ----------
+    crud_info : database.model.database_crud_info.PostgreSQL.BulkUpdate | database.model.database_crud_info.MongoDB.BulkUpdate
+        Información del CRUD a realizar
+    
+    print_data : bool = False
+        Encargado de mostrar o no la información al momento de realizar el CRUD
+    
+    Returns
+    -------
+    Bulk_Write_Result
+        Registros encontrados y modificados, en total y por bloque
+        
+    JSONResponse
+        Respuesta en formato JSON en caso de haber error
+    """
+    return _after_write(crud_info, _BULK_UPDATE[crud_info.database_type](crud_info, print_data))
+
+def bulk_upsert(crud_info : PostgreSQL.BulkUpsert | MongoDB.BulkUpsert, print_data : bool = False) -> Bulk_Write_Result | JSONResponse:
+    """
+    Función para actualizar un lote de registros identificados por sus llaves, creando los que no existan
+    
+    En PostgreSQL se ejecuta un "INSERT ... ON CONFLICT (llaves) DO UPDATE" por cada página de "page_size" filas (si una llave se repite en la página prevalece la última fila). En MongoDB se usa "bulk_write(ordered=False)" con "upsert=True", por bloques de "chunk_size".
+    
+    Parameters
+    ----------
+    crud_info : database.model.database_crud_info.PostgreSQL.BulkUpsert | database.model.database_crud_info.MongoDB.BulkUpsert
+        Información del CRUD a realizar
+    
+    print_data : bool = False
+        Encargado de mostrar o no la información al momento de realizar el CRUD
+    
+    Returns
+    -------
+    Bulk_Write_Result
+        Registros encontrados, modificados y creados (con los "_id" creados en MongoDB), en total y por bloque
+        
+    JSONResponse
+        Respuesta en formato JSON en caso de haber error
+    """
+    return _after_write(crud_info, _BULK_UPSERT[crud_info.database_type](crud_info, print_data))
+
+def select(crud_info : PostgreSQL.Select | MongoDB.Select, print_data : bool = False, cache_ttl : float | None = None, cache_tags : list[str] | None = None, coalesce : bool = False) -> list | Page | JSONResponse:
     """
     Función para retornar una consulta a una base de datos
     
+    Si la base de datos tiene réplicas ("replicas" en PostgreSQL, "read_preference" en MongoDB) la lectura se hace en una réplica, salvo dentro de una transacción, con cambios sin confirmar en la conexión o luego de escribir dentro de "read_your_writes". Las réplicas PostgreSQL se eligen según su latencia observada y se excluyen temporalmente si fallan; si la réplica elegida falla, la lectura se hace en el primario.
+    
+    Con "page_size" y "keyset" se pagina por llave: la consulta se ordena por las columnas/campos de "keyset" y cada página continúa después del último registro de la anterior ("page_token" = "next_page_token" de la página anterior), por lo que las páginas profundas cuestan lo mismo que la primera. "columns" (PostgreSQL) y "projection" (MongoDB) limitan los campos que se traen de la base de datos.
+    
     Parameters
     ----------
     crud_info : database.model.database_crud_info.PostgreSQL.Select | database.model.database_crud_info.MongoDB.Select
@@ -123,18 +597,695 @@ def select(crud_info : PostgreSQL.Select | MongoDB.Select, print_data : bool = F
     print_data : bool = False
         Encargado de mostrar o no la información al momento de realizar el CRUD
     
+    cache_ttl : float | None = None
+        Segundos que el resultado permanece en la caché de resultados. Si es None no se usa la caché. Solo aplica a conexiones obtenidas con "get_database_connection". Las escrituras invalidan la caché al ejecutarse y otra vez al confirmarse (con "transaction" o con commit() en las conexiones del pool)
+    
+    cache_tags : list[str] | None = None
+        Tags adicionales a las tablas/colecciones leídas, para invalidar el resultado con "invalidate_result_cache". Las tablas se detectan en cada FROM/JOIN, incluidas las listas separadas por comas y las subconsultas; las que no se detectan (por ejemplo, una tabla agregada con coma después de un "JOIN ... ON" o leída dentro de una función o vista) deben indicarse aquí para que sus escrituras invaliden el resultado
+    
+    coalesce : bool = False
+        Si ya hay en curso una consulta idéntica (misma llave de configuración, consulta y parámetros) hecha también con "coalesce", esperar su resultado en lugar de consultar a la base de datos. Cada llamada recibe una copia independiente. Si la espera supera el tiempo definido con "configure_select_coalescing" se consulta igualmente. Solo aplica a conexiones obtenidas con "get_database_connection", fuera de transacciones y de "read_your_writes" luego de escribir
+    
     Returns
     -------
     list
-        Lista de registros de la consulta realizada
-        
+        Lista de registros de la consulta realizada ("result_format" Result_Format.RECORDS, por defecto)
+
+    Tabular_Result
+        Nombres de columna y registros como tuplas (Result_Format.TUPLES)
+
+    dict[str, list | array.array | numpy.ndarray]
+        Valores por columna (Result_Format.COLUMNAR, Result_Format.ARRAY y Result_Format.NUMPY)
+
+    Page
+        Registros (en el formato anterior) y "next_page_token" si se definió "page_size"
+
     JSONResponse
         Respuesta en formato JSON en caso de haber error
     """
-    if isinstance(crud_info, PostgreSQL.Select):
-        return postgresql.PostgreSQL.select(conn=crud_info.conn, query=crud_info.query, vars=crud_info.vars, print_data=print_data)
-    if isinstance(crud_info, MongoDB.Select):
-        return mongodb.MongoDB.select(conn=crud_info.conn, collection_name=crud_info.collection_name, query=crud_info.query, aggregate_pipeline=crud_info.aggregate_pipeline, sort=crud_info.sort, print_data=print_data)
+    # Dentro de una transacción no se usa la caché: la consulta debe ver los cambios aún sin confirmar
+    if (cache_ttl is not None or coalesce) and database_transaction.current(crud_info.conn) is None:
+        database_config_key = registry.get_database_config_key(crud_info.conn)
+        if database_config_key is not None:
+            key = _select_key(database_config_key, crud_info)
+            if cache_ttl is not None:
+                return _cached_select(key, crud_info, print_data, cache_ttl, cache_tags, coalesce)
+            if not _wrote_recently(database_config_key):
+                return select_flight.do(key, lambda: _select(crud_info, print_data))
+    returnValue = _select(crud_info, print_data)
+    if is_error_response(returnValue):
+        database_transaction.mark_failed(crud_info.conn, returnValue)
+    return returnValue
+
+def _select(crud_info : PostgreSQL.Select | MongoDB.Select, print_data : bool) -> list | Page | JSONResponse:
+    after, page_fingerprint = None, None
+    if crud_info.page_size is not None:
+        try:
+            after, page_fingerprint = _page_position(crud_info)
+        except ValueError as e:
+            return error_response(str(e), 400)
+    if crud_info.database_type is Database_Type.POSTGRESQL:
+        read_replica = _read_replica(crud_info.conn)
+        if read_replica is not None:
+            replica, conn = read_replica
+            started = time.perf_counter()
+            returnValue = _postgresql_select(conn, crud_info, print_data, after, page_fingerprint)
+            # Si se perdió la conexión con la réplica la lectura se repite en el primario
+            failed = is_error_response(returnValue) and conn.closed != 0
+            replica_router.release(replica, conn, time.perf_counter() - started, failed=failed)
+            if not failed:
+                return returnValue
+        return _postgresql_select(crud_info.conn, crud_info, print_data, after, page_fingerprint)
+    if crud_info.database_type is Database_Type.MONGODB:
+        database_config_key = _read_routing_key(crud_info.conn)
+        database_config = environment.FRACTUREX_MODULE_DATABASE_CONFIG.get(database_config_key) if database_config_key is not None else None
+        return _backend(Database_Type.MONGODB).select(conn=crud_info.conn, collection_name=crud_info.collection_name, query=crud_info.query, aggregate_pipeline=crud_info.aggregate_pipeline, sort=crud_info.sort, print_data=print_data, projection=crud_info.projection, result_format=crud_info.result_format, limit=crud_info.limit, skip=crud_info.skip, batch_size=crud_info.batch_size, keyset=crud_info.keyset, descending=crud_info.descending, page_size=crud_info.page_size, after=after, page_fingerprint=page_fingerprint, read_preference=database_config.read_preference if database_config is not None else None)
+
+def _postgresql_select(conn : psycopg2.extensions.connection, crud_info : PostgreSQL.Select, print_data : bool, after : tuple | None, page_fingerprint : str | None) -> list | Page | JSONResponse:
+    return _backend(Database_Type.POSTGRESQL).select(conn=conn, query=crud_info.query, vars=crud_info.vars, print_data=print_data, result_format=crud_info.result_format, columns=crud_info.columns, keyset=crud_info.keyset, descending=crud_info.descending, page_size=crud_info.page_size, after=after, page_fingerprint=page_fingerprint)
+
+def _read_routing_key(conn : psycopg2.extensions.connection | MongoClient) -> str | None:
+    # Llave de la conexión si la lectura puede ir a una réplica: fuera de una transacción y sin escrituras recientes en el alcance de "read_your_writes"
+    if database_transaction.current(conn) is not None:
+        return None
+    database_config_key = registry.get_database_config_key(conn)
+    if database_config_key is None or _wrote_recently(database_config_key):
+        return None
+    return database_config_key
+
+def _read_replica(conn : psycopg2.extensions.connection) -> tuple[Any, psycopg2.extensions.connection] | None:
+    from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+
+    # Con cambios sin confirmar en la conexión la lectura debe verlos, por lo que se hace en el primario
+    if conn.info.transaction_status != TRANSACTION_STATUS_IDLE:
+        return None
+    database_config_key = _read_routing_key(conn)
+    if database_config_key is None:
+        return None
+    database_config = environment.FRACTUREX_MODULE_DATABASE_CONFIG.get(database_config_key)
+    if database_config is None or not database_config.replicas:
+        return None
+    return replica_router.acquire(database_config_key, database_config)
+
+@contextmanager
+def read_your_writes(window : float | None = None) -> Iterator[None]:
+    """
+    Context manager dentro del cual las lecturas de una base de datos en la que ya se escribió van al primario y no a las réplicas
+    
+    Pensado para abarcar una petición o un flujo de trabajo: fuera del bloque (o antes de la primera escritura) las lecturas se reparten entre las réplicas, que pueden no tener aún los cambios. Funciona también en código asíncrono ("async_service"), por tarea. Los bloques anidados usan el alcance del más externo.
+    
+    Parameters
+    ----------
+    window : float | None = None
+        Segundos, desde la última escritura, durante los que se lee del primario. Si es None, hasta el final del bloque
+    """
+    if _recent_writes.get() is not None:
+        yield
+        return
+    token = _recent_writes.set(({}, window))
+    try:
+        yield
+    finally:
+        _recent_writes.reset(token)
+
+def _wrote_recently(database_config_key : str) -> bool:
+    scope = _recent_writes.get()
+    if scope is None:
+        return False
+    writes, window = scope
+    written = writes.get(database_config_key)
+    return written is not None and (window is None or time.monotonic() - written < window)
+
+def get_replica_stats() -> list[Replica_Stats]:
+    """
+    Función para retornar las estadísticas de las réplicas de lectura PostgreSQL (latencia promedio, lecturas en curso, fallos y exclusión)
+    
+    Returns
+    -------
+    list[Replica_Stats]
+        Estadísticas de cada réplica usada desde el inicio del proceso
+    """
+    return replica_router.stats()
+
+def _page_position(crud_info : PostgreSQL.Select | MongoDB.Select) -> tuple[tuple | None, str]:
+    # Retorna los valores de la llave del último registro de la página anterior (None en la primera) y la huella de la consulta
+    if not crud_info.keyset:
+        raise ValueError("page_size requiere keyset")
+    if crud_info.page_size < 1:
+        raise ValueError("page_size debe ser mayor que 0")
+    if crud_info.database_type is Database_Type.POSTGRESQL:
+        keys = crud_info.keyset
+        page_fingerprint = pagination.fingerprint(crud_info.query, crud_info.vars, keys, crud_info.descending)
+    else:
+        keys = pagination.mongodb_keys(crud_info.keyset)
+        page_fingerprint = pagination.fingerprint(crud_info.collection_name, crud_info.query, crud_info.aggregate_pipeline, keys, crud_info.descending)
+    after = pagination.decode_token(crud_info.page_token, page_fingerprint, len(keys)) if crud_info.page_token else None
+    return after, page_fingerprint
+
+def _select_key(database_config_key : str, crud_info : PostgreSQL.Select | MongoDB.Select) -> str:
+    # Llave de la caché de resultados y del agrupamiento de consultas idénticas
+    if crud_info.database_type is Database_Type.POSTGRESQL:
+        return result_cache.make_key(database_config_key, Database_Type.POSTGRESQL.value, crud_info.query, crud_info.vars, crud_info.result_format.value, crud_info.columns, crud_info.keyset, crud_info.descending, crud_info.page_size, crud_info.page_token)
+    return result_cache.make_key(database_config_key, Database_Type.MONGODB.value, crud_info.collection_name, crud_info.query, crud_info.aggregate_pipeline, crud_info.sort, crud_info.projection, crud_info.result_format.value, crud_info.limit, crud_info.skip, crud_info.keyset, crud_info.descending, crud_info.page_size, crud_info.page_token)
+
+def _coalescing_key(crud_info : PostgreSQL.Select | MongoDB.Select) -> str | None:
+    # Llave con la que "select(coalesce=True)" agrupa la consulta, o None si no se puede agrupar
+    if database_transaction.current(crud_info.conn) is not None:
+        return None
+    database_config_key = registry.get_database_config_key(crud_info.conn)
+    if database_config_key is None or _wrote_recently(database_config_key):
+        return None
+    return _select_key(database_config_key, crud_info)
+
+def _cached_select(key : str, crud_info : PostgreSQL.Select | MongoDB.Select, print_data : bool, cache_ttl : float, cache_tags : list[str] | None, coalesce : bool) -> list | JSONResponse:
+    if crud_info.database_type is Database_Type.POSTGRESQL:
+        tags = postgresql_tags(crud_info.query)
+    else:
+        tags = mongodb_tags(crud_info.collection_name, crud_info.aggregate_pipeline)
+    tags = tags.union(cache_tags or ())
+    found, returnValue = result_cache.get(key)
+    if found:
+        return returnValue
+    # Si una escritura invalida alguno de los tags durante la consulta, el resultado no se guarda
+    generations = result_cache.generations(tags)
+    returnValue = select_flight.do(key, lambda: _select(crud_info, print_data)) if coalesce else _select(crud_info, print_data)
+    if not is_error_response(returnValue):
+        result_cache.set(key, returnValue, cache_ttl, tags, generations)
+    return returnValue
+
+def _resolve_write_tags(crud_info : Any) -> Callable[[Any], Iterable[str]] | None:
+    # Función que obtiene las tablas/colecciones escritas; se resuelve una vez por clase (modelo o descriptor)
+    if hasattr(crud_info, "table_name"):
+        return lambda crud_info: postgresql_tags(f"INSERT INTO {crud_info.table_name}", write=True)
+    if hasattr(crud_info, "query") and crud_info.database_type is Database_Type.POSTGRESQL:
+        return lambda crud_info: postgresql_tags(crud_info.query, write=True)
+    if hasattr(crud_info, "collection_name"):
+        return lambda crud_info: {crud_info.collection_name}
+    return None
+
+def _after_write(crud_info : BaseModel | Crud_Descriptor, returnValue : Any) -> Any:
+    if is_error_response(returnValue):
+        # Dentro de "transaction" un error hace que la transacción se deshaga al salir
+        database_transaction.mark_failed(crud_info.conn, returnValue)
+        return returnValue
+    scope = _recent_writes.get()
+    if scope is not None:
+        database_config_key = registry.get_database_config_key(crud_info.conn)
+        if database_config_key is not None:
+            scope[0][database_config_key] = time.monotonic()
+    # Las escrituras exitosas descartan los resultados en caché de las tablas/colecciones afectadas
+    try:
+        write_tags = _write_tags[type(crud_info)]
+    except KeyError:
+        write_tags = _write_tags[type(crud_info)] = _resolve_write_tags(crud_info)
+    if write_tags is None:
+        return returnValue
+    tags = write_tags(crud_info)
+    result_cache.invalidate(tags)
+    # Descartar también lo que otros lean y guarden en caché antes de confirmar
+    current_transaction = database_transaction.current(crud_info.conn)
+    if current_transaction is not None:
+        current_transaction.after_commit(lambda: result_cache.invalidate(tags))
+    else:
+        # Con autocommit desactivado la escritura se confirma cuando quien tiene la conexión llama a commit()
+        database_transaction.after_implicit_commit(crud_info.conn, lambda: result_cache.invalidate(tags))
+    return returnValue
+
+def invalidate_result_cache(tags : list[str]) -> int:
+    """
+    Función para descartar de la caché de resultados las entradas con alguno de los tags indicados
+    
+    Parameters
+    ----------
+    tags : list[str]
+        Nombres de tablas/colecciones (sin esquema) o tags indicados en "cache_tags"
+    
+    Returns
+    -------
+    int
+        Cantidad de entradas descartadas
+    """
+    return result_cache.invalidate(tags)
+
+def get_result_cache_stats() -> Cache_Stats:
+    """
+    Función para retornar las métricas de la caché de resultados (entradas, bytes, aciertos, fallos y tasa de aciertos)
+    """
+    return result_cache.stats()
+
+def configure_select_coalescing(wait_timeout : float = 10.0) -> None:
+    """
+    Función para definir cuánto espera "select(coalesce=True)" el resultado de una consulta idéntica en curso
+    
+    Parameters
+    ----------
+    wait_timeout : float = 10.0
+        Segundos de espera máxima; al superarse la consulta se hace en la base de datos
+    """
+    select_flight.wait_timeout = wait_timeout
+
+def get_select_coalescing_stats() -> Single_Flight_Stats:
+    """
+    Función para retornar las consultas ejecutadas y las que recibieron el resultado de otra en curso con "select(coalesce=True)"
+    
+    Returns
+    -------
+    Single_Flight_Stats
+        Contadores acumulados del proceso
+    """
+    return select_flight.stats()
+
+def select_stream(crud_info : PostgreSQL.Select | MongoDB.Select, batch_size : int = 2000, print_data : bool = False) -> Iterator[dict] | JSONResponse:
+    """
+    Función para recorrer una consulta a una base de datos sin cargar todos los registros en memoria
+    
+    En PostgreSQL se usa un cursor del lado del servidor y en MongoDB se itera el cursor por lotes. El cursor se cierra al agotar el generador o al cerrarlo (por ejemplo, con "contextlib.closing" o al salir de un "for" con "break" y descartar el generador).
+    
+    Parameters
+    ----------
+    crud_info : database.model.database_crud_info.PostgreSQL.Select | database.model.database_crud_info.MongoDB.Select
+        Información del CRUD a realizar
+    
+    batch_size : int = 2000
+        Cantidad de registros que se traen de la base de datos por cada viaje ("itersize" en PostgreSQL, "batch_size" en MongoDB)
+    
+    print_data : bool = False
+        Encargado de mostrar o no la información al momento de realizar el CRUD
+    
+    Returns
+    -------
+    Iterator[dict]
+        Generador de los registros de la consulta realizada
+        
+    JSONResponse
+        Respuesta en formato JSON en caso de haber error al ejecutar la consulta
+    """
+    if crud_info.database_type is Database_Type.POSTGRESQL:
+        returnValue = _backend(Database_Type.POSTGRESQL).select_stream(conn=crud_info.conn, query=crud_info.query, vars=crud_info.vars, itersize=batch_size, print_data=print_data)
+    elif crud_info.database_type is Database_Type.MONGODB:
+        returnValue = _backend(Database_Type.MONGODB).select_stream(conn=crud_info.conn, collection_name=crud_info.collection_name, query=crud_info.query, aggregate_pipeline=crud_info.aggregate_pipeline, sort=crud_info.sort, batch_size=batch_size, print_data=print_data)
+    if is_error_response(returnValue):
+        database_transaction.mark_failed(crud_info.conn, returnValue)
+    return returnValue
+
+def select_many(database_config_keys : list[str], crud_info : PostgreSQL.Select | MongoDB.Select, merge : Merge_Strategy = Merge_Strategy.CONCAT, sort_key : str | None = None, descending : bool = False, limit : int | None = None, timeout : float | None = None, print_data : bool = False) -> Fan_Out_Result | JSONResponse:
+    """
+    Función para ejecutar la misma consulta en varias bases de datos a la vez (por ejemplo, una por tenant) y mezclar los resultados
+    
+    Cada consulta usa una conexión del pool de su llave ("conn" de "crud_info" se reemplaza; la plantilla puede construirse con "PostgreSQL.Select.model_construct(query=...)") y corre en un ejecutor acotado ("configure_fan_out_executor"), por lo que la latencia es cercana a la de la base de datos más lenta. Una base de datos que falla o no responde a tiempo no hace fallar la llamada: se reporta en "shards" y "partial".
+    
+    Parameters
+    ----------
+    database_config_keys : list[str]
+        Llaves del registro de las bases de datos donde se ejecuta la consulta (todas del mismo motor que "crud_info")
+    
+    crud_info : database.model.database_crud_info.PostgreSQL.Select | database.model.database_crud_info.MongoDB.Select
+        Información del CRUD a realizar. Solo se admite Result_Format.RECORDS
+    
+    merge : Merge_Strategy = Merge_Strategy.CONCAT
+        Forma de mezclar los registros: CONCAT (en el orden de las llaves), SORTED (k-way por "sort_key") o FIRST_N (los primeros "limit" en llegar, cancelando el resto)
+    
+    sort_key : str | None = None
+        Llave del registro por la que se ordena con Merge_Strategy.SORTED
+    
+    descending : bool = False
+        Orden descendente con Merge_Strategy.SORTED
+    
+    limit : int | None = None
+        Cantidad máxima de registros retornados (obligatorio con Merge_Strategy.FIRST_N)
+    
+    timeout : float | None = None
+        Segundos que se espera a cada base de datos, contados desde que su consulta empieza a ejecutarse (no cuenta la espera por un hilo libre del ejecutor). Las consultas PostgreSQL que lo exceden se cancelan en el servidor
+    
+    print_data : bool = False
+        Encargado de mostrar o no la información al momento de realizar el CRUD
+    
+    Returns
+    -------
+    Fan_Out_Result
+        Registros mezclados y el resultado de cada base de datos (registros, tiempo, error, si excedió el tiempo o se canceló)
+    
+    JSONResponse
+        Respuesta en formato JSON en caso de que los parámetros no sean válidos
+    """
+    if crud_info.result_format is not Result_Format.RECORDS:
+        return error_response("select_many solo admite Result_Format.RECORDS", 400)
+    if crud_info.page_size is not None:
+        return error_response("select_many no admite page_size; use limit con Merge_Strategy.SORTED", 400)
+    if merge is Merge_Strategy.SORTED and sort_key is None:
+        return error_response("Merge_Strategy.SORTED requiere sort_key", 400)
+    if merge is Merge_Strategy.FIRST_N and limit is None:
+        return error_response("Merge_Strategy.FIRST_N requiere limit", 400)
+
+    started = time.perf_counter()
+    executor = fan_out.get_executor()
+    calls: dict[Future, fan_out.Shard_Call] = {}
+    for database_config_key in dict.fromkeys(database_config_keys):
+        call = fan_out.Shard_Call(database_config_key)
+        calls[executor.submit(_select_shard, call, crud_info, print_data)] = call
+
+    keys = [call.database_config_key for call in calls.values()]
+    shards: dict[str, Shard_Result] = {}
+    shard_rows: dict[str, list] = {}
+    arrived: list[list] = []
+    collected = 0
+    pending = set(calls)
+    expired: set[Future] = set()
+    while pending:
+        remaining = None
+        if timeout is not None:
+            # El tiempo de cada base de datos corre desde que su consulta empieza; las que siguen en la cola
+            # del ejecutor no pueden vencer antes de "timeout" segundos desde ahora
+            now = time.perf_counter()
+            for future in [future for future in pending if not future.done() and calls[future].started is not None and now - calls[future].started >= timeout]:
+                pending.discard(future)
+                expired.add(future)
+            if not pending:
+                break
+            remaining = max(0.0, min([timeout, *(calls[future].started + timeout - now for future in pending if calls[future].started is not None)]))
+        done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+        for future in done:
+            shard, rows = future.result()
+            shards[shard.database_config_key] = shard
+            if shard.success:
+                shard_rows[shard.database_config_key] = rows
+                arrived.append(rows)
+                collected += len(rows)
+        if merge is Merge_Strategy.FIRST_N and collected >= limit:
+            break
+
+    # Las consultas restantes exceden el tiempo o ya no hacen falta (FIRST_N completo)
+    for future in expired | pending:
+        call = calls[future]
+        timed_out = future in expired
+        future.cancel()
+        call.cancel()
+        shards[call.database_config_key] = Shard_Result(
+            database_config_key=call.database_config_key,
+            elapsed=time.perf_counter() - (call.started if call.started is not None else started),
+            timed_out=timed_out,
+            cancelled=not timed_out,
+            error="Tiempo de espera agotado" if timed_out else None
+        )
+
+    try:
+        if merge is Merge_Strategy.SORTED:
+            rows = fan_out.merge_sorted((shard_rows[key] for key in keys if key in shard_rows), sort_key, descending=descending, limit=limit)
+        elif merge is Merge_Strategy.FIRST_N:
+            rows = fan_out.concat(arrived, limit=limit)
+        else:
+            rows = fan_out.concat((shard_rows[key] for key in keys if key in shard_rows), limit=limit)
+    except (KeyError, TypeError) as e:
+        return error_response(f"No se pudieron mezclar los registros por {sort_key}: {str(e)}", 400)
+
+    ordered_shards = [shards[key] for key in keys]
+    # Los registros ya vienen validados por cada consulta; model_construct evita copiarlos de nuevo
+    return Fan_Out_Result.model_construct(
+        rows=rows,
+        shards=ordered_shards,
+        elapsed=time.perf_counter() - started,
+        partial=any(not shard.success and not shard.cancelled for shard in ordered_shards)
+    )
+
+def _select_shard(call : fan_out.Shard_Call, crud_info : PostgreSQL.Select | MongoDB.Select, print_data : bool) -> tuple[Shard_Result, list]:
+    call.start()
+    started = call.started
+    shard = Shard_Result(database_config_key=call.database_config_key)
+    rows: list = []
+    try:
+        database_config = environment.FRACTUREX_MODULE_DATABASE_CONFIG.get(call.database_config_key)
+        if database_config is None or database_config.type is not crud_info.database_type:
+            shard.error = f"Sin registro de base de datos {crud_info.database_type.value}"
+            return shard, rows
+        conn = get_database_connection(call.database_config_key)
+        if is_error_response(conn):
+            shard.error = error_message(conn)
+            return shard, rows
+        try:
+            if not call.attach(conn):
+                shard.cancelled = True
+                return shard, rows
+            try:
+                returnValue = select(crud_info.model_copy(update={"conn": conn}), print_data=print_data)
+            finally:
+                call.detach()
+        finally:
+            release_database_connection(conn)
+        if is_error_response(returnValue):
+            shard.error = error_message(returnValue)
+        else:
+            rows = returnValue
+            shard.success = True
+            shard.row_count = len(rows)
+    except Exception as e:
+        shard.error = str(e)
+    finally:
+        shard.elapsed = time.perf_counter() - started
+    return shard, rows
+
+def configure_fan_out_executor(max_workers : int | None = None) -> None:
+    """
+    Función para definir la cantidad máxima de consultas que "select_many" ejecuta a la vez
+    
+    Parameters
+    ----------
+    max_workers : int | None = None
+        Cantidad máxima de hilos. Por defecto min(32, núcleos + 4)
+    """
+    fan_out.configure_executor(max_workers)
+
+def export(crud_info : PostgreSQL.Export | MongoDB.Export, print_data : bool = False) -> Export_Result | JSONResponse:
+    """
+    Función para exportar el resultado de una consulta directamente a un archivo, sin construir los registros en Python
+    
+    En PostgreSQL se usa "COPY (query) TO STDOUT" en el formato pedido (CSV, texto o binario) y psycopg2 escribe lo que recibe en "file". En MongoDB los lotes llegan como BSON sin decodificar ("find_raw_batches"/"aggregate_raw_batches") y se escriben concatenados, en el formato de mongodump (se leen con "bson.decode_file_iter"). "file" puede ser un archivo abierto en modo binario, un io.BytesIO o un mmap.mmap con espacio suficiente.
+    
+    Parameters
+    ----------
+    crud_info : database.model.database_crud_info.PostgreSQL.Export | database.model.database_crud_info.MongoDB.Export
+        Información del CRUD a realizar
+    
+    print_data : bool = False
+        Encargado de mostrar o no la información al momento de realizar el CRUD
+    
+    Returns
+    -------
+    Export_Result
+        Formato, cantidad de registros y bytes escritos
+    
+    JSONResponse
+        Respuesta en formato JSON en caso de haber error (lo escrito hasta el error queda en el archivo)
+    """
+    if crud_info.database_type is Database_Type.POSTGRESQL:
+        returnValue = _backend(Database_Type.POSTGRESQL).export(conn=crud_info.conn, query=crud_info.query, file=crud_info.file, vars=crud_info.vars, format=crud_info.format, header=crud_info.header, print_data=print_data)
+    elif crud_info.database_type is Database_Type.MONGODB:
+        returnValue = _backend(Database_Type.MONGODB).export(conn=crud_info.conn, collection_name=crud_info.collection_name, file=crud_info.file, query=crud_info.query, aggregate_pipeline=crud_info.aggregate_pipeline, sort=crud_info.sort, projection=crud_info.projection, batch_size=crud_info.batch_size, print_data=print_data)
+    if is_error_response(returnValue):
+        database_transaction.mark_failed(crud_info.conn, returnValue)
+    return returnValue
+
+# Buffers de escritura diferida, por llave de configuración y tabla/colección
+_write_behind_buffers: dict[tuple[str, str], Any] = {}
+# Columnas de cada buffer PostgreSQL (definidas al configurar o tomadas del primer registro)
+_write_behind_columns: dict[tuple[str, str], list[str] | None] = {}
+_write_behind_lock = threading.Lock()
+_write_behind_atexit = False
+
+def configure_write_behind(database_config_key : str, target : str, columns : list[str] | None = None, batch_size : int = 1000, flush_interval : float = 1.0, max_buffered : int = 100000, overflow : Overflow_Policy = Overflow_Policy.BLOCK, block_timeout : float | None = None, spill_path : str | None = None) -> None | JSONResponse:
+    """
+    Función para configurar el buffer de escritura diferida de una tabla/colección usado por "insert_behind"
+    
+    Un hilo por buffer escribe los registros con "bulk_insert" (INSERT multi-fila o COPY en PostgreSQL, "insert_many" en MongoDB) en lotes de "batch_size", o antes si el registro más antiguo cumple "flush_interval" segundos en el buffer. En PostgreSQL cada lote se confirma por separado. Si ya existía un buffer para la tabla/colección, se escribe lo pendiente y se reemplaza.
+    
+    Parameters
+    ----------
+    database_config_key : str
+        Llave de la configuración de la base de datos en el archivo .env
+    
+    target : str
+        Tabla (PostgreSQL, admite "esquema.tabla") o colección (MongoDB)
+    
+    columns : list[str] | None = None
+        Columnas de cada registro (PostgreSQL). Si es None se conservan las ya definidas para la tabla o se toman de las llaves del primer registro encolado como diccionario
+    
+    batch_size : int = 1000
+        Registros por escritura
+    
+    flush_interval : float = 1.0
+        Segundos máximos que un registro espera en el buffer
+    
+    max_buffered : int = 100000
+        Registros máximos en memoria
+    
+    overflow : Overflow_Policy = Overflow_Policy.BLOCK
+        Qué hacer con el buffer lleno: esperar (BLOCK, hasta "block_timeout"), descartar (DROP) o agregar a "spill_path" (SPILL)
+    
+    block_timeout : float | None = None
+        Segundos máximos de espera con Overflow_Policy.BLOCK; al superarse el registro se descarta. None espera indefinidamente
+    
+    spill_path : str | None = None
+        Archivo local donde se guardan los registros desbordados y los lotes que no se pudieron escribir, para reintentarlos (también luego de reiniciar el proceso)
+    
+    Returns
+    -------
+    None
+        Si el buffer quedó configurado
+    
+    JSONResponse
+        Respuesta en formato JSON si la llave no existe o la configuración no es válida
+    """
+    buffer = _new_write_behind_buffer(database_config_key, target, batch_size=batch_size, flush_interval=flush_interval, max_buffered=max_buffered, overflow=overflow, block_timeout=block_timeout, spill_path=spill_path)
+    if is_error_response(buffer):
+        return buffer
+    with _write_behind_lock:
+        # Sin "columns" se conservan las ya definidas o tomadas de un registro
+        if columns is not None or (database_config_key, target) not in _write_behind_columns:
+            _write_behind_columns[(database_config_key, target)] = columns
+        previous = _write_behind_buffers.get((database_config_key, target))
+        _register_write_behind_buffer(database_config_key, target, buffer)
+    if previous is not None:
+        previous.close()
+    return None
+
+def _new_write_behind_buffer(database_config_key : str, target : str, **options : Any) -> Any:
+    # Crea (e inicia) un buffer; retorna un JSONResponse si la llave no existe o la configuración no es válida
+    database_config = environment.FRACTUREX_MODULE_DATABASE_CONFIG.get(database_config_key)
+    if database_config is None or database_config.type is None:
+        return error_response("Sin registro de base de datos")
+    from fracturex_module_database.infrastructure.write_behind import Write_Behind_Buffer
+
+    database_type = database_config.type
+    try:
+        return Write_Behind_Buffer(
+            database_config_key,
+            target,
+            lambda rows: _write_behind(database_config_key, database_type, target, rows),
+            database_type=database_type,
+            **options
+        )
+    except (ValueError, OSError) as e:
+        return error_response(f"There was an error: {str(e)}", 400)
+
+def _register_write_behind_buffer(database_config_key : str, target : str, buffer : Any) -> None:
+    # Se llama con "_write_behind_lock" tomado
+    global _write_behind_atexit
+    _write_behind_buffers[(database_config_key, target)] = buffer
+    if not _write_behind_atexit:
+        # Escribir lo pendiente al terminar el proceso
+        _write_behind_atexit = True
+        atexit.register(close_write_behind)
+
+def insert_behind(database_config_key : str, target : str, row : tuple | dict) -> bool | JSONResponse:
+    """
+    Función para encolar la inserción de un registro en el buffer de escritura diferida de la tabla/colección y retornar de inmediato
+    
+    El registro se escribe más tarde desde otro hilo: los errores de escritura no se informan al llamador sino en "get_write_behind_stats" y en el logger del módulo. Si la tabla/colección no tiene un buffer configurado se crea uno con los valores por defecto de "configure_write_behind".
+    
+    Parameters
+    ----------
+    database_config_key : str
+        Llave de la configuración de la base de datos en el archivo .env
+    
+    target : str
+        Tabla (PostgreSQL) o colección (MongoDB)
+    
+    row : tuple | dict
+        Registro a insertar: tupla en el orden de "columns" o diccionario (PostgreSQL), o documento (MongoDB)
+    
+    Returns
+    -------
+    bool
+        True si el registro quedó encolado (o desbordado al archivo), False si se descartó por estar el buffer lleno
+    
+    JSONResponse
+        Respuesta en formato JSON si la llave no existe o el buffer está cerrado
+    """
+    buffer = _write_behind_buffers.get((database_config_key, target))
+    if buffer is None:
+        with _write_behind_lock:
+            # Se crea dentro del lock: las llamadas concurrentes usan el mismo buffer y nunca se reemplaza uno existente
+            buffer = _write_behind_buffers.get((database_config_key, target))
+            if buffer is None:
+                buffer = _new_write_behind_buffer(database_config_key, target)
+                if is_error_response(buffer):
+                    return buffer
+                _write_behind_columns.setdefault((database_config_key, target), None)
+                _register_write_behind_buffer(database_config_key, target, buffer)
+    if buffer.database_type is Database_Type.POSTGRESQL:
+        columns = _write_behind_columns.get((database_config_key, target))
+        if columns is None and not isinstance(row, dict):
+            return error_response(f"El buffer de \"{target}\" no tiene \"columns\" configuradas", 400)
+        if isinstance(row, dict):
+            if columns is None:
+                with _write_behind_lock:
+                    columns = _write_behind_columns.get((database_config_key, target)) or list(row)
+                    _write_behind_columns[(database_config_key, target)] = columns
+            row = tuple(row.get(column) for column in columns)
+    elif isinstance(row, dict):
+        # Copia: el documento se escribe después y "insert_many" le agrega el "_id"
+        row = dict(row)
+    try:
+        return buffer.put(row)
+    except RuntimeError as e:
+        return error_response(f"There was an error: {str(e)}")
+
+def _write_behind(database_config_key : str, database_type : Database_Type, target : str, rows : list) -> int:
+    # Escribe un lote del buffer con una conexión del pool; lanza una excepción si el lote no se pudo escribir
+    conn = get_database_connection(database_config_key)
+    if is_error_response(conn):
+        raise ConnectionError(error_message(conn))
+    discard = False
+    try:
+        if database_type is Database_Type.POSTGRESQL:
+            result = _backend(Database_Type.POSTGRESQL).bulk_insert(conn=conn, table_name=target, columns=_write_behind_columns[(database_config_key, target)], rows=rows)
+        else:
+            result = _backend(Database_Type.MONGODB).bulk_insert(conn=conn, collection_name=target, documents=rows)
+        if is_error_response(result):
+            discard = database_type is Database_Type.POSTGRESQL and conn.closed != 0
+            raise RuntimeError(error_message(result))
+        if database_type is Database_Type.POSTGRESQL:
+            conn.commit()
+        result_cache.invalidate(postgresql_tags(f"INSERT INTO {target}", write=True) if database_type is Database_Type.POSTGRESQL else {target})
+        return result.inserted_count
+    finally:
+        release_database_connection(conn, discard=discard)
+
+def flush_write_behind() -> int:
+    """
+    Función para escribir de inmediato lo encolado en todos los buffers de escritura diferida
+    
+    Returns
+    -------
+    int
+        Cantidad de registros escritos
+    """
+    return sum(buffer.flush() for buffer in list(_write_behind_buffers.values()))
+
+def close_write_behind(timeout : float | None = 30.0) -> None:
+    """
+    Función para escribir lo pendiente y detener los buffers de escritura diferida; se ejecuta también al terminar el proceso
+    
+    Parameters
+    ----------
+    timeout : float | None = 30.0
+        Segundos máximos de espera por cada buffer
+    """
+    with _write_behind_lock:
+        buffers = list(_write_behind_buffers.values())
+        _write_behind_buffers.clear()
+    for buffer in buffers:
+        buffer.close(timeout)
+
+def get_write_behind_stats() -> list[Write_Behind_Stats]:
+    """
+    Función para retornar los registros encolados, escritos, fallidos, descartados y desbordados, y las latencias de cada buffer de escritura diferida
+    
+    Returns
+    -------
+    list[Write_Behind_Stats]
+        Estadísticas de cada buffer activo
+    """
+    return [buffer.stats() for buffer in list(_write_behind_buffers.values())]
 
 def update(crud_info : PostgreSQL.Update | MongoDB.Update, print_data : bool = False) -> bool | JSONResponse:
     """
@@ -156,10 +1307,7 @@ def update(crud_info : PostgreSQL.Update | MongoDB.Update, print_data : bool = F
     JSONResponse
         Respuesta en formato JSON en caso de haber error
     """
-    if isinstance(crud_info, PostgreSQL.Update):
-        return postgresql.PostgreSQL.update(conn=crud_info.conn, query=crud_info.query, vars=crud_info.vars, print_data=print_data)
-    elif isinstance(crud_info, MongoDB.Update):
-        return mongodb.MongoDB.update(conn=crud_info.conn, collection_name=crud_info.collection_name, query=crud_info.query, update_values=crud_info.update_values, print_data=print_data)
+    return _after_write(crud_info, _UPDATE[crud_info.database_type](crud_info, print_data))
 
 def delete(crud_info : PostgreSQL.Delete | MongoDB.Delete, print_data : bool = False) -> bool | JSONResponse:
     """
@@ -181,7 +1329,75 @@ def delete(crud_info : PostgreSQL.Delete | MongoDB.Delete, print_data : bool = F
     JSONResponse
         Respuesta en formato JSON en caso de haber error
     """
-    if isinstance(crud_info, PostgreSQL.Delete):
-        return postgresql.PostgreSQL.delete(conn=crud_info.conn, query=crud_info.query, vars=crud_info.vars, print_data=print_data)
-    elif isinstance(crud_info, MongoDB.Delete):
-        return mongodb.MongoDB.delete(conn=crud_info.conn, collection_name=crud_info.collection_name, query=crud_info.query, print_data=print_data)
+    return _after_write(crud_info, _DELETE[crud_info.database_type](crud_info, print_data))
+
+def notify(crud_info : PostgreSQL.Notify, print_data : bool = False, coalesce : bool = False) -> bool | JSONResponse:
+    """
+    Función para enviar una notificación (NOTIFY) a un canal de PostgreSQL
+    
+    El payload se envía como JSON. Sin "coalesce" la notificación se envía con la conexión indicada y, como todo NOTIFY, se entrega al confirmar su transacción.
+    
+    Parameters
+    ----------
+    crud_info : database.model.database_crud_info.PostgreSQL.Notify
+        Información de la notificación a enviar
+    
+    print_data : bool = False
+        Encargado de mostrar o no la información al momento de realizar el CRUD
+    
+    coalesce : bool = False
+        Encolar la notificación para enviarla junto con las demás de una ventana corta, desde una conexión propia del pool y fuera de la transacción de "conn". Varias notificaciones de un canal llegan en un solo sobre {"fx_batch": [...]} que "Notification_Listener" desarma. Solo aplica a conexiones obtenidas con "get_database_connection"
+    
+    Returns
+    -------
+    bool
+        Encargado de notificar si la notificación fue enviada (o encolada)
+        
+    JSONResponse
+        Respuesta en formato JSON en caso de haber error
+    """
+    if crud_info.database_type is not Database_Type.POSTGRESQL:
+        return None
+    database_config_key = registry.get_database_config_key(crud_info.conn) if coalesce else None
+    if database_config_key is not None:
+        if print_data:
+            instrumentation.logger.debug("PostgreSQL.Notify(%s) channel: %s payload: %s coalesce: True", database_config_key, crud_info.channel, crud_info.payload)
+        try:
+            _get_publisher(database_config_key).publish(crud_info.channel, crud_info.payload)
+            return True
+        except (ValueError, RuntimeError) as e:
+            return error_response(f"There was an error: {str(e)}")
+    returnValue = _backend(Database_Type.POSTGRESQL).notify(conn=crud_info.conn, channel=crud_info.channel, payload=crud_info.payload, print_data=print_data)
+    if is_error_response(returnValue):
+        database_transaction.mark_failed(crud_info.conn, returnValue)
+    return returnValue
+
+# Publicadores de notificaciones agrupadas, por llave de configuración
+_publishers: dict[str, Notification_Publisher] = {}
+_publishers_lock = threading.Lock()
+
+def _get_publisher(database_config_key : str) -> Notification_Publisher:
+    publisher = _publishers.get(database_config_key)
+    if publisher is None:
+        from fracturex_module_database.infrastructure.database.notification import Notification_Publisher
+
+        with _publishers_lock:
+            publisher = _publishers.get(database_config_key)
+            if publisher is None:
+                pool = registry.get_postgresql_pool(database_config_key, environment.FRACTUREX_MODULE_DATABASE_CONFIG[database_config_key])
+                publisher = _publishers[database_config_key] = Notification_Publisher(get_connection=pool.getconn, release_connection=lambda conn, discard: pool.putconn(conn, discard=discard))
+                if len(_publishers) == 1:
+                    # Enviar lo pendiente al terminar el proceso
+                    atexit.register(flush_notifications)
+    return publisher
+
+def flush_notifications() -> int:
+    """
+    Función para enviar de inmediato las notificaciones encoladas con "notify(..., coalesce=True)"
+    
+    Returns
+    -------
+    int
+        Cantidad de notificaciones enviadas
+    """
+    return sum(publisher.flush() for publisher in list(_publishers.values()))
@@ -3,7 +3,7 @@ from setuptools import setup, find_packages
 setup(
     name="fracturex-module-database",
     version="1.0.0",
-    packages=find_packages(),
+    packages=find_packages(exclude=["benchmarks", "benchmarks.*"]),
     install_requires=[
         "pydantic==2.8.2",
         "fastapi==0.111.1",
@@ -11,6 +11,10 @@ setup(
         "pymongo==4.8.0",
         "python-dotenv==1.0.1"
     ],
+    extras_require={
+        # Codificador JSON más rápido para "success_response"/"streaming_response"
+        "orjson": ["orjson>=3.8"]
+    },
     author="FractureX",
     author_email="shaquille.montero.vergel123@example.com",
     description="Módulo de conexión a base de datos",